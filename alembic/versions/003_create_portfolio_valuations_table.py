@@ -0,0 +1,46 @@
+"""Create portfolio valuations table
+
+Revision ID: 003_create_portfolio_valuations_table
+Revises: 002_create_users_table
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '003_create_portfolio_valuations_table'
+down_revision: Union[str, None] = '002_create_users_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create portfolio_valuations table
+    op.create_table(
+        'portfolio_valuations',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('as_of_date', sa.Date(), nullable=False),
+        sa.Column('market_value', sa.Float(), nullable=False),
+        sa.Column('invested_amount', sa.Float(), nullable=False),
+        sa.Column('holdings_count', sa.Integer(), nullable=False),
+        sa.Column('unpriced_holdings', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'as_of_date')
+    )
+    op.create_index(op.f('ix_portfolio_valuations_id'), 'portfolio_valuations', ['id'], unique=False)
+    op.create_index(op.f('ix_portfolio_valuations_user_id'), 'portfolio_valuations', ['user_id'], unique=False)
+    op.create_index(op.f('ix_portfolio_valuations_as_of_date'), 'portfolio_valuations', ['as_of_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_portfolio_valuations_as_of_date'), table_name='portfolio_valuations')
+    op.drop_index(op.f('ix_portfolio_valuations_user_id'), table_name='portfolio_valuations')
+    op.drop_index(op.f('ix_portfolio_valuations_id'), table_name='portfolio_valuations')
+    op.drop_table('portfolio_valuations')
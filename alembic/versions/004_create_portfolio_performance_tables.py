@@ -0,0 +1,59 @@
+"""Create portfolio performance tables
+
+Revision ID: 004_create_portfolio_performance_tables
+Revises: 003_create_portfolio_valuations_table
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '004_create_portfolio_performance_tables'
+down_revision: Union[str, None] = '003_create_portfolio_valuations_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create portfolio_performance table
+    op.create_table(
+        'portfolio_performance',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('series_date', sa.Date(), nullable=False),
+        sa.Column('market_value', sa.Float(), nullable=False),
+        sa.Column('invested_amount', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'series_date')
+    )
+    op.create_index(op.f('ix_portfolio_performance_id'), 'portfolio_performance', ['id'], unique=False)
+    op.create_index(op.f('ix_portfolio_performance_user_id'), 'portfolio_performance', ['user_id'], unique=False)
+
+    # Create portfolio_performance_state table
+    op.create_table(
+        'portfolio_performance_state',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('computed_through', sa.Date(), nullable=True),
+        sa.Column('dirty_from', sa.Date(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_portfolio_performance_state_id'), 'portfolio_performance_state', ['id'], unique=False)
+    op.create_index(op.f('ix_portfolio_performance_state_user_id'), 'portfolio_performance_state', ['user_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_portfolio_performance_state_user_id'), table_name='portfolio_performance_state')
+    op.drop_index(op.f('ix_portfolio_performance_state_id'), table_name='portfolio_performance_state')
+    op.drop_table('portfolio_performance_state')
+    op.drop_index(op.f('ix_portfolio_performance_user_id'), table_name='portfolio_performance')
+    op.drop_index(op.f('ix_portfolio_performance_id'), table_name='portfolio_performance')
+    op.drop_table('portfolio_performance')
@@ -0,0 +1,47 @@
+"""Create securities table
+
+Revision ID: 005_create_securities_table
+Revises: 004_create_portfolio_performance_tables
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '005_create_securities_table'
+down_revision: Union[str, None] = '004_create_portfolio_performance_tables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create securities table
+    op.create_table(
+        'securities',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('scheme_code', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('isin_growth', sa.String(), nullable=True),
+        sa.Column('isin_reinvestment', sa.String(), nullable=True),
+        sa.Column('fund_house', sa.String(), nullable=True),
+        sa.Column('category', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_securities_id'), 'securities', ['id'], unique=False)
+    op.create_index(op.f('ix_securities_scheme_code'), 'securities', ['scheme_code'], unique=True)
+    op.create_index(op.f('ix_securities_isin_growth'), 'securities', ['isin_growth'], unique=False)
+    op.create_index(op.f('ix_securities_isin_reinvestment'), 'securities', ['isin_reinvestment'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_securities_isin_reinvestment'), table_name='securities')
+    op.drop_index(op.f('ix_securities_isin_growth'), table_name='securities')
+    op.drop_index(op.f('ix_securities_scheme_code'), table_name='securities')
+    op.drop_index(op.f('ix_securities_id'), table_name='securities')
+    op.drop_table('securities')
@@ -0,0 +1,38 @@
+"""Add codec to statement files
+
+Revision ID: 006_add_statement_file_codec
+Revises: 005_create_securities_table
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '006_add_statement_file_codec'
+down_revision: Union[str, None] = '005_create_securities_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE TYPE filecodec AS ENUM ('identity', 'zstd')")
+
+    # Files stored so far are uncompressed
+    op.add_column(
+        'statement_files',
+        sa.Column(
+            'codec',
+            postgresql.ENUM('identity', 'zstd', name='filecodec', create_type=False),
+            nullable=False,
+            server_default='identity',
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('statement_files', 'codec')
+    op.execute('DROP TYPE IF EXISTS filecodec')
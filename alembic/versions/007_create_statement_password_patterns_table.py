@@ -0,0 +1,41 @@
+"""Create statement_password_patterns table
+
+Revision ID: 007_create_statement_password_patterns_table
+Revises: 006_add_statement_file_codec
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '007_create_statement_password_patterns_table'
+down_revision: Union[str, None] = '006_add_statement_file_codec'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create statement_password_patterns table
+    op.create_table(
+        'statement_password_patterns',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('statement_type', postgresql.ENUM('cams', 'kfintech', 'zerodha', 'pms', 'aif', 'manual', name='statementtype', create_type=False), nullable=False),
+        sa.Column('pattern', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'statement_type')
+    )
+    op.create_index(op.f('ix_statement_password_patterns_id'), 'statement_password_patterns', ['id'], unique=False)
+    op.create_index(op.f('ix_statement_password_patterns_user_id'), 'statement_password_patterns', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_statement_password_patterns_user_id'), table_name='statement_password_patterns')
+    op.drop_index(op.f('ix_statement_password_patterns_id'), table_name='statement_password_patterns')
+    op.drop_table('statement_password_patterns')
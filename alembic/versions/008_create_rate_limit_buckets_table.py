@@ -0,0 +1,39 @@
+"""Create rate_limit_buckets table
+
+Revision ID: 008_create_rate_limit_buckets_table
+Revises: 007_create_statement_password_patterns_table
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '008_create_rate_limit_buckets_table'
+down_revision: Union[str, None] = '007_create_statement_password_patterns_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create rate_limit_buckets table
+    op.create_table(
+        'rate_limit_buckets',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('tokens', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_rate_limit_buckets_id'), 'rate_limit_buckets', ['id'], unique=False)
+    op.create_index(op.f('ix_rate_limit_buckets_key'), 'rate_limit_buckets', ['key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_rate_limit_buckets_key'), table_name='rate_limit_buckets')
+    op.drop_index(op.f('ix_rate_limit_buckets_id'), table_name='rate_limit_buckets')
+    op.drop_table('rate_limit_buckets')
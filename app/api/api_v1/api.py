@@ -1,6 +1,16 @@
 from fastapi import APIRouter
 
-from app.api.api_v1.endpoints import auth_local, health
+from app.api.api_v1.endpoints import (
+    auth_local,
+    health,
+    portfolio,
+    prices,
+    securities,
+    snapshots,
+    statements,
+    transactions,
+    uploads,
+)
 
 api_router = APIRouter()
 
@@ -14,3 +24,45 @@ api_router.include_router(
     prefix="/auth",
     tags=["Authentication"],
 )
+
+api_router.include_router(
+    transactions.router,
+    prefix="/transactions",
+    tags=["Transactions"],
+)
+
+api_router.include_router(
+    snapshots.router,
+    prefix="/snapshots",
+    tags=["Snapshots"],
+)
+
+api_router.include_router(
+    prices.router,
+    prefix="/prices",
+    tags=["Prices"],
+)
+
+api_router.include_router(
+    portfolio.router,
+    prefix="/portfolio",
+    tags=["Portfolio"],
+)
+
+api_router.include_router(
+    securities.router,
+    prefix="/securities",
+    tags=["Securities"],
+)
+
+api_router.include_router(
+    statements.router,
+    prefix="/statements",
+    tags=["Statements"],
+)
+
+api_router.include_router(
+    uploads.router,
+    prefix="/uploads",
+    tags=["Uploads"],
+)
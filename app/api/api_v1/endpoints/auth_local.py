@@ -3,8 +3,8 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from app.api.deps import CurrentUserDep, OptionalUserDep
-from app.db.deps import AsyncSessionDep
+from app.api.deps import CurrentUserDep, OptionalUserDep, rate_limit
+from app.db.deps import AsyncReadSessionDep, AsyncSessionDep
 from app.core.exceptions import AuthenticationError
 from app.core.jwt import create_token_pair, verify_token
 from app.models.auth import (
@@ -25,6 +25,7 @@ router = APIRouter()
 
 @router.post(
     "/register",
+    dependencies=[Depends(rate_limit("login"))],
     response_model=TokenResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Register New User",
@@ -55,13 +56,14 @@ async def register(
 
 @router.post(
     "/login",
+    dependencies=[Depends(rate_limit("login"))],
     response_model=TokenResponse,
     summary="User Login",
     description="Authenticate user and return access tokens",
 )
 async def login(
     credentials: UserLogin,
-    session: AsyncSessionDep,
+    session: AsyncReadSessionDep,
     user_service: UserService = Depends(get_user_service),
 ) -> TokenResponse:
     """Login user and return tokens"""
@@ -107,13 +109,14 @@ async def refresh_token(
 
 @router.post(
     "/password-reset",
+    dependencies=[Depends(rate_limit("login"))],
     status_code=status.HTTP_200_OK,
     summary="Request Password Reset",
     description="Request a password reset token (development: returns token directly)",
 )
 async def request_password_reset(
     reset_request: PasswordResetRequest,
-    session: AsyncSessionDep,
+    session: AsyncReadSessionDep,
     user_service: UserService = Depends(get_user_service),
 ) -> Dict[str, str]:
     """Request password reset"""
@@ -136,6 +139,7 @@ async def request_password_reset(
 
 @router.post(
     "/password-reset/confirm",
+    dependencies=[Depends(rate_limit("login"))],
     status_code=status.HTTP_200_OK,
     summary="Confirm Password Reset",
     description="Reset password using reset token",
@@ -172,7 +176,7 @@ async def confirm_password_reset(
 )
 async def get_current_user_info(
     current_user: CurrentUserDep,
-    session: AsyncSessionDep,
+    session: AsyncReadSessionDep,
     user_service: UserService = Depends(get_user_service),
 ) -> UserInfo:
     """Get current user information"""
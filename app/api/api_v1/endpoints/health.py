@@ -1,8 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, status
 
 from app.core.config import get_settings
-from app.db.session import check_database_connection
-from app.models.auth import DetailedHealthResponse, HealthResponse
+from app.db.session import get_database_pool_status
+from app.models.auth import DetailedHealthResponse, HealthResponse, PoolStatusResponse
+from app.services.health import get_health_monitor
 
 router = APIRouter()
 settings = get_settings()
@@ -26,17 +27,38 @@ async def health_check() -> HealthResponse:
     "/health/detailed",
     response_model=DetailedHealthResponse,
     summary="Detailed Health Check",
-    description="Detailed health check with configuration and connectivity status",
+    description="Detailed health check with configuration and cached connectivity probe results",
 )
 async def detailed_health_check() -> DetailedHealthResponse:
-    db_connected = await check_database_connection()
+    # Served from the background probe cache so probes never touch the pool
+    checks = get_health_monitor().get_results()
+    database_check = checks.get("database")
+    db_connected = bool(database_check and database_check.healthy)
+    all_healthy = all(check.healthy for check in checks.values())
 
     return DetailedHealthResponse(
-        status="healthy" if db_connected or not settings.database_url else "degraded",
+        status="healthy" if all_healthy and (db_connected or not settings.database_url) else "degraded",
         version=settings.app_version,
         environment=settings.environment,
         jwt_configured=bool(settings.jwt_secret_key),
         api_keys_configured=bool(settings.api_keys),
         database_configured=bool(settings.database_url),
         database_connected=db_connected,
+        checks=checks,
     )
+
+
+@router.get(
+    "/health/pool",
+    response_model=PoolStatusResponse,
+    summary="Connection Pool Status",
+    description="Connection pool occupancy, saturation and checkout wait-time metrics for this worker",
+)
+async def pool_status() -> PoolStatusResponse:
+    pool = get_database_pool_status()
+    if pool is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database is not configured",
+        )
+    return PoolStatusResponse(**pool)
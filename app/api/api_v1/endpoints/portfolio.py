@@ -0,0 +1,117 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import ApiKeyDep, CurrentUserDep
+from app.core.exceptions import NotFoundError
+from app.db.deps import AsyncReadSessionDep
+from app.models.capital_gains import CapitalGainsResponse
+from app.models.performance import PerformanceSeriesResponse
+from app.models.valuation import (
+    BatchValuationRequest,
+    BatchValuationResponse,
+    PortfolioValuationResponse,
+)
+from app.services.capital_gains import CapitalGainsService, get_capital_gains_service
+from app.services.performance import (
+    DEFAULT_MAX_POINTS,
+    PerformanceService,
+    get_performance_service,
+)
+from app.services.valuation import ValuationService, get_valuation_service
+
+router = APIRouter()
+
+
+@router.get(
+    "/valuation",
+    response_model=PortfolioValuationResponse,
+    summary="Portfolio Valuation",
+    description="Value the current user's holdings at the NAVs published on or before a date",
+)
+async def get_portfolio_valuation(
+    current_user: CurrentUserDep,
+    session: AsyncReadSessionDep,
+    as_of: Optional[date] = None,
+    valuation_service: ValuationService = Depends(get_valuation_service),
+) -> PortfolioValuationResponse:
+    """Get portfolio valuation"""
+    as_of = valuation_service.resolve_as_of(as_of)
+    [valuation] = await valuation_service.value_portfolios(
+        session, [current_user["sub"]], as_of, include_holdings=True
+    )
+    return valuation
+
+
+@router.post(
+    "/valuations",
+    response_model=BatchValuationResponse,
+    summary="Batch Portfolio Valuation",
+    description="Value many users' portfolios as of a date in one pass (service-to-service)",
+)
+async def batch_portfolio_valuation(
+    _: ApiKeyDep,
+    request: BatchValuationRequest,
+    session: AsyncReadSessionDep,
+    valuation_service: ValuationService = Depends(get_valuation_service),
+) -> BatchValuationResponse:
+    """Value portfolios in batch"""
+    as_of = valuation_service.resolve_as_of(request.as_of)
+    portfolios = await valuation_service.value_portfolios(
+        session,
+        [str(user_id) for user_id in dict.fromkeys(request.user_ids)],
+        as_of,
+        include_holdings=request.include_holdings,
+    )
+    return BatchValuationResponse(as_of=as_of, portfolios=portfolios)
+
+
+@router.get(
+    "/performance",
+    response_model=PerformanceSeriesResponse,
+    summary="Portfolio Performance",
+    description=(
+        "Daily market value and invested amount of the current user's portfolio. "
+        "Ranges longer than max_points days are downsampled to every n-th day"
+    ),
+)
+async def get_portfolio_performance(
+    current_user: CurrentUserDep,
+    session: AsyncReadSessionDep,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    max_points: int = Query(DEFAULT_MAX_POINTS, ge=2, le=5000),
+    performance_service: PerformanceService = Depends(get_performance_service),
+) -> PerformanceSeriesResponse:
+    """Get portfolio performance series"""
+    return await performance_service.get_series(session, current_user["sub"], start, end, max_points)
+
+
+@router.get(
+    "/capital-gains",
+    response_model=CapitalGainsResponse,
+    summary="Capital Gains",
+    description=(
+        "Realized gains per financial year, matched FIFO per folio and scheme and split "
+        "into short and long term. Pass financial_year (e.g. 2023-24) for a single year"
+    ),
+)
+async def get_capital_gains(
+    current_user: CurrentUserDep,
+    session: AsyncReadSessionDep,
+    financial_year: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    include_lots: bool = False,
+    capital_gains_service: CapitalGainsService = Depends(get_capital_gains_service),
+) -> CapitalGainsResponse:
+    """Get capital gains"""
+    summaries = await capital_gains_service.get_summaries(session, current_user["sub"])
+    if financial_year is not None:
+        if financial_year not in summaries:
+            raise NotFoundError(f"No realized gains in financial year {financial_year}")
+        summaries = {financial_year: summaries[financial_year]}
+    years = [
+        summary if include_lots else summary.model_copy(update={"gains": None})
+        for summary in summaries.values()
+    ]
+    return CapitalGainsResponse(long_term_threshold_days=capital_gains_service.long_term_days, years=years)
@@ -0,0 +1,58 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import CurrentUserDep
+from app.core.exceptions import NotFoundError, ValidationError
+from app.models.price import PriceHistoryPoint, PriceHistoryResponse, PricePoint
+from app.services.price_store import PriceStore, get_price_store
+
+router = APIRouter()
+
+
+@router.get(
+    "/{symbol}",
+    response_model=PricePoint,
+    summary="Get NAV",
+    description="NAV of a scheme (AMFI scheme code or ISIN) as of a date, defaulting to the latest",
+)
+async def get_price(
+    _: CurrentUserDep,
+    symbol: str,
+    as_of: Optional[date] = None,
+    price_store: PriceStore = Depends(get_price_store),
+) -> PricePoint:
+    """Get point-in-time NAV"""
+    as_of = as_of or price_store.end_date or date.today()
+    price = price_store.get_price(symbol, as_of)
+    if price is None:
+        raise NotFoundError(f"No NAV for {symbol} on or before {as_of}")
+    nav, nav_date = price
+    return PricePoint(symbol=symbol, as_of=as_of, nav=nav, nav_date=nav_date)
+
+
+@router.get(
+    "/{symbol}/history",
+    response_model=PriceHistoryResponse,
+    summary="Get NAV History",
+    description="Published NAVs of a scheme between two dates, inclusive",
+)
+async def get_price_history(
+    _: CurrentUserDep,
+    symbol: str,
+    start: date = Query(...),
+    end: Optional[date] = None,
+    price_store: PriceStore = Depends(get_price_store),
+) -> PriceHistoryResponse:
+    """Get NAV history"""
+    end = end or price_store.end_date or date.today()
+    if end < start:
+        raise ValidationError("end must not be before start")
+    if not price_store.has_symbol(symbol):
+        raise NotFoundError(f"Unknown symbol {symbol}")
+    points = [
+        PriceHistoryPoint(nav_date=nav_date, nav=nav)
+        for nav_date, nav in price_store.get_history(symbol, start, end)
+    ]
+    return PriceHistoryResponse(symbol=symbol, start=start, end=end, points=points)
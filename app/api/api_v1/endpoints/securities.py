@@ -0,0 +1,44 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import CurrentUserDep
+from app.db.deps import AsyncReadSessionDep
+from app.models.security import SecurityMatch, SecurityResolveRequest, SecurityResolveResponse
+from app.services.security_master import SecurityMasterService, get_security_master_service
+
+router = APIRouter()
+
+
+@router.get(
+    "/search",
+    response_model=List[SecurityMatch],
+    summary="Search Securities",
+    description="Best matching schemes for a free-text name, AMFI scheme code or ISIN",
+)
+async def search_securities(
+    _: CurrentUserDep,
+    session: AsyncReadSessionDep,
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+    security_master: SecurityMasterService = Depends(get_security_master_service),
+) -> List[SecurityMatch]:
+    """Search security master"""
+    return await security_master.search(session, q, limit)
+
+
+@router.post(
+    "/resolve",
+    response_model=SecurityResolveResponse,
+    summary="Resolve Security Names",
+    description="Map parsed security names to canonical scheme codes in bulk; unmatched names have no scheme_code",
+)
+async def resolve_securities(
+    _: CurrentUserDep,
+    request: SecurityResolveRequest,
+    session: AsyncReadSessionDep,
+    security_master: SecurityMasterService = Depends(get_security_master_service),
+) -> SecurityResolveResponse:
+    """Resolve security names"""
+    matches = await security_master.resolve_many(session, request.names)
+    return SecurityResolveResponse(matches=[matches[name] for name in request.names])
@@ -0,0 +1,44 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse
+
+from app.api.deps import ApiKeyDep
+from app.models.snapshot import SnapshotManifest
+from app.services.snapshot import SnapshotService, get_snapshot_service
+
+router = APIRouter()
+
+
+@router.get(
+    "/latest",
+    response_model=SnapshotManifest,
+    summary="Latest Snapshot",
+    description="Manifest of the most recent Parquet snapshot for all users, or for one user",
+)
+async def get_latest_snapshot(
+    _: ApiKeyDep,
+    user_id: Optional[UUID] = None,
+    snapshot_service: SnapshotService = Depends(get_snapshot_service),
+) -> SnapshotManifest:
+    """Get latest snapshot manifest"""
+    return snapshot_service.get_latest_manifest(str(user_id) if user_id else None)
+
+
+@router.get(
+    "/{snapshot_id}/files/{file_path:path}",
+    response_class=FileResponse,
+    summary="Download Snapshot File",
+    description="Download one Parquet file listed in a snapshot manifest",
+)
+async def download_snapshot_file(
+    _: ApiKeyDep,
+    snapshot_id: str,
+    file_path: str,
+    user_id: Optional[UUID] = None,
+    snapshot_service: SnapshotService = Depends(get_snapshot_service),
+) -> FileResponse:
+    """Download snapshot file"""
+    path = snapshot_service.resolve_file(snapshot_id, file_path, str(user_id) if user_id else None)
+    return FileResponse(path, media_type="application/vnd.apache.parquet", filename=path.name)
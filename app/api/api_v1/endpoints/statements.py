@@ -0,0 +1,118 @@
+import mimetypes
+import os
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+
+from app.api.deps import CurrentUserDep
+from app.core.exceptions import NotFoundError
+from app.core.logging import get_logger
+from app.core.responses import content_disposition
+from app.db.deps import AsyncReadSessionDep, AsyncSessionDep
+from app.db.session import async_session_factory
+from app.models.enums import FileCodec
+from app.models.review import (
+    ConfirmStatementRequest,
+    ConfirmStatementResponse,
+    StatementReviewItem,
+    StatementReviewResponse,
+)
+from app.services.performance import get_performance_service
+from app.services.statement import StatementService, get_statement_service
+
+router = APIRouter()
+logger = get_logger("api.statements")
+
+
+async def refresh_portfolio(user_id: str) -> None:
+    """Recompute the invalidated part of a user's performance series after confirmation"""
+    try:
+        async with async_session_factory() as session:
+            days = await get_performance_service().recompute(session, user_id)
+            await session.commit()
+        logger.info("portfolio_refreshed", user_id=user_id, days=days)
+    except Exception as e:
+        # Leaves the series marked dirty; the scheduled performance job picks it up
+        logger.error("portfolio_refresh_failed", user_id=user_id, error=str(e))
+
+
+@router.get(
+    "/review",
+    response_model=StatementReviewResponse,
+    summary="Statements Awaiting Review",
+    description="Unconfirmed statements of the current user, lowest parsing confidence first",
+)
+async def list_statements_for_review(
+    current_user: CurrentUserDep,
+    session: AsyncReadSessionDep,
+    limit: int = Query(50, ge=1, le=200),
+    statement_service: StatementService = Depends(get_statement_service),
+) -> StatementReviewResponse:
+    """List statements awaiting review"""
+    rows = await statement_service.list_for_review(session, current_user["sub"], limit)
+    return StatementReviewResponse(
+        statements=[StatementReviewItem.model_validate(row._mapping) for row in rows]
+    )
+
+
+@router.post(
+    "/{statement_id}/confirm",
+    response_model=ConfirmStatementResponse,
+    summary="Confirm Statement",
+    description=(
+        "Confirm a parsed statement and all of its transactions except the excluded ones in one "
+        "transaction; portfolio performance is refreshed in the background"
+    ),
+)
+async def confirm_statement(
+    statement_id: UUID,
+    current_user: CurrentUserDep,
+    session: AsyncSessionDep,
+    background_tasks: BackgroundTasks,
+    request: Optional[ConfirmStatementRequest] = None,
+    statement_service: StatementService = Depends(get_statement_service),
+) -> ConfirmStatementResponse:
+    """Confirm a statement with set-based updates"""
+    excluded = request.excluded_transaction_ids if request else []
+    result = await statement_service.confirm(session, statement_id, current_user["sub"], excluded)
+    # Runs after the response is sent, i.e. after the session dependency has committed
+    background_tasks.add_task(refresh_portfolio, result.user_id)
+    return result
+
+
+@router.get(
+    "/{statement_id}/file",
+    summary="Download Statement File",
+    description=(
+        "Original uploaded file of a statement; streamed from disk for local storage or "
+        "served through a short-lived presigned URL for S3, and decompressed on the fly "
+        "when it is stored compressed"
+    ),
+    response_class=Response,
+)
+async def download_statement_file(
+    statement_id: UUID,
+    current_user: CurrentUserDep,
+    session: AsyncReadSessionDep,
+    statement_service: StatementService = Depends(get_statement_service),
+) -> Response:
+    """Download the stored file of a statement"""
+    row = await statement_service.get_file(session, statement_id, current_user["sub"])
+    store = statement_service.file_store
+    if row.codec != FileCodec.IDENTITY:
+        # Compressed at rest: decode while streaming, the client gets the original bytes
+        return StreamingResponse(
+            store.open(row.file_hash, row.codec),
+            media_type=mimetypes.guess_type(row.file_name)[0] or "application/octet-stream",
+            headers={"Content-Disposition": content_disposition(row.file_name)},
+        )
+    url = await store.download_url(row.file_hash, row.file_name)
+    if url is not None:
+        return RedirectResponse(url)
+    # Files stored before the content-addressed store existed are only known by their path
+    for path in (store.local_path(row.file_hash), row.local_file_path):
+        if path and os.path.isfile(path):
+            return FileResponse(path, filename=row.file_name)
+    raise NotFoundError("Statement file not found")
@@ -0,0 +1,47 @@
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import CurrentUserDep
+from app.core.responses import accepts_encoding
+from app.models.enums import ExportFormat
+from app.services.export import (
+    MEDIA_TYPES,
+    TransactionExportService,
+    get_transaction_export_service,
+)
+
+router = APIRouter()
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export Transactions",
+    description=(
+        "Stream the current user's full transaction history as NDJSON or CSV. "
+        "Rows are read from a server-side cursor and gzip-compressed on the fly "
+        "when the client's Accept-Encoding allows gzip"
+    ),
+)
+async def export_transactions(
+    current_user: CurrentUserDep,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    accept_encoding: Annotated[Optional[str], Header()] = None,
+    export_service: TransactionExportService = Depends(get_transaction_export_service),
+) -> StreamingResponse:
+    """Stream transaction export"""
+    compress = accepts_encoding(accept_encoding, "gzip")
+    headers = {
+        "Content-Disposition": f'attachment; filename="transactions.{export_format.value}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        export_service.stream_export(current_user["sub"], export_format, compress=compress),
+        media_type=MEDIA_TYPES[export_format],
+        headers=headers,
+    )
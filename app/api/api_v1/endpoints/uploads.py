@@ -0,0 +1,132 @@
+import asyncio
+from datetime import date
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.api.deps import CurrentUserDep, rate_limit
+from app.core.config import get_settings
+from app.core.exceptions import NotFoundError
+from app.db.deps import AsyncReadSessionDep, AsyncSessionDep
+from app.db.session import async_session_factory
+from app.models.enums import StatementType
+from app.models.statement import UploadSession
+from app.models.upload import UploadProgressEvent, UploadResponse
+from app.services.admission import ParseAdmission, get_parse_admission
+from app.services.pdf_unlock import PasswordHints
+from app.services.progress import TERMINAL_STATUSES, UploadProgressBroker, get_upload_progress
+from app.services.statement_parsers import get_parser
+from app.services.upload import UploadService, get_upload_service
+
+router = APIRouter()
+settings = get_settings()
+
+
+def _sse(event: UploadProgressEvent) -> str:
+    return f"event: progress\ndata: {event.model_dump_json()}\n\n"
+
+
+async def _event_stream(
+    request: Request, upload_session_id: UUID, progress: UploadProgressBroker
+) -> AsyncIterator[str]:
+    # Subscribe before reading the current status so nothing falls in between
+    async with progress.subscribe(upload_session_id) as queue:
+        async with async_session_factory() as session:
+            upload = await session.get(UploadSession, upload_session_id)
+        if upload is None:
+            # Deleted since the handler checked it
+            return
+        snapshot = UploadProgressEvent(
+            upload_session_id=upload_session_id,
+            status=upload.status,
+            detail=upload.error_message,
+            created_at=upload.updated_at,
+        )
+        yield _sse(snapshot)
+        if snapshot.status in TERMINAL_STATUSES:
+            return
+
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.progress_keepalive_seconds)
+            except asyncio.TimeoutError:
+                # Comment line: keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            yield _sse(event)
+            if event.status in TERMINAL_STATUSES:
+                return
+
+
+@router.post(
+    "",
+    dependencies=[Depends(rate_limit("upload"))],
+    response_model=UploadResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Upload Statement",
+    description=(
+        "Store a statement file and parse it in the background; follow progress on the upload's "
+        "event stream. Statement types without a registered parser are rejected with 422. "
+        "Uploads are rate limited per user, and rejected with 429 and Retry-After while too "
+        "many statements are already being parsed"
+    ),
+)
+async def upload_statement(
+    current_user: CurrentUserDep,
+    session: AsyncSessionDep,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    statement_type: StatementType = Form(...),
+    password: Optional[str] = Form(None),
+    pan: Optional[str] = Form(None),
+    date_of_birth: Optional[date] = Form(None),
+    admission: ParseAdmission = Depends(get_parse_admission),
+    upload_service: UploadService = Depends(get_upload_service),
+) -> UploadResponse:
+    """Upload a statement for parsing"""
+    # Statement types without a parser could only ever end up failed
+    get_parser(statement_type)
+    # Admitted before any work is done; the slot is held until the background parse ends
+    slot = admission.acquire()
+    try:
+        result = await upload_service.create(session, current_user["sub"], file, statement_type)
+        # Committed here rather than by the session dependency, whose failure would skip the
+        # background task and leak the slot
+        await session.commit()
+    except BaseException:
+        slot.release()
+        raise
+    hints = PasswordHints.from_user(current_user, password=password, pan=pan, date_of_birth=date_of_birth)
+    # Runs after the response is sent
+    background_tasks.add_task(upload_service.process, result.upload_session_id, result.statement_id, hints, slot)
+    return result
+
+
+@router.get(
+    "/{upload_session_id}/events",
+    summary="Upload Progress Events",
+    description=(
+        "Server-sent event stream of an upload session's status and parsing progress; starts "
+        "with the current status and ends once the session completes, fails or expires"
+    ),
+    response_class=StreamingResponse,
+)
+async def stream_upload_events(
+    upload_session_id: UUID,
+    request: Request,
+    current_user: CurrentUserDep,
+    session: AsyncReadSessionDep,
+    progress: UploadProgressBroker = Depends(get_upload_progress),
+) -> StreamingResponse:
+    """Stream progress of an upload session"""
+    owner = await session.scalar(select(UploadSession.user_id).where(UploadSession.id == upload_session_id))
+    if owner != current_user["sub"]:
+        raise NotFoundError("Upload session not found")
+    return StreamingResponse(
+        _event_stream(request, upload_session_id, progress),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,6 +1,6 @@
-from typing import Annotated
+from typing import Annotated, Awaitable, Callable
 
-from fastapi import Depends
+from fastapi import Depends, Request
 
 from app.core.dependencies import (
     AdminUserDep,
@@ -9,10 +9,29 @@ from app.core.dependencies import (
     OptionalUserDep,
     SettingsDep,
 )
+from app.services.rate_limit import RateLimitService, get_rate_limit_service
 from app.services.user import UserService, get_user_service
 
 UserServiceDep = Annotated[UserService, Depends(get_user_service)]
 
+
+def rate_limit(scope: str) -> Callable[..., Awaitable[None]]:
+    """Dependency applying a scope's rate limit per signed-in user, else per client IP"""
+
+    async def check_rate_limit(
+        request: Request,
+        current_user: OptionalUserDep,
+        rate_limits: RateLimitService = Depends(get_rate_limit_service),
+    ) -> None:
+        if current_user is not None:
+            client = f"user:{current_user['sub']}"
+        else:
+            client = f"ip:{request.client.host if request.client else 'unknown'}"
+        await rate_limits.check(scope, client)
+
+    return check_rate_limit
+
+
 __all__ = [
     "AdminUserDep",
     "ApiKeyDep",
@@ -20,4 +39,5 @@ __all__ = [
     "CurrentUserDep",
     "OptionalUserDep",
     "SettingsDep",
+    "rate_limit",
 ]
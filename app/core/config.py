@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import List
+from typing import List, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -37,9 +37,97 @@ class Settings(BaseSettings):
     # Database
     database_url: str = ""
     database_echo: bool = False
-    database_pool_size: int = 5
-    database_max_overflow: int = 10
+    # Pool size and overflow are derived from the connection budget when unset
+    database_pool_size: Optional[int] = None
+    database_max_overflow: Optional[int] = None
     database_pool_recycle: int = 3600
+    database_pool_timeout: int = 30
+    # Total connections all workers may hold against Postgres/PgBouncer, LISTEN connections included
+    database_max_connections: int = 15
+    # Disable asyncpg prepared statement caching for PgBouncer transaction pooling
+    database_pgbouncer_mode: bool = False
+    # Per-connection server-side prepared statements kept by asyncpg
+    database_statement_cache_size: int = 256
+    # Compiled SQL cache entries kept by SQLAlchemy per engine
+    database_query_cache_size: int = 1200
+
+    # Server
+    web_concurrency: int = 1
+
+    # Exports
+    export_batch_size: int = 1000
+    snapshot_dir: str = "data/snapshots"
+    # Published snapshots kept per scope; older ones are deleted after each export
+    snapshot_keep: int = 7
+
+    # NAV price history
+    price_store_dir: str = "data/prices"
+    nav_drop_dir: str = "data/nav_drop"
+
+    # Capital gains: holdings sold after more than this many days are long term
+    capital_gains_long_term_days: int = 365
+
+    # Parsing confidence: statements scoring at least the auto-confirm threshold, with no
+    # transaction below the review threshold, are confirmed without manual review
+    confidence_auto_confirm_threshold: float = 0.95
+    confidence_review_threshold: float = 0.7
+
+    # Statement file storage: "local" (content-addressed tree under file_store_dir) or "s3";
+    # set the endpoint URL to use an S3-compatible store such as MinIO
+    file_store_backend: str = "local"
+    file_store_dir: str = "data/statements"
+    file_store_s3_bucket: str = ""
+    file_store_s3_prefix: str = "statements"
+    file_store_s3_endpoint_url: Optional[str] = None
+    file_store_s3_region: Optional[str] = None
+    file_store_url_expiry_seconds: int = 300
+    # zstd level for stored files (0 disables compression); files are kept uncompressed when
+    # it saves less than the given fraction, as for most PDFs
+    file_store_compression_level: int = 10
+    file_store_min_compression_savings: float = 0.1
+
+    # PDF text extraction: worker processes across all web workers (0 = one per CPU), the
+    # smallest page range worth sending to a worker, and where extracted page text is cached
+    pdf_extract_workers: int = 0
+    pdf_min_pages_per_shard: int = 16
+    pdf_page_cache_dir: str = "data/page_cache"
+
+    # Statement reprocessing: statements per page (and checkpoint interval), parallel statements,
+    # and where progress is checkpointed so an interrupted run can resume
+    reprocess_batch_size: int = 200
+    reprocess_concurrency: int = 4
+    reprocess_checkpoint_dir: str = "data/reprocess"
+
+    # Upload progress events: Postgres LISTEN needs a session-pooled connection, so set a direct
+    # URL when DATABASE_URL points at PgBouncer in transaction mode
+    progress_listen_url: Optional[str] = None
+    progress_keepalive_seconds: float = 15.0
+
+    # Statement uploads: largest accepted file, how long an unfinished session lives, and how
+    # many uploads may be parsing at once across all workers before new ones get a 429
+    upload_max_bytes: int = 25 * 1024 * 1024
+    upload_session_ttl_hours: int = 24
+    parse_max_in_flight: int = 8
+
+    # Rate limits (token buckets per user, or per client IP when signed out): sustained rate per
+    # minute and burst size; "memory" keeps buckets per worker, "database" shares them.
+    # Disable only for load tests that drive many users from one IP
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "memory"
+    rate_limit_login_per_minute: float = 10.0
+    rate_limit_login_burst: int = 5
+    rate_limit_upload_per_minute: float = 6.0
+    rate_limit_upload_burst: int = 10
+
+    # Upload session expiry: how often the sweeper runs in the app (0 disables it), how many
+    # sessions / files it handles per transaction, and how many files it deletes at once
+    upload_sweep_interval_seconds: float = 900.0
+    upload_sweep_batch_size: int = 500
+    upload_sweep_file_concurrency: int = 16
+
+    # Health probes
+    health_probe_interval_seconds: float = 10.0
+    health_probe_timeout_seconds: float = 5.0
 
     # JWT Authentication
     jwt_secret_key: str = ""
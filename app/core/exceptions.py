@@ -1,7 +1,9 @@
+import math
 from typing import Any, Dict, Optional
 
 from fastapi import HTTPException, Request, status
-from fastapi.responses import JSONResponse
+
+from app.core.responses import ORJSONResponse
 
 
 class BaseAPIException(HTTPException):
@@ -76,12 +78,22 @@ class ValidationError(BaseAPIException):
         )
 
 
+class PasswordRequiredError(BaseAPIException):
+    def __init__(self, detail: str = "Statement PDF is password protected"):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=detail,
+            error_code="PASSWORD_REQUIRED",
+        )
+
+
 class RateLimitError(BaseAPIException):
-    def __init__(self, detail: str = "Rate limit exceeded"):
+    def __init__(self, detail: str = "Rate limit exceeded", retry_after: Optional[float] = None):
         super().__init__(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=detail,
             error_code="RATE_LIMIT_EXCEEDED",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))} if retry_after is not None else None,
         )
 
 
@@ -139,8 +151,8 @@ def create_error_response(
 
 async def base_api_exception_handler(
     request: Request, exc: BaseAPIException
-) -> JSONResponse:
-    return JSONResponse(
+) -> ORJSONResponse:
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=create_error_response(
             status_code=exc.status_code,
@@ -152,8 +164,8 @@ async def base_api_exception_handler(
     )
 
 
-async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
-    return JSONResponse(
+async def http_exception_handler(request: Request, exc: HTTPException) -> ORJSONResponse:
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=create_error_response(
             status_code=exc.status_code,
@@ -164,8 +176,8 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
     )
 
 
-async def generic_exception_handler(request: Request, exc: Exception) -> JSONResponse:
-    return JSONResponse(
+async def generic_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=create_error_response(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,63 @@
+from decimal import Decimal
+from typing import Any, Dict, Optional
+from urllib.parse import quote
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _orjson_default(obj: Any) -> Any:
+    # Serialized as a string, matching Pydantic's JSON mode, so amounts keep full precision
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def orjson_dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes; UUID, datetime and date are handled natively by orjson"""
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """Default API response class backed by orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson_dumps(content)
+
+
+def content_disposition(filename: str) -> str:
+    """Attachment header for a user-supplied filename, encoded the way FileResponse does it"""
+    quoted = quote(filename)
+    if quoted != filename:
+        # RFC 5987: non-ASCII, quotes and control characters only travel percent-encoded
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _quality(params: str) -> float:
+    for param in params.split(";"):
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def accepts_encoding(accept_encoding: Optional[str], coding: str) -> bool:
+    """Whether an Accept-Encoding header allows a content coding (RFC 9110, q=0 means not acceptable)"""
+    qualities: Dict[str, float] = {}
+    for entry in (accept_encoding or "").split(","):
+        name, _, params = entry.partition(";")
+        name = name.strip().lower()
+        if name:
+            qualities[name] = _quality(params)
+    quality = qualities.get(coding)
+    if quality is None and coding == "gzip":
+        # Legacy alias
+        quality = qualities.get("x-gzip")
+    if quality is None:
+        # * covers codings not listed
+        quality = qualities.get("*", 0.0)
+    return quality > 0
@@ -1,7 +1,10 @@
 from typing import Dict
 
+from app.core.config import get_settings
 from app.core.jwt import verify_token
 
+settings = get_settings()
+
 
 async def verify_jwt_token(token: str) -> Dict[str, str]:
     """Verify a JWT access token and return user info"""
@@ -1,5 +1,11 @@
 # Database module
 from app.db.base import BaseModel, TimestampMixin
-from app.db.session import get_async_session, async_engine
+from app.db.session import get_async_read_session, get_async_session, async_engine
 
-__all__ = ["BaseModel", "TimestampMixin", "get_async_session", "async_engine"]
+__all__ = [
+    "BaseModel",
+    "TimestampMixin",
+    "get_async_session",
+    "get_async_read_session",
+    "async_engine",
+]
@@ -3,9 +3,10 @@ from typing import Annotated, AsyncGenerator
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_async_session
+from app.db.session import get_async_read_session, get_async_session
 
 AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+AsyncReadSessionDep = Annotated[AsyncSession, Depends(get_async_read_session)]
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
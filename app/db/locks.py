@@ -0,0 +1,58 @@
+import hashlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.db.session import async_engine
+
+
+def lock_id(name: str) -> int:
+    """Signed 64-bit advisory lock key for a name"""
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+def _uses_advisory_locks(bind) -> bool:
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+async def lock_for_transaction(session: AsyncSession, names: Iterable[str]) -> None:
+    """Hold advisory locks on names until the session's transaction ends.
+
+    Locks are taken in sorted order so two holders of overlapping sets cannot
+    deadlock. Other databases (SQLite in development) have no advisory locks and
+    run a single process, so this is a no-op there.
+    """
+    if not _uses_advisory_locks(session.bind):
+        return
+    for name in sorted(set(names)):
+        await session.execute(select(func.pg_advisory_xact_lock(lock_id(name))))
+
+
+@asynccontextmanager
+async def try_exclusive(name: str) -> AsyncIterator[Optional[AsyncConnection]]:
+    """Try to become the only holder of a named lock across all processes, without waiting.
+
+    Yields the pooled connection holding the lock, or None if someone else holds it.
+    The connection is left outside any transaction; run the guarded work on it (e.g.
+    sessions bound to it) so the lock costs no connection of its own. The lock is
+    released when the block exits.
+    """
+    async with async_engine.connect() as conn:
+        if not _uses_advisory_locks(async_engine):
+            yield conn
+            return
+        key = lock_id(name)
+        acquired = bool(await conn.scalar(select(func.pg_try_advisory_lock(key))))
+        # Session-level locks outlive the transaction; don't sit idle in it
+        await conn.commit()
+        if not acquired:
+            yield None
+            return
+        try:
+            yield conn
+        finally:
+            await conn.rollback()
+            await conn.scalar(select(func.pg_advisory_unlock(key)))
+            await conn.commit()
@@ -0,0 +1,171 @@
+import math
+import threading
+import time
+from typing import Any, Dict, Tuple
+from uuid import uuid4
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import Settings
+from app.core.logging import get_logger
+
+logger = get_logger("db.pool")
+
+
+def reserved_connections(settings: Settings) -> int:
+    """Connections each worker opens outside its pool: the upload progress LISTEN connection"""
+    return 1 if settings.progress_listen_url or settings.database_url.startswith("postgresql") else 0
+
+
+def compute_pool_limits(settings: Settings) -> Tuple[int, int]:
+    """Derive per-worker pool size and overflow from the global connection budget.
+
+    Each worker's share leaves room for its reserved connections. Every worker still
+    gets at least one pooled connection, so a budget too small for the worker count
+    (or explicit sizes that overshoot it) is logged rather than silently exceeded.
+    """
+    workers = max(1, settings.web_concurrency)
+    reserved = reserved_connections(settings)
+    per_worker = max(1, settings.database_max_connections // workers - reserved)
+
+    pool_size = settings.database_pool_size
+    if pool_size is None:
+        # Keep a third of the share warm and allow bursts up to the full share
+        pool_size = max(1, math.ceil(per_worker / 3))
+
+    max_overflow = settings.database_max_overflow
+    if max_overflow is None:
+        max_overflow = max(0, per_worker - pool_size)
+
+    needed = workers * (pool_size + max_overflow + reserved)
+    if needed > settings.database_max_connections:
+        logger.warning(
+            "database_connection_budget_exceeded",
+            budget=settings.database_max_connections,
+            needed=needed,
+            workers=workers,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            reserved=reserved,
+        )
+    return pool_size, max_overflow
+
+
+def asyncpg_connect_args(settings: Settings) -> Dict[str, Any]:
+    """asyncpg connect arguments for the configured statement caching mode"""
+    if not settings.database_url.startswith("postgresql+asyncpg"):
+        return {}
+    if settings.database_pgbouncer_mode:
+        return pgbouncer_connect_args()
+    return {
+        "statement_cache_size": settings.database_statement_cache_size,
+        "prepared_statement_cache_size": settings.database_statement_cache_size,
+    }
+
+
+def pgbouncer_connect_args() -> Dict[str, Any]:
+    """asyncpg connect arguments that are safe behind PgBouncer transaction pooling"""
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+
+class PoolMetrics:
+    """Process-wide counters for connection pool checkouts and wait time"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait_time_total = 0.0
+            self.wait_time_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_time_avg_ms": round(self.wait_time_total / waits * 1000, 3) if waits else 0.0,
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long callers wait for a connection"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def max_overflow(self) -> int:
+        return self._max_overflow
+
+
+def instrument_pool(pool: InstrumentedAsyncQueuePool) -> None:
+    """Register checkout/checkin listeners that feed the process-wide metrics"""
+
+    def on_connect(dbapi_connection, connection_record) -> None:
+        pool_metrics.increment("connects")
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        pool_metrics.increment("checkouts")
+
+    def on_checkin(dbapi_connection, connection_record) -> None:
+        pool_metrics.increment("checkins")
+
+    def on_invalidate(dbapi_connection, connection_record, exception) -> None:
+        pool_metrics.increment("invalidations")
+
+    event.listen(pool, "connect", on_connect)
+    event.listen(pool, "checkout", on_checkout)
+    event.listen(pool, "checkin", on_checkin)
+    event.listen(pool, "invalidate", on_invalidate)
+
+
+def get_pool_status(pool: InstrumentedAsyncQueuePool) -> Dict[str, Any]:
+    """Current pool occupancy merged with the cumulative metrics"""
+    capacity = pool.size() + max(0, pool.max_overflow())
+    checked_out = pool.checkedout()
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": pool.max_overflow(),
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+        **pool_metrics.snapshot(),
+    }
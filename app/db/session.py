@@ -1,23 +1,42 @@
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import NullPool
 
 from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.pool import (
+    InstrumentedAsyncQueuePool,
+    asyncpg_connect_args,
+    compute_pool_limits,
+    get_pool_status,
+    instrument_pool,
+)
 
 settings = get_settings()
+logger = get_logger("db.session")
 
 
 def create_engine():
-    return create_async_engine(
+    pool_size, max_overflow = compute_pool_limits(settings)
+
+    engine = create_async_engine(
         settings.database_url,
         echo=settings.database_echo,
-        pool_size=settings.database_pool_size,
-        max_overflow=settings.database_max_overflow,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.database_pool_timeout,
         pool_pre_ping=True,
         pool_recycle=settings.database_pool_recycle,
+        query_cache_size=settings.database_query_cache_size,
+        connect_args=asyncpg_connect_args(settings),
     )
+    instrument_pool(engine.pool)
+    return engine
 
 
 def create_test_engine():
@@ -28,6 +47,20 @@ def create_test_engine():
     )
 
 
+class ReadOnlySession(Session):
+    """Session for read-only handlers; refuses to flush pending writes or execute DML"""
+
+    def flush(self, objects=None) -> None:
+        if self.new or self.dirty or self.deleted:
+            raise RuntimeError("Cannot write through a read-only database session")
+        super().flush(objects)
+
+    def execute(self, statement, *args, **kwargs):
+        if getattr(statement, "is_dml", False):
+            raise RuntimeError("Cannot write through a read-only database session")
+        return super().execute(statement, *args, **kwargs)
+
+
 async_engine = create_engine() if settings.database_url else None
 
 async_session_factory = sessionmaker(
@@ -38,6 +71,28 @@ async_session_factory = sessionmaker(
     autoflush=False,
 ) if async_engine else None
 
+# Read-only sessions share the pool but run in autocommit mode, so a lookup costs
+# one round-trip instead of BEGIN / SELECT / COMMIT
+async_read_session_factory = sessionmaker(
+    bind=async_engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    expire_on_commit=False,
+    autoflush=False,
+) if async_engine else None
+
+
+# Streaming sessions hold a READ ONLY transaction open, which asyncpg requires for
+# server-side cursors; they are opened by the response body itself because yield
+# dependencies are torn down before a StreamingResponse finishes sending
+async_stream_session_factory = sessionmaker(
+    bind=async_engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    expire_on_commit=False,
+    autoflush=False,
+) if async_engine else None
+
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     if async_session_factory is None:
@@ -54,21 +109,72 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-async def check_database_connection() -> bool:
+async def get_async_read_session() -> AsyncGenerator[AsyncSession, None]:
+    if async_read_session_factory is None:
+        raise RuntimeError("Database is not configured")
+
+    async with async_read_session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+@asynccontextmanager
+async def streaming_session(repeatable_read: bool = False) -> AsyncIterator[AsyncSession]:
+    """Read-only session for server-side cursors.
+
+    With repeatable_read, every query in the session sees the same snapshot of the
+    database on Postgres; SQLite (development) has a single writer anyway.
+    """
+    if async_stream_session_factory is None:
+        raise RuntimeError("Database is not configured")
+
+    async with async_stream_session_factory() as session:
+        try:
+            if repeatable_read and session.bind.dialect.name == "postgresql":
+                await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            yield session
+        finally:
+            await session.close()
+
+
+async def ping_database() -> None:
+    """Run a trivial query, raising if the database is unreachable"""
     if async_engine is None:
-        return False
+        raise RuntimeError("Database is not configured")
 
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def check_database_connection() -> bool:
     try:
-        async with async_engine.connect() as conn:
-            await conn.execute("SELECT 1")
+        await ping_database()
         return True
     except Exception:
         return False
 
 
+def get_database_pool_status() -> Optional[Dict[str, Any]]:
+    if async_engine is None:
+        return None
+    return get_pool_status(async_engine.pool)
+
+
 async def init_db() -> None:
     if async_engine is None:
         return
+
+    pool = async_engine.pool
+    logger.info(
+        "database_pool_configured",
+        pool_size=pool.size(),
+        max_overflow=pool.max_overflow(),
+        workers=settings.web_concurrency,
+        connection_budget=settings.database_max_connections,
+        pgbouncer_mode=settings.database_pgbouncer_mode,
+    )
     # Database initialization logic can be added here
     # For now, we rely on Alembic migrations
 
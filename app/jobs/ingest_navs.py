@@ -0,0 +1,55 @@
+"""Load AMFI NAV files from the drop directory into the price store.
+
+Intended to run after each daily NAV download (cron / scheduled task). Schemes
+seen in the files are also added to or refreshed in the security master:
+
+    python -m app.jobs.ingest_navs                   # everything in NAV_DROP_DIR
+    python -m app.jobs.ingest_navs NAVAll.txt ...    # specific files, left in place
+"""
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Iterable
+
+from app.core.logging import setup_logging
+from app.db.session import async_session_factory, close_db
+from app.models.price import NavIngestResult
+from app.services.nav_ingest import SchemeInfo, get_nav_ingest_service
+from app.services.security_master import get_security_master_service
+
+
+async def update_security_master(schemes: Iterable[SchemeInfo]) -> int:
+    if async_session_factory is None:
+        return 0
+    try:
+        async with async_session_factory() as session:
+            written = await get_security_master_service().upsert_schemes(session, schemes)
+            await session.commit()
+        return written
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", type=Path, help="ingest these files instead of the drop directory")
+    args = parser.parse_args()
+
+    setup_logging()
+    service = get_nav_ingest_service()
+    if args.files:
+        result = NavIngestResult(files=0, records=0, skipped_lines=0)
+        for path in args.files:
+            records, skipped = service.ingest_file(path)
+            result.files += 1
+            result.records += records
+            result.skipped_lines += skipped
+    else:
+        result = service.ingest_pending()
+    if service.schemes:
+        asyncio.run(update_security_master(service.schemes.values()))
+    print(result.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
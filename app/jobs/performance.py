@@ -0,0 +1,65 @@
+"""Extend and repair the daily portfolio performance series.
+
+Intended to run nightly after NAV ingestion (cron / scheduled task). Each user's
+series is recomputed only from the earliest invalidated day or the day after it
+was last computed:
+
+    python -m app.jobs.performance                  # all users
+    python -m app.jobs.performance --user-id UUID   # a single user
+    python -m app.jobs.performance --rebuild        # recompute from inception
+"""
+import argparse
+import asyncio
+import json
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, select
+
+from app.core.logging import setup_logging
+from app.db.session import async_session_factory, close_db
+from app.models.performance import PortfolioPerformanceState
+from app.models.statement import ParsedTransaction
+from app.services.performance import get_performance_service
+
+
+async def run(user_id: Optional[UUID], rebuild: bool) -> Dict[str, int]:
+    service = get_performance_service()
+    stats = {"users": 0, "days": 0}
+    try:
+        async with async_session_factory() as session:
+            if user_id is not None:
+                user_ids = [str(user_id)]
+            else:
+                result = await session.execute(select(ParsedTransaction.user_id).distinct())
+                user_ids = list(result.scalars())
+            if rebuild:
+                stmt = delete(PortfolioPerformanceState)
+                if user_id is not None:
+                    stmt = stmt.where(PortfolioPerformanceState.user_id == str(user_id))
+                await session.execute(stmt)
+                await session.commit()
+
+        for uid in user_ids:
+            async with async_session_factory() as session:
+                days = await service.recompute(session, uid)
+                await session.commit()
+            stats["users"] += 1 if days else 0
+            stats["days"] += days
+        return stats
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user-id", type=UUID, help="only update this user's series")
+    parser.add_argument("--rebuild", action="store_true", help="discard progress and recompute from inception")
+    args = parser.parse_args()
+
+    setup_logging()
+    print(json.dumps(asyncio.run(run(args.user_id, args.rebuild)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
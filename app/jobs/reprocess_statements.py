@@ -0,0 +1,63 @@
+"""Re-parse stored statements of one type after its parser changed.
+
+Changes are diff-applied to the parsed transactions. Progress is checkpointed after
+every page of statements, so an interrupted run continues where it stopped when started
+again (unless --restart is given or the parser version changed):
+
+    python -m app.jobs.reprocess_statements cams
+    python -m app.jobs.reprocess_statements zerodha --concurrency 8 --rate 20
+    python -m app.jobs.reprocess_statements cams --dry-run --limit 500
+
+Password-protected PDFs can only be re-parsed while their page text is cached. Statement
+passwords and the PAN / date of birth they derive from are never stored, so an encrypted
+file whose cache is gone (another host, a wiped PDF_PAGE_CACHE_DIR, an extractor version
+bump) is reported under "locked" and left as it was; its owner has to upload it again.
+"""
+import argparse
+import asyncio
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.logging import setup_logging
+from app.db.session import close_db
+from app.models.enums import StatementType
+from app.models.reprocess import ReprocessResult
+from app.services.pdf_extract import get_pdf_extraction_service
+from app.services.reprocess import get_reprocess_service
+
+settings = get_settings()
+
+
+async def run(
+    statement_type: StatementType,
+    concurrency: int,
+    rate: float,
+    dry_run: bool,
+    restart: bool,
+    limit: Optional[int],
+) -> ReprocessResult:
+    try:
+        return await get_reprocess_service().run(statement_type, concurrency, rate, dry_run, restart, limit)
+    finally:
+        get_pdf_extraction_service().close()
+        await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("statement_type", type=StatementType, choices=list(StatementType), metavar="statement_type")
+    parser.add_argument("--concurrency", type=int, default=settings.reprocess_concurrency,
+                        help="statements re-parsed at the same time")
+    parser.add_argument("--rate", type=float, default=0.0, help="at most this many statements per second")
+    parser.add_argument("--dry-run", action="store_true", help="report the changes without writing them")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start over")
+    parser.add_argument("--limit", type=int, help="stop after this many statements")
+    args = parser.parse_args()
+
+    setup_logging()
+    result = asyncio.run(run(args.statement_type, args.concurrency, args.rate, args.dry_run, args.restart, args.limit))
+    print(result.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Backfill canonical scheme codes on stored transactions.
+
+Statements are resolved against the security master as they are ingested; this job
+catches rows stored before that or before the master knew their scheme. Distinct
+names and symbols are matched in bulk against the in-memory index; run after the
+master is refreshed:
+
+    python -m app.jobs.resolve_securities
+"""
+import argparse
+import asyncio
+import json
+from typing import Dict
+
+from app.core.logging import setup_logging
+from app.db.session import async_session_factory, close_db
+from app.services.security_master import get_security_master_service
+
+
+async def run() -> Dict[str, int]:
+    try:
+        async with async_session_factory() as session:
+            stats = await get_security_master_service().resolve_transactions(session)
+            await session.commit()
+        return stats
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+    setup_logging()
+    print(json.dumps(asyncio.run(run()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
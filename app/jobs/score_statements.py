@@ -0,0 +1,42 @@
+"""Score parsed statements and auto-confirm the confident ones.
+
+Scores every statement that has not been scored or confirmed yet; statements
+below the confidence thresholds stay unconfirmed and appear in the review queue:
+
+    python -m app.jobs.score_statements [--limit N]
+"""
+import argparse
+import asyncio
+import json
+from typing import Dict, Optional
+
+from app.core.logging import setup_logging
+from app.db.session import async_session_factory, close_db
+from app.services.confidence import get_confidence_service
+
+
+async def run(limit: Optional[int]) -> Dict[str, int]:
+    try:
+        async with async_session_factory() as session:
+            outcomes = await get_confidence_service().score_pending(session, limit)
+            await session.commit()
+        return {
+            "statements": len(outcomes),
+            "auto_confirmed": sum(1 for outcome in outcomes if outcome["auto_confirmed"]),
+            "needs_review": sum(1 for outcome in outcomes if not outcome["auto_confirmed"]),
+        }
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, help="score at most this many statements")
+    args = parser.parse_args()
+
+    setup_logging()
+    print(json.dumps(asyncio.run(run(args.limit)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Export a Parquet snapshot of transactions and holdings.
+
+Intended to run nightly (cron / scheduled task):
+
+    python -m app.jobs.snapshot                 # all users
+    python -m app.jobs.snapshot --user-id UUID  # a single user
+"""
+import argparse
+import asyncio
+from typing import Optional
+from uuid import UUID
+
+from app.core.logging import setup_logging
+from app.db.session import close_db
+from app.models.snapshot import SnapshotManifest
+from app.services.snapshot import get_snapshot_service
+
+
+async def run(user_id: Optional[UUID]) -> SnapshotManifest:
+    try:
+        return await get_snapshot_service().create_snapshot(str(user_id) if user_id else None)
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user-id", type=UUID, help="only export this user's data")
+    args = parser.parse_args()
+
+    setup_logging()
+    manifest = asyncio.run(run(args.user_id))
+    print(manifest.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Expire abandoned upload sessions and delete their unconfirmed statement files.
+
+The API runs the same sweep periodically (UPLOAD_SWEEP_INTERVAL_SECONDS); this
+command is for deployments that disable it in favour of cron:
+
+    python -m app.jobs.sweep_uploads
+"""
+import argparse
+import asyncio
+
+from app.core.logging import setup_logging
+from app.db.session import close_db
+from app.models.upload import UploadSweepResult
+from app.services.upload_sweeper import get_upload_sweeper
+
+
+async def run() -> UploadSweepResult:
+    try:
+        return await get_upload_sweeper().sweep()
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    setup_logging()
+    print(asyncio.run(run()).model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
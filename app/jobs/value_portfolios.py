@@ -0,0 +1,37 @@
+"""Value every user's portfolio and store the results.
+
+Intended to run nightly after NAV ingestion (cron / scheduled task):
+
+    python -m app.jobs.value_portfolios                     # latest NAV date
+    python -m app.jobs.value_portfolios --as-of 2024-03-31
+"""
+import argparse
+import asyncio
+import json
+from datetime import date
+from typing import Dict, Optional
+
+from app.core.logging import setup_logging
+from app.db.session import close_db
+from app.services.valuation import get_valuation_service
+
+
+async def run(as_of: Optional[date]) -> Dict[str, float]:
+    service = get_valuation_service()
+    try:
+        return await service.value_all(service.resolve_as_of(as_of))
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--as-of", type=date.fromisoformat, help="valuation date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    setup_logging()
+    print(json.dumps(asyncio.run(run(args.as_of)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
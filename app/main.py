@@ -11,9 +11,14 @@ from app.core.exceptions import (
     http_exception_handler,
 )
 from app.core.logging import setup_logging, get_logger
-from app.db.session import init_db, close_db
+from app.core.responses import ORJSONResponse
+from app.db.session import async_engine, init_db, close_db, ping_database
 from app.middleware.cors import setup_cors
 from app.middleware.logging import setup_logging_middleware
+from app.services.health import health_monitor
+from app.services.pdf_extract import pdf_extraction_service
+from app.services.progress import upload_progress
+from app.services.upload_sweeper import upload_sweeper
 
 settings = get_settings()
 logger = get_logger(__name__)
@@ -27,8 +32,18 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("database_initialized")
 
+    if async_engine is not None:
+        health_monitor.register_probe("database", ping_database)
+    await health_monitor.start()
+    await upload_sweeper.start()
+    await upload_progress.start()
+
     yield
 
+    await upload_progress.stop()
+    await upload_sweeper.stop()
+    pdf_extraction_service.close()
+    await health_monitor.stop()
     await close_db()
     logger.info("database_connections_closed")
     logger.info("application_shutdown")
@@ -41,6 +56,7 @@ app = FastAPI(
     openapi_url=f"{settings.api_v1_prefix}/openapi.json",
     docs_url=f"{settings.api_v1_prefix}/docs",
     redoc_url=f"{settings.api_v1_prefix}/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
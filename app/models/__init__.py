@@ -5,21 +5,36 @@ from app.models.statement import (
     Statement,
     ParsedTransaction,
     StatementFile,
+    StatementPasswordPattern,
 )
 from app.models.enums import (
     UploadSessionStatus,
     StatementType,
     TransactionType,
+    ExportFormat,
+    FileCodec,
 )
 from app.models.user import User
+from app.models.valuation import PortfolioValuation
+from app.models.performance import PortfolioPerformance, PortfolioPerformanceState
+from app.models.security import Security
+from app.models.rate_limit import RateLimitBucket
 
 __all__ = [
     "UploadSession",
     "Statement",
     "ParsedTransaction",
     "StatementFile",
+    "StatementPasswordPattern",
     "UploadSessionStatus",
     "StatementType",
     "TransactionType",
+    "ExportFormat",
+    "FileCodec",
     "User",
+    "PortfolioValuation",
+    "PortfolioPerformance",
+    "PortfolioPerformanceState",
+    "Security",
+    "RateLimitBucket",
 ]
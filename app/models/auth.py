@@ -1,4 +1,5 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, EmailStr
 
@@ -35,6 +36,13 @@ class HealthResponse(BaseModel):
     environment: str
 
 
+class HealthCheckResult(BaseModel):
+    healthy: bool
+    latency_ms: float
+    checked_at: datetime
+    error: Optional[str] = None
+
+
 class DetailedHealthResponse(BaseModel):
     status: str
     version: str
@@ -43,6 +51,23 @@ class DetailedHealthResponse(BaseModel):
     api_keys_configured: bool
     database_configured: bool
     database_connected: bool
+    checks: Dict[str, HealthCheckResult] = {}
+
+
+class PoolStatusResponse(BaseModel):
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    saturation: float
+    connects: int
+    checkouts: int
+    checkins: int
+    invalidations: int
+    timeouts: int
+    wait_time_avg_ms: float
+    wait_time_max_ms: float
 
 
 class UserRegister(BaseModel):
@@ -0,0 +1,35 @@
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class RealizedGain(BaseModel):
+    folio_number: Optional[str] = None
+    security_symbol: str
+    security_name: Optional[str] = None
+    acquired_on: Optional[date] = None
+    sold_on: date
+    units: Decimal
+    cost: Decimal
+    proceeds: Decimal
+    gain: Decimal
+    holding_days: Optional[int] = None
+    long_term: bool
+    unmatched: bool = False
+
+
+class CapitalGainsSummary(BaseModel):
+    financial_year: str
+    short_term_gain: Decimal
+    long_term_gain: Decimal
+    total_proceeds: Decimal
+    total_cost: Decimal
+    unmatched_units: Decimal
+    gains: Optional[List[RealizedGain]] = None
+
+
+class CapitalGainsResponse(BaseModel):
+    long_term_threshold_days: int
+    years: List[CapitalGainsSummary]
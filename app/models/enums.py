@@ -34,3 +34,15 @@ class TransactionType(str, Enum):
     BONUS = "bonus"
     SPLIT = "split"
     OTHER = "other"
+
+
+class ExportFormat(str, Enum):
+    """File format of a transaction export"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class FileCodec(str, Enum):
+    """Encoding of a stored statement file"""
+    IDENTITY = "identity"
+    ZSTD = "zstd"
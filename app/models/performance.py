@@ -0,0 +1,51 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel as PydanticBaseModel
+from sqlalchemy import Date, UniqueConstraint
+from sqlmodel import Column, Field
+
+from app.db.base import BaseModel
+
+
+class PortfolioPerformance(BaseModel, table=True):
+    """One day of a user's portfolio value series"""
+
+    __tablename__ = "portfolio_performance"
+    __table_args__ = (UniqueConstraint("user_id", "series_date"),)
+
+    user_id: str = Field(index=True, nullable=False, description="User ID (UUID)")
+    series_date: date = Field(sa_column=Column(Date, nullable=False), description="Day of the data point")
+    market_value: float = Field(nullable=False, description="Value of priced holdings at end of day")
+    invested_amount: float = Field(nullable=False, description="Net amount invested at end of day")
+
+
+class PortfolioPerformanceState(BaseModel, table=True):
+    """How far a user's performance series is computed and from where it must be redone"""
+
+    __tablename__ = "portfolio_performance_state"
+
+    user_id: str = Field(unique=True, index=True, nullable=False, description="User ID (UUID)")
+    computed_through: Optional[date] = Field(
+        default=None,
+        sa_column=Column(Date, nullable=True),
+        description="Last day present in the series",
+    )
+    dirty_from: Optional[date] = Field(
+        default=None,
+        sa_column=Column(Date, nullable=True),
+        description="Earliest day invalidated by newly confirmed transactions",
+    )
+
+
+class PerformancePoint(PydanticBaseModel):
+    date: date
+    market_value: float
+    invested_amount: float
+
+
+class PerformanceSeriesResponse(PydanticBaseModel):
+    start: Optional[date] = None
+    end: Optional[date] = None
+    interval_days: int
+    points: List[PerformancePoint]
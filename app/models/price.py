@@ -0,0 +1,29 @@
+from datetime import date
+from typing import List
+
+from pydantic import BaseModel
+
+
+class PricePoint(BaseModel):
+    symbol: str
+    as_of: date
+    nav: float
+    nav_date: date
+
+
+class PriceHistoryPoint(BaseModel):
+    nav_date: date
+    nav: float
+
+
+class PriceHistoryResponse(BaseModel):
+    symbol: str
+    start: date
+    end: date
+    points: List[PriceHistoryPoint]
+
+
+class NavIngestResult(BaseModel):
+    files: int
+    records: int
+    skipped_lines: int
@@ -0,0 +1,12 @@
+from sqlmodel import Field
+
+from app.db.base import BaseModel
+
+
+class RateLimitBucket(BaseModel, table=True):
+    """Token bucket shared by all workers; updated_at is when it was last refilled"""
+
+    __tablename__ = "rate_limit_buckets"
+
+    key: str = Field(unique=True, index=True, nullable=False, description="Scope and client, e.g. login:ip:10.0.0.1")
+    tokens: float = Field(nullable=False, description="Tokens left at updated_at")
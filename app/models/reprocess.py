@@ -0,0 +1,24 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.models.enums import StatementType
+
+
+class ReprocessResult(BaseModel):
+    statement_type: StatementType
+    parser_version: int
+    dry_run: bool = False
+    resumed_after: Optional[str] = None
+    statements: int = 0
+    changed: int = 0
+    failed: int = 0
+    # Statements to retry before the next run continues after resumed_after
+    failed_ids: List[str] = []
+    # Encrypted PDFs without cached page text: unlocking needs the user's PAN or password
+    locked: int = 0
+    locked_ids: List[str] = []
+    rows_unchanged: int = 0
+    rows_updated: int = 0
+    rows_inserted: int = 0
+    rows_deleted: int = 0
@@ -0,0 +1,36 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.models.enums import StatementType
+
+
+class StatementReviewItem(BaseModel):
+    id: UUID
+    file_name: str
+    statement_type: StatementType
+    statement_date: Optional[datetime] = None
+    folio_number: Optional[str] = None
+    parsing_confidence: Optional[Decimal] = None
+    transaction_count: int
+    created_at: datetime
+
+
+class StatementReviewResponse(BaseModel):
+    statements: List[StatementReviewItem]
+
+
+class ConfirmStatementRequest(BaseModel):
+    excluded_transaction_ids: List[UUID] = Field(default_factory=list, max_length=10000)
+
+
+class ConfirmStatementResponse(BaseModel):
+    statement_id: UUID
+    user_id: str
+    confirmed_at: datetime
+    confirmed_transactions: int
+    excluded_transactions: int
+    earliest_transaction_date: Optional[date] = None
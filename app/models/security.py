@@ -0,0 +1,35 @@
+from typing import List, Optional
+
+from pydantic import BaseModel as PydanticBaseModel
+from pydantic import Field as PydanticField
+from sqlmodel import Field
+
+from app.db.base import BaseModel
+
+
+class Security(BaseModel, table=True):
+    """Canonical mutual fund scheme, keyed by its AMFI scheme code"""
+
+    __tablename__ = "securities"
+
+    scheme_code: str = Field(unique=True, index=True, nullable=False, description="AMFI scheme code")
+    name: str = Field(nullable=False, description="Scheme name as published by AMFI")
+    isin_growth: Optional[str] = Field(default=None, index=True, nullable=True, description="Payout / growth ISIN")
+    isin_reinvestment: Optional[str] = Field(default=None, index=True, nullable=True, description="Reinvestment ISIN")
+    fund_house: Optional[str] = Field(default=None, nullable=True, description="Asset management company")
+    category: Optional[str] = Field(default=None, nullable=True, description="AMFI scheme category")
+
+
+class SecurityMatch(PydanticBaseModel):
+    query: str
+    scheme_code: Optional[str] = None
+    name: Optional[str] = None
+    score: float = 0.0
+
+
+class SecurityResolveRequest(PydanticBaseModel):
+    names: List[str] = PydanticField(..., min_length=1, max_length=5000)
+
+
+class SecurityResolveResponse(PydanticBaseModel):
+    matches: List[SecurityMatch]
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class SnapshotFile(BaseModel):
+    dataset: str
+    path: str
+    rows: int
+    size_bytes: int
+
+
+class SnapshotManifest(BaseModel):
+    snapshot_id: str
+    created_at: datetime
+    user_id: Optional[str] = None
+    transaction_rows: int
+    holding_rows: int
+    files: List[SnapshotFile]
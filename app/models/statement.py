@@ -1,13 +1,26 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from enum import Enum
+from typing import List, Optional, Type
 from uuid import UUID
 
 from sqlmodel import Field, Relationship, Column, Text, JSON
-from sqlalchemy import ForeignKey
+from sqlalchemy import Enum as SAEnum, ForeignKey, UniqueConstraint
 
 from app.db.base import BaseModel
-from app.models.enums import UploadSessionStatus, StatementType, TransactionType
+from app.models.enums import FileCodec, UploadSessionStatus, StatementType, TransactionType
+
+
+def _enum_values(enum: Type[Enum]) -> List[str]:
+    return [member.value for member in enum]
+
+
+def enum_column(enum: Type[Enum], name: str, **kwargs) -> Column:
+    """Column storing a str enum by value, as the Postgres enum types in the migrations expect.
+
+    SQLAlchemy's default is the member name ('PURCHASE'), which Postgres rejects.
+    """
+    return Column(SAEnum(enum, name=name, values_callable=_enum_values), **kwargs)
 
 
 class UploadSession(BaseModel, table=True):
@@ -18,12 +31,12 @@ class UploadSession(BaseModel, table=True):
     user_id: str = Field(index=True, nullable=False, description="User ID (UUID)")
     status: UploadSessionStatus = Field(
         default=UploadSessionStatus.PENDING,
-        nullable=False,
+        sa_column=enum_column(UploadSessionStatus, "uploadsessionstatus", nullable=False),
         description="Current status of the upload session"
     )
     statement_type: Optional[StatementType] = Field(
         default=None,
-        nullable=True,
+        sa_column=enum_column(StatementType, "statementtype", nullable=True),
         description="Type of statement being uploaded"
     )
     expires_at: Optional[datetime] = Field(
@@ -55,7 +68,10 @@ class Statement(BaseModel, table=True):
     user_id: str = Field(index=True, nullable=False, description="User ID (UUID)")
     file_name: str = Field(nullable=False, description="Original filename")
     file_size_bytes: int = Field(nullable=False, description="File size in bytes")
-    statement_type: StatementType = Field(nullable=False, description="Type of statement")
+    statement_type: StatementType = Field(
+        sa_column=enum_column(StatementType, "statementtype", nullable=False),
+        description="Type of statement"
+    )
     statement_date: Optional[datetime] = Field(
         default=None,
         nullable=True,
@@ -104,7 +120,10 @@ class ParsedTransaction(BaseModel, table=True):
         description="Reference to the statement"
     )
     user_id: str = Field(index=True, nullable=False, description="User ID (UUID)")
-    transaction_type: TransactionType = Field(nullable=False, description="Type of transaction")
+    transaction_type: TransactionType = Field(
+        sa_column=enum_column(TransactionType, "transactiontype", nullable=False),
+        description="Type of transaction"
+    )
     transaction_date: datetime = Field(nullable=False, index=True, description="Date of transaction")
     security_name: Optional[str] = Field(
         default=None,
@@ -181,6 +200,25 @@ class StatementFile(BaseModel, table=True):
     )
     local_file_path: str = Field(nullable=False, description="Local filesystem path to the file")
     file_hash: str = Field(nullable=False, index=True, description="SHA-256 hash of the file")
+    codec: FileCodec = Field(
+        default=FileCodec.IDENTITY,
+        sa_column=enum_column(FileCodec, "filecodec", nullable=False, server_default=FileCodec.IDENTITY.value),
+        description="Compression applied to the stored file"
+    )
     
     # Relationships
     statement: Statement = Relationship(back_populates="statement_file")
+
+
+class StatementPasswordPattern(BaseModel, table=True):
+    """Which password pattern last opened a user's PDFs from an institution; never the password itself"""
+
+    __tablename__ = "statement_password_patterns"
+    __table_args__ = (UniqueConstraint("user_id", "statement_type"),)
+
+    user_id: str = Field(index=True, nullable=False, description="User ID (UUID)")
+    statement_type: StatementType = Field(
+        sa_column=enum_column(StatementType, "statementtype", nullable=False),
+        description="Institution issuing the statements"
+    )
+    pattern: str = Field(nullable=False, description="Name of the password pattern, e.g. pan_upper")
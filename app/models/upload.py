@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.models.enums import UploadSessionStatus
+
+
+class UploadResponse(BaseModel):
+    upload_session_id: UUID
+    statement_id: UUID
+    status: UploadSessionStatus
+
+
+class UploadSweepResult(BaseModel):
+    expired_sessions: int = 0
+    files_deleted: int = 0
+    files_missing: int = 0
+    files_failed: int = 0
+    bytes_reclaimed: int = 0
+
+
+class UploadProgressEvent(BaseModel):
+    upload_session_id: UUID
+    status: UploadSessionStatus
+    pages_processed: Optional[int] = None
+    pages_total: Optional[int] = None
+    transactions_parsed: Optional[int] = None
+    detail: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,54 @@
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel as PydanticBaseModel
+from pydantic import Field as PydanticField
+from sqlalchemy import Date, UniqueConstraint
+from sqlmodel import Column, Field
+
+from app.db.base import BaseModel
+
+
+class PortfolioValuation(BaseModel, table=True):
+    """Market value of a user's portfolio on a date, written by the nightly valuation job"""
+
+    __tablename__ = "portfolio_valuations"
+    __table_args__ = (UniqueConstraint("user_id", "as_of_date"),)
+
+    user_id: str = Field(index=True, nullable=False, description="User ID (UUID)")
+    as_of_date: date = Field(sa_column=Column(Date, nullable=False, index=True), description="Valuation date")
+    market_value: float = Field(nullable=False, description="Value of priced holdings")
+    invested_amount: float = Field(nullable=False, description="Net amount invested in current holdings")
+    holdings_count: int = Field(nullable=False, description="Number of non-zero holdings")
+    unpriced_holdings: int = Field(default=0, nullable=False, description="Holdings without a NAV on the date")
+
+
+class HoldingValuation(PydanticBaseModel):
+    security_symbol: str
+    security_name: Optional[str] = None
+    units: float
+    invested_amount: float
+    nav: Optional[float] = None
+    market_value: Optional[float] = None
+
+
+class PortfolioValuationResponse(PydanticBaseModel):
+    user_id: str
+    as_of: date
+    market_value: float
+    invested_amount: float
+    holdings_count: int
+    unpriced_holdings: int
+    holdings: Optional[List[HoldingValuation]] = None
+
+
+class BatchValuationRequest(PydanticBaseModel):
+    user_ids: List[UUID] = PydanticField(..., min_length=1, max_length=1000)
+    as_of: Optional[date] = None
+    include_holdings: bool = False
+
+
+class BatchValuationResponse(PydanticBaseModel):
+    as_of: date
+    portfolios: List[PortfolioValuationResponse]
@@ -0,0 +1,72 @@
+import time
+
+from app.core.config import get_settings
+from app.core.exceptions import RateLimitError
+from app.core.logging import get_logger
+
+settings = get_settings()
+logger = get_logger("services.admission")
+
+# Assumed duration of a parse job until some have finished
+INITIAL_PARSE_SECONDS = 10.0
+# Weight of the latest job in the running average duration
+DURATION_SMOOTHING = 0.2
+
+
+class ParseSlot:
+    """One admitted parse job; release it when the job ends, however it ends"""
+
+    def __init__(self, admission: "ParseAdmission"):
+        self.admission = admission
+        self.started = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self.admission._release(time.monotonic() - self.started)
+
+    def __enter__(self) -> "ParseSlot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class ParseAdmission:
+    """Caps the parse jobs a worker runs at once, turning the excess away with a 429.
+
+    Extraction and parsing are CPU-heavy, so a bulk importer could otherwise keep every
+    worker busy and make interactive requests wait. Rejected uploads are told when to
+    retry: the average job duration spread over the running jobs, i.e. roughly when
+    the next slot frees up.
+    """
+
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.average_seconds = INITIAL_PARSE_SECONDS
+
+    def retry_after(self) -> float:
+        return self.average_seconds / max(self.max_in_flight, 1)
+
+    def acquire(self) -> ParseSlot:
+        """Admit a parse job or raise a 429 with Retry-After"""
+        if self.in_flight >= self.max_in_flight:
+            retry_after = self.retry_after()
+            logger.info("parse_admission_rejected", in_flight=self.in_flight, retry_after=round(retry_after, 1))
+            raise RateLimitError("Too many statements are being processed, please retry shortly", retry_after)
+        self.in_flight += 1
+        return ParseSlot(self)
+
+    def _release(self, seconds: float) -> None:
+        self.in_flight -= 1
+        self.average_seconds += DURATION_SMOOTHING * (seconds - self.average_seconds)
+
+
+# The configured limit is split across workers like the database connection budget
+parse_admission = ParseAdmission(max(1, settings.parse_max_in_flight // max(1, settings.web_concurrency)))
+
+
+def get_parse_admission() -> ParseAdmission:
+    return parse_admission
@@ -1,8 +1,5 @@
 from typing import Any, Dict, Optional
 
-import boto3
-from botocore.exceptions import ClientError
-
 from app.core.config import get_settings
 from app.core.exceptions import AuthenticationError, InternalServerError
 from app.core.logging import get_logger
@@ -19,6 +16,9 @@ class AuthService:
     @property
     def cognito_client(self):
         if self._cognito_client is None:
+            # boto3 takes ~hundreds of ms to import; only load it when Cognito is used
+            import boto3
+
             self._cognito_client = boto3.client(
                 "cognito-idp",
                 region_name=settings.aws_region,
@@ -39,6 +39,8 @@ class AuthService:
         if not settings.cognito_user_pool_id:
             raise InternalServerError("Cognito is not configured")
 
+        from botocore.exceptions import ClientError
+
         try:
             response = self.cognito_client.list_users(
                 UserPoolId=settings.cognito_user_pool_id,
@@ -71,6 +73,8 @@ class AuthService:
         if not settings.cognito_user_pool_id:
             raise InternalServerError("Cognito is not configured")
 
+        from botocore.exceptions import ClientError
+
         try:
             response = self.cognito_client.admin_list_groups_for_user(
                 UserPoolId=settings.cognito_user_pool_id,
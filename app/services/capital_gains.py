@@ -0,0 +1,227 @@
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.capital_gains import CapitalGainsSummary, RealizedGain
+from app.models.enums import TransactionType
+from app.models.statement import ParsedTransaction, Statement
+
+settings = get_settings()
+logger = get_logger("services.capital_gains")
+
+ZERO = Decimal(0)
+MONEY = Decimal("0.01")
+UNITS = Decimal("0.0001")
+
+BUY_TYPES = {TransactionType.PURCHASE, TransactionType.SIP}
+SELL_TYPES = {TransactionType.SALE, TransactionType.REDEMPTION, TransactionType.SWP}
+# Legs whose direction is carried by the sign of the parsed units
+SIGNED_TYPES = {TransactionType.SWITCH, TransactionType.STP}
+
+# Same-day ordering: corporate actions, then acquisitions, then disposals
+_ORDER = {TransactionType.SPLIT: 0, TransactionType.BONUS: 1}
+
+
+@dataclass
+class Lot:
+    units: Decimal
+    cost: Decimal
+    acquired_on: date
+
+
+def financial_year(day: date) -> str:
+    """Indian financial year (April to March) of a date, e.g. '2023-24'"""
+    start = day.year if day.month >= 4 else day.year - 1
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+def _sort_key(row) -> Tuple[datetime, int]:
+    units = row.units or ZERO
+    if row.transaction_type in _ORDER:
+        order = _ORDER[row.transaction_type]
+    elif row.transaction_type in SELL_TYPES or (row.transaction_type in SIGNED_TYPES and units < 0):
+        order = 3
+    else:
+        order = 2
+    return row.transaction_date, order
+
+
+def match_lots(rows: Iterable, long_term_days: int) -> List[RealizedGain]:
+    """Match disposals against acquisitions FIFO per folio and scheme in one pass.
+
+    `rows` need transaction_type, transaction_date, units, amount, security_symbol,
+    security_name and folio_number attributes. Each open position is a deque of
+    lots, so a disposal only touches the lots it consumes; splits rescale the lots
+    in place and bonus units enter as zero-cost lots dated on allotment.
+    """
+    positions: Dict[Tuple[Optional[str], str], Deque[Lot]] = defaultdict(deque)
+    gains: List[RealizedGain] = []
+
+    for row in sorted(rows, key=_sort_key):
+        units = row.units or ZERO
+        amount = abs(row.amount or ZERO)
+        day = row.transaction_date.date()
+        lots = positions[(row.folio_number, row.security_symbol)]
+        kind = row.transaction_type
+
+        if kind == TransactionType.SPLIT:
+            held = sum((lot.units for lot in lots), ZERO)
+            if held > 0 and units:
+                ratio = (held + units) / held
+                for lot in lots:
+                    lot.units *= ratio
+            continue
+
+        if kind == TransactionType.BONUS:
+            if units > 0:
+                lots.append(Lot(units=units, cost=ZERO, acquired_on=day))
+            continue
+
+        if kind in BUY_TYPES or (kind in SIGNED_TYPES and units > 0):
+            if units:
+                lots.append(Lot(units=abs(units), cost=amount, acquired_on=day))
+            continue
+
+        if not (kind in SELL_TYPES or (kind in SIGNED_TYPES and units < 0)):
+            continue
+
+        remaining = abs(units)
+        sold = remaining
+        while remaining > 0 and lots:
+            lot = lots[0]
+            take = min(lot.units, remaining)
+            cost = lot.cost * take / lot.units
+            proceeds = amount * take / sold
+            holding_days = (day - lot.acquired_on).days
+            gains.append(RealizedGain(
+                folio_number=row.folio_number,
+                security_symbol=row.security_symbol,
+                security_name=row.security_name,
+                acquired_on=lot.acquired_on,
+                sold_on=day,
+                units=take.quantize(UNITS),
+                cost=cost.quantize(MONEY),
+                proceeds=proceeds.quantize(MONEY),
+                gain=(proceeds - cost).quantize(MONEY),
+                holding_days=holding_days,
+                long_term=holding_days > long_term_days,
+            ))
+            lot.units -= take
+            lot.cost -= cost
+            remaining -= take
+            if lot.units <= 0:
+                lots.popleft()
+
+        if remaining > 0:
+            # Acquisitions missing from the uploaded statements: report the proceeds without a cost basis
+            proceeds = amount * remaining / sold
+            gains.append(RealizedGain(
+                folio_number=row.folio_number,
+                security_symbol=row.security_symbol,
+                security_name=row.security_name,
+                sold_on=day,
+                units=remaining.quantize(UNITS),
+                cost=ZERO.quantize(MONEY),
+                proceeds=proceeds.quantize(MONEY),
+                gain=proceeds.quantize(MONEY),
+                long_term=False,
+                unmatched=True,
+            ))
+
+    return gains
+
+
+def summarise_by_year(gains: Iterable[RealizedGain]) -> Dict[str, CapitalGainsSummary]:
+    by_year: Dict[str, List[RealizedGain]] = defaultdict(list)
+    for gain in gains:
+        by_year[financial_year(gain.sold_on)].append(gain)
+
+    return {
+        year: CapitalGainsSummary(
+            financial_year=year,
+            short_term_gain=sum((g.gain for g in items if not g.long_term), ZERO).quantize(MONEY),
+            long_term_gain=sum((g.gain for g in items if g.long_term), ZERO).quantize(MONEY),
+            total_proceeds=sum((g.proceeds for g in items), ZERO).quantize(MONEY),
+            total_cost=sum((g.cost for g in items), ZERO).quantize(MONEY),
+            unmatched_units=sum((g.units for g in items if g.unmatched), ZERO).quantize(UNITS),
+            gains=items,
+        )
+        for year, items in sorted(by_year.items())
+    }
+
+
+class CapitalGainsService:
+    """Computes realized capital gains per financial year with FIFO lot matching.
+
+    A user's whole history is matched in one pass and the per-year results are
+    kept in a bounded LRU cache, keyed by a fingerprint of the user's transactions
+    so that new or edited transactions are picked up on the next request.
+    """
+
+    def __init__(self, long_term_days: int, cache_size: int = 1024):
+        self.long_term_days = long_term_days
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[tuple, Dict[str, CapitalGainsSummary]]]" = OrderedDict()
+
+    @staticmethod
+    def _scope(stmt, user_id: str):
+        return (
+            stmt.where(ParsedTransaction.user_id == user_id)
+            .where(ParsedTransaction.is_confirmed.is_(True))
+            .where(ParsedTransaction.is_duplicate.is_(False))
+            .where(ParsedTransaction.security_symbol.is_not(None))
+        )
+
+    async def _fingerprint(self, session: AsyncSession, user_id: str) -> tuple:
+        result = await session.execute(self._scope(
+            select(func.count(), func.max(ParsedTransaction.updated_at)),
+            user_id,
+        ))
+        return tuple(result.one())
+
+    async def _compute(self, session: AsyncSession, user_id: str) -> Dict[str, CapitalGainsSummary]:
+        stmt = self._scope(
+            select(
+                ParsedTransaction.transaction_type,
+                ParsedTransaction.transaction_date,
+                ParsedTransaction.units,
+                ParsedTransaction.amount,
+                ParsedTransaction.security_symbol,
+                ParsedTransaction.security_name,
+                Statement.folio_number,
+            ).join(Statement, Statement.id == ParsedTransaction.statement_id),
+            user_id,
+        )
+        rows = (await session.execute(stmt)).all()
+        gains = match_lots(rows, self.long_term_days)
+        logger.info("capital_gains_computed", user_id=user_id, transactions=len(rows), realized_lots=len(gains))
+        return summarise_by_year(gains)
+
+    async def get_summaries(self, session: AsyncSession, user_id: str) -> Dict[str, CapitalGainsSummary]:
+        """Per financial year summaries of a user's realized gains"""
+        fingerprint = await self._fingerprint(session, user_id)
+        cached = self._cache.get(user_id)
+        if cached is not None and cached[0] == fingerprint:
+            self._cache.move_to_end(user_id)
+            return cached[1]
+
+        summaries = await self._compute(session, user_id)
+        self._cache[user_id] = (fingerprint, summaries)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return summaries
+
+
+capital_gains_service = CapitalGainsService(settings.capital_gains_long_term_days)
+
+
+def get_capital_gains_service() -> CapitalGainsService:
+    return capital_gains_service
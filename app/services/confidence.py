@@ -0,0 +1,202 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.enums import TransactionType
+from app.models.statement import ParsedTransaction, Statement
+from app.services.holdings import UNIT_SIGNS
+from app.services.statement import StatementService, get_statement_service
+
+settings = get_settings()
+logger = get_logger("services.confidence")
+
+TRANSACTION_TYPES = list(TransactionType)
+# Types that move units and therefore must carry them
+UNIT_TYPES = {
+    TransactionType.PURCHASE, TransactionType.SIP, TransactionType.SALE, TransactionType.REDEMPTION,
+    TransactionType.SWP, TransactionType.SWITCH, TransactionType.STP, TransactionType.BONUS,
+    TransactionType.SPLIT,
+}
+# Types priced at NAV, where units x NAV must reproduce the amount
+PRICED_TYPES = UNIT_TYPES - {TransactionType.BONUS, TransactionType.SPLIT}
+# Corporate actions carry no cash amount
+AMOUNT_TYPES = set(TransactionType) - {TransactionType.BONUS, TransactionType.SPLIT}
+
+# Penalties subtracted from a perfect score of 1.0
+MISSING_FIELD_PENALTY = 0.5
+AMOUNT_MISMATCH_PENALTY = 0.4
+UNVERIFIABLE_AMOUNT_PENALTY = 0.05
+OUT_OF_PERIOD_PENALTY = 0.4
+NEGATIVE_BALANCE_PENALTY = 0.3
+
+# Stamp duty and rounding leave units x NAV slightly off the amount
+AMOUNT_TOLERANCE = 0.01
+PERIOD_GRACE_DAYS = 7
+EARLIEST_TRANSACTION = "1990-01-01"
+
+SCORING_COLUMNS = (
+    ParsedTransaction.id,
+    ParsedTransaction.transaction_type,
+    ParsedTransaction.transaction_date,
+    ParsedTransaction.security_name,
+    ParsedTransaction.security_symbol,
+    ParsedTransaction.units,
+    ParsedTransaction.nav,
+    ParsedTransaction.price_per_unit,
+    ParsedTransaction.amount,
+    ParsedTransaction.is_duplicate,
+)
+
+
+def _lookup(types: Dict[TransactionType, float], default: float = 0.0):
+    import numpy as np
+
+    return np.array([types.get(t, default) for t in TRANSACTION_TYPES])
+
+
+def _floats(values: Sequence[Optional[Decimal]]):
+    import numpy as np
+
+    return np.array([float(v) if v is not None else np.nan for v in values])
+
+
+def score_transactions(rows: Sequence, period_end: datetime):
+    """Confidence score in [0, 1] for every parsed row of one statement.
+
+    All checks are array expressions over the whole batch:
+    - required units / amount are present for the transaction type
+    - units x NAV (or price per unit) matches the amount
+    - the date lies between 1990 and the end of the statement period
+    - the running unit balance of each scheme never goes negative
+    """
+    import numpy as np
+
+    if not rows:
+        return np.zeros(0)
+
+    type_index = np.array([TRANSACTION_TYPES.index(row.transaction_type) for row in rows])
+    units = _floats([row.units for row in rows])
+    amount = np.abs(_floats([row.amount for row in rows]))
+    nav = _floats([row.nav for row in rows])
+    nav = np.where(np.isnan(nav), _floats([row.price_per_unit for row in rows]), nav)
+    dates = np.array([row.transaction_date for row in rows], dtype="datetime64[D]")
+    duplicate = np.array([row.is_duplicate for row in rows], dtype=bool)
+
+    needs_units = _lookup({t: 1 for t in UNIT_TYPES})[type_index].astype(bool)
+    needs_amount = _lookup({t: 1 for t in AMOUNT_TYPES})[type_index].astype(bool)
+    priced = _lookup({t: 1 for t in PRICED_TYPES})[type_index].astype(bool)
+
+    penalty = np.zeros(len(rows))
+
+    # Required fields
+    missing = (needs_units & np.isnan(units)) | (needs_amount & np.isnan(amount))
+    penalty += MISSING_FIELD_PENALTY * missing
+
+    # units x NAV ~ amount, scaled from no penalty at the tolerance to full at 10x it
+    checkable = priced & ~np.isnan(units) & ~np.isnan(nav) & ~np.isnan(amount)
+    with np.errstate(invalid="ignore"):
+        relative_error = np.abs(np.abs(units) * nav - amount) / np.maximum(amount, 1.0)
+    mismatch = np.clip((relative_error - AMOUNT_TOLERANCE) / (9 * AMOUNT_TOLERANCE), 0.0, 1.0)
+    penalty += AMOUNT_MISMATCH_PENALTY * np.where(checkable, mismatch, 0.0)
+    penalty += UNVERIFIABLE_AMOUNT_PENALTY * (priced & ~checkable & ~missing)
+
+    # Date within the statement period
+    latest = np.datetime64(period_end.date() + timedelta(days=PERIOD_GRACE_DAYS), "D")
+    out_of_period = (dates > latest) | (dates < np.datetime64(EARLIEST_TRANSACTION, "D"))
+    penalty += OUT_OF_PERIOD_PENALTY * out_of_period
+
+    # Running unit balance per scheme, in date order
+    signs = _lookup(UNIT_SIGNS, default=1.0)[type_index]
+    signed_units = np.where(needs_units & ~duplicate, np.nan_to_num(units) * signs, 0.0)
+    keys = np.unique(
+        [row.security_symbol or row.security_name or "" for row in rows], return_inverse=True
+    )[1]
+    order = np.lexsort((dates, keys))
+    sorted_keys = keys[order]
+    running = np.cumsum(signed_units[order])
+    group_start = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    opening = np.r_[0.0, running][group_start]
+    group_sizes = np.diff(np.r_[group_start, len(rows)])
+    balance = running - np.repeat(opening, group_sizes)
+    negative = np.zeros(len(rows), dtype=bool)
+    negative[order] = balance < -1e-3
+    penalty += NEGATIVE_BALANCE_PENALTY * negative
+
+    return np.clip(1.0 - penalty, 0.0, 1.0)
+
+
+class ConfidenceService:
+    """Scores parsed statements and routes them to auto-confirmation or manual review"""
+
+    def __init__(self, statement_service: StatementService, auto_confirm_threshold: float, review_threshold: float):
+        self.statement_service = statement_service
+        self.auto_confirm_threshold = auto_confirm_threshold
+        self.review_threshold = review_threshold
+
+    async def score_statement(self, session: AsyncSession, statement: Statement) -> Dict[str, object]:
+        """Score one statement's transactions, store the scores and auto-confirm if confident"""
+        import numpy as np
+
+        rows = (await session.execute(
+            select(*SCORING_COLUMNS).where(ParsedTransaction.statement_id == statement.id)
+        )).all()
+        scores = np.round(score_transactions(rows, statement.statement_date or statement.created_at), 4)
+
+        if rows:
+            table = ParsedTransaction.__table__
+            await session.execute(
+                update(table)
+                .where(table.c.id == bindparam("row_id"))
+                .values(confidence_score=bindparam("score")),
+                [{"row_id": row.id, "score": Decimal(str(score))} for row, score in zip(rows, scores)],
+            )
+        confidence = round(float(scores.mean()), 4) if rows else 0.0
+        await session.execute(
+            update(Statement)
+            .where(Statement.id == statement.id)
+            .values(parsing_confidence=Decimal(str(confidence)), updated_at=datetime.utcnow())
+        )
+
+        auto_confirm = (
+            bool(rows)
+            and confidence >= self.auto_confirm_threshold
+            and float(scores.min()) >= self.review_threshold
+        )
+        if auto_confirm:
+            await self.statement_service.confirm(session, statement.id)
+
+        outcome = {
+            "statement_id": str(statement.id),
+            "transactions": len(rows),
+            "confidence": confidence,
+            "low_confidence_transactions": int((scores < self.review_threshold).sum()),
+            "auto_confirmed": auto_confirm,
+        }
+        logger.info("statement_scored", **outcome)
+        return outcome
+
+    async def score_pending(self, session: AsyncSession, limit: Optional[int] = None) -> List[Dict[str, object]]:
+        """Score every unconfirmed statement that has not been scored yet"""
+        stmt = (
+            select(Statement)
+            .where(Statement.parsing_confidence.is_(None))
+            .where(Statement.confirmed_at.is_(None))
+            .order_by(Statement.created_at)
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        statements = list((await session.execute(stmt)).scalars())
+        return [await self.score_statement(session, statement) for statement in statements]
+
+
+def get_confidence_service() -> ConfidenceService:
+    return ConfidenceService(
+        get_statement_service(),
+        settings.confidence_auto_confirm_threshold,
+        settings.confidence_review_threshold,
+    )
@@ -0,0 +1,90 @@
+import csv
+import io
+import zlib
+from enum import Enum
+from typing import Any, AsyncIterator, Sequence
+
+from sqlalchemy import Row
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.responses import orjson_dumps
+from app.db.session import streaming_session
+from app.models.enums import ExportFormat
+from app.services.transaction import EXPORT_COLUMNS, TransactionService
+
+settings = get_settings()
+logger = get_logger("services.export")
+
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def encode_ndjson(rows: Sequence[Row]) -> bytes:
+    return b"".join(orjson_dumps(row._asdict()) + b"\n" for row in rows)
+
+
+def encode_csv(rows: Sequence[Row], include_header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if include_header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+class TransactionExportService:
+    """Streams a user's transaction history as NDJSON or CSV without buffering it"""
+
+    def __init__(self, transaction_service: TransactionService):
+        self.transaction_service = transaction_service
+
+    async def _encoded_batches(self, user_id: str, export_format: ExportFormat) -> AsyncIterator[bytes]:
+        if export_format == ExportFormat.CSV:
+            yield encode_csv([], include_header=True)
+
+        row_count = 0
+        async with streaming_session() as session:
+            async for batch in self.transaction_service.stream_transaction_batches(
+                session, user_id, settings.export_batch_size
+            ):
+                row_count += len(batch)
+                if export_format == ExportFormat.CSV:
+                    yield encode_csv(batch)
+                else:
+                    yield encode_ndjson(batch)
+
+        logger.info("transaction_export_completed", user_id=user_id, format=export_format.value, rows=row_count)
+
+    async def stream_export(
+        self,
+        user_id: str,
+        export_format: ExportFormat,
+        compress: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """Encoded export body, gzip-compressed batch by batch when requested"""
+        if not compress:
+            async for chunk in self._encoded_batches(user_id, export_format):
+                yield chunk
+            return
+
+        compressor = zlib.compressobj(level=6, wbits=zlib.MAX_WBITS | 16)
+        async for chunk in self._encoded_batches(user_id, export_format):
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+
+def get_transaction_export_service() -> TransactionExportService:
+    return TransactionExportService(TransactionService())
@@ -0,0 +1,401 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Iterator, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.exceptions import InternalServerError
+from app.core.logging import get_logger
+from app.core.responses import content_disposition
+from app.models.enums import FileCodec
+
+settings = get_settings()
+logger = get_logger("services.file_store")
+
+CHUNK_SIZE = 1024 * 1024
+# Formats that are compressed already; zstd would only burn CPU on them
+COMPRESSED_EXTENSIONS = {".xlsx", ".zip", ".gz", ".zst", ".png", ".jpg", ".jpeg"}
+CODEC_SUFFIXES = {FileCodec.IDENTITY: "", FileCodec.ZSTD: ".zst"}
+
+
+def shard_path(key: str, codec: FileCodec = FileCodec.IDENTITY) -> str:
+    """Relative location of an object: two levels of 256 directories keep each one small"""
+    return f"{key[:2]}/{key[2:4]}/{key}{CODEC_SUFFIXES[codec]}"
+
+
+def file_lock(key: str) -> str:
+    """Advisory lock name serialising reference changes and deletion of an object"""
+    return f"file_store:{key}"
+
+
+def hash_file(path: str) -> Tuple[str, int]:
+    """SHA-256 hex digest and size of a file"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def compress_file(source: str, target: str, level: int, min_savings: float, file_name: str) -> bool:
+    """zstd-compress a file into `target` when that saves at least `min_savings` of its size.
+
+    The first chunk is compressed on its own first, so incompressible files such as
+    most PDFs are rejected after reading 1 MiB instead of the whole file.
+    """
+    if level <= 0 or Path(file_name).suffix.lower() in COMPRESSED_EXTENSIONS:
+        return False
+    import zstandard
+
+    compressor = zstandard.ZstdCompressor(level=level)
+    with open(source, "rb") as f:
+        sample = f.read(CHUNK_SIZE)
+    if not sample or len(compressor.compress(sample)) > len(sample) * (1 - min_savings):
+        return False
+
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        compressor.copy_stream(src, dst, read_size=CHUNK_SIZE, write_size=CHUNK_SIZE)
+    return os.path.getsize(target) <= os.path.getsize(source) * (1 - min_savings)
+
+
+def decompress_stream(source: BinaryIO) -> Iterator[bytes]:
+    import zstandard
+
+    yield from zstandard.ZstdDecompressor().read_to_iter(source, read_size=CHUNK_SIZE, write_size=CHUNK_SIZE)
+
+
+@dataclass
+class StoredObject:
+    key: str
+    size: int
+    codec: FileCodec
+    # What StatementFile.local_file_path records for the object
+    location: str
+    # True when identical content was already stored and nothing was written
+    deduplicated: bool
+
+
+class FileStore(ABC):
+    """Content-addressed storage for statement files, keyed by SHA-256 of their content.
+
+    Identical uploads are stored once; callers keep one StatementFile row per upload,
+    so the number of rows with a given file_hash is the object's reference count and
+    an object may only be deleted once no row refers to it. Files that compress well
+    are stored zstd-encoded and decoded while streaming them back.
+    """
+
+    def __init__(self, compression_level: int, min_compression_savings: float):
+        self.compression_level = compression_level
+        self.min_compression_savings = min_compression_savings
+
+    @abstractmethod
+    def location(self, key: str, codec: FileCodec = FileCodec.IDENTITY) -> str:
+        """What StatementFile.local_file_path records for an object"""
+
+    @abstractmethod
+    def owns(self, location: str) -> bool:
+        """Whether a recorded location is an object of this store"""
+
+    def local_path(self, key: str, codec: FileCodec = FileCodec.IDENTITY) -> Optional[str]:
+        """Filesystem path of an object that can be served directly, if the backend has one"""
+        return None
+
+    @abstractmethod
+    def _put_file(self, path: str, file_name: str) -> StoredObject:
+        """Store a copy of a file, unless identical content is stored already"""
+
+    @abstractmethod
+    def _iter_chunks(self, key: str, codec: FileCodec) -> Iterator[bytes]:
+        """Original content of an object in chunks"""
+
+    @abstractmethod
+    def _delete(self, key: str) -> Optional[int]:
+        """Delete an object in every codec; bytes freed, or None if it did not exist"""
+
+    @abstractmethod
+    def _codec(self, key: str) -> Optional[FileCodec]:
+        """Codec of the stored object, or None if it is not stored"""
+
+    async def put_file(self, path: str, file_name: Optional[str] = None) -> StoredObject:
+        """Store a copy of a file; the caller keeps ownership of `path`.
+
+        `file_name` (the original upload name) decides whether compression is attempted.
+        """
+        stored = await asyncio.to_thread(self._put_file, path, file_name or path)
+        logger.info(
+            "file_stored",
+            key=stored.key,
+            size=stored.size,
+            codec=stored.codec.value,
+            deduplicated=stored.deduplicated,
+        )
+        return stored
+
+    async def put_bytes(self, data: bytes, file_name: str) -> StoredObject:
+        fd, temp = tempfile.mkstemp(suffix=Path(file_name).suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            return await self.put_file(temp, file_name)
+        finally:
+            os.unlink(temp)
+
+    async def open(self, key: str, codec: FileCodec = FileCodec.IDENTITY) -> AsyncIterator[bytes]:
+        """Stream an object's original content in chunks, decompressing on the fly"""
+        chunks = self._iter_chunks(key, codec)
+        try:
+            while chunk := await asyncio.to_thread(next, chunks, b""):
+                yield chunk
+        finally:
+            chunks.close()
+
+    @asynccontextmanager
+    async def local_copy(self, key: str, codec: FileCodec = FileCodec.IDENTITY) -> AsyncIterator[str]:
+        """Path to the original content on local disk, e.g. for tools that need a real file.
+
+        Uncompressed local objects are used in place; anything else is decoded or
+        downloaded into a temporary file that is removed on exit.
+        """
+        path = self.local_path(key, codec)
+        if codec == FileCodec.IDENTITY and path is not None:
+            yield path
+            return
+        fd, temp = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in self.open(key, codec):
+                    await asyncio.to_thread(f.write, chunk)
+            yield temp
+        finally:
+            os.unlink(temp)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._codec, key) is not None
+
+    async def delete(self, key: str) -> Optional[int]:
+        """Delete an object and return the bytes freed, or None if it did not exist"""
+        return await asyncio.to_thread(self._delete, key)
+
+    async def download_url(self, key: str, file_name: str) -> Optional[str]:
+        """Short-lived URL the client can fetch an uncompressed object from directly, if supported"""
+        return None
+
+
+class LocalFileStore(FileStore):
+    """Objects under `<root>/objects/ab/cd/<sha256>[.zst]`, written via a temp file and hardlink.
+
+    Content is always copied into the store's own temp directory first, so a stored
+    object never shares an inode with a file the caller may still modify. Publishing
+    with os.link never overwrites, so two concurrent uploads of the same content both
+    succeed and share one object.
+    """
+
+    def __init__(self, root: str, compression_level: int = 0, min_compression_savings: float = 0.1):
+        super().__init__(compression_level, min_compression_savings)
+        self.root = Path(root).resolve()
+        self.objects = self.root / "objects"
+        self.tmp = self.root / "tmp"
+
+    def location(self, key: str, codec: FileCodec = FileCodec.IDENTITY) -> str:
+        return str(self.objects / shard_path(key, codec))
+
+    def owns(self, location: str) -> bool:
+        return location.startswith(f"{self.objects}{os.sep}")
+
+    def local_path(self, key: str, codec: FileCodec = FileCodec.IDENTITY) -> Optional[str]:
+        return self.location(key, codec)
+
+    def _codec(self, key: str) -> Optional[FileCodec]:
+        for codec in FileCodec:
+            if os.path.exists(self.location(key, codec)):
+                return codec
+        return None
+
+    def _publish(self, source: Path, key: str, codec: FileCodec) -> bool:
+        """Hardlink a complete file into place; False when the object already exists"""
+        target = Path(self.location(key, codec))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(source, target)
+        except FileExistsError:
+            return False
+        return True
+
+    def _temp_path(self) -> Path:
+        self.tmp.mkdir(parents=True, exist_ok=True)
+        return self.tmp / uuid.uuid4().hex
+
+    def _put_file(self, path: str, file_name: str) -> StoredObject:
+        key, size = hash_file(path)
+        existing = self._codec(key)
+        if existing is not None:
+            return StoredObject(key, size, existing, self.location(key, existing), deduplicated=True)
+
+        temp = self._temp_path()
+        try:
+            if compress_file(path, str(temp), self.compression_level, self.min_compression_savings, file_name):
+                codec = FileCodec.ZSTD
+            else:
+                codec = FileCodec.IDENTITY
+                shutil.copyfile(path, temp)
+            created = self._publish(temp, key, codec)
+        finally:
+            temp.unlink(missing_ok=True)
+        return StoredObject(key, size, codec, self.location(key, codec), deduplicated=not created)
+
+    def _iter_chunks(self, key: str, codec: FileCodec) -> Iterator[bytes]:
+        with open(self.location(key, codec), "rb") as f:
+            if codec == FileCodec.ZSTD:
+                yield from decompress_stream(f)
+            else:
+                while chunk := f.read(CHUNK_SIZE):
+                    yield chunk
+
+    def _delete(self, key: str) -> Optional[int]:
+        freed = None
+        for codec in FileCodec:
+            path = self.location(key, codec)
+            try:
+                size = os.stat(path).st_size
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+            freed = (freed or 0) + size
+        return freed
+
+
+class S3FileStore(FileStore):
+    """Objects under `s3://<bucket>/<prefix>/ab/cd/<sha256>[.zst]` in S3 or an S3-compatible store.
+
+    Point `endpoint_url` at MinIO (or similar) to run against a local stand-in.
+    Uncompressed downloads are served through presigned URLs so the API never proxies
+    the bytes.
+    """
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None,
+                 region: Optional[str] = None, url_expiry_seconds: int = 300,
+                 compression_level: int = 0, min_compression_savings: float = 0.1):
+        super().__init__(compression_level, min_compression_savings)
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.url_expiry_seconds = url_expiry_seconds
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            # boto3 takes ~hundreds of ms to import; only load it when S3 storage is used
+            import boto3
+
+            self._client = boto3.client("s3", endpoint_url=self.endpoint_url, region_name=self.region)
+        return self._client
+
+    def object_key(self, key: str, codec: FileCodec = FileCodec.IDENTITY) -> str:
+        relative = shard_path(key, codec)
+        return f"{self.prefix}/{relative}" if self.prefix else relative
+
+    def location(self, key: str, codec: FileCodec = FileCodec.IDENTITY) -> str:
+        return f"s3://{self.bucket}/{self.object_key(key, codec)}"
+
+    def owns(self, location: str) -> bool:
+        return location.startswith(f"s3://{self.bucket}/")
+
+    def _size(self, object_key: str) -> Optional[int]:
+        from botocore.exceptions import ClientError
+
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=object_key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return head["ContentLength"]
+
+    def _codec(self, key: str) -> Optional[FileCodec]:
+        for codec in FileCodec:
+            if self._size(self.object_key(key, codec)) is not None:
+                return codec
+        return None
+
+    def _put_file(self, path: str, file_name: str) -> StoredObject:
+        key, size = hash_file(path)
+        existing = self._codec(key)
+        if existing is not None:
+            return StoredObject(key, size, existing, self.location(key, existing), deduplicated=True)
+
+        fd, temp = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            if compress_file(path, temp, self.compression_level, self.min_compression_savings, file_name):
+                codec, source = FileCodec.ZSTD, temp
+            else:
+                codec, source = FileCodec.IDENTITY, path
+            self.client.upload_file(source, self.bucket, self.object_key(key, codec))
+        finally:
+            os.unlink(temp)
+        return StoredObject(key, size, codec, self.location(key, codec), deduplicated=False)
+
+    def _iter_chunks(self, key: str, codec: FileCodec) -> Iterator[bytes]:
+        body = self.client.get_object(Bucket=self.bucket, Key=self.object_key(key, codec))["Body"]
+        try:
+            if codec == FileCodec.ZSTD:
+                yield from decompress_stream(body)
+            else:
+                yield from body.iter_chunks(CHUNK_SIZE)
+        finally:
+            body.close()
+
+    def _delete(self, key: str) -> Optional[int]:
+        freed = None
+        for codec in FileCodec:
+            object_key = self.object_key(key, codec)
+            size = self._size(object_key)
+            if size is not None:
+                self.client.delete_object(Bucket=self.bucket, Key=object_key)
+                freed = (freed or 0) + size
+        return freed
+
+    async def download_url(self, key: str, file_name: str) -> Optional[str]:
+        return await asyncio.to_thread(
+            self.client.generate_presigned_url,
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self.object_key(key),
+                "ResponseContentDisposition": content_disposition(file_name),
+            },
+            ExpiresIn=self.url_expiry_seconds,
+        )
+
+
+@lru_cache
+def get_file_store() -> FileStore:
+    if settings.file_store_backend == "s3":
+        if not settings.file_store_s3_bucket:
+            raise InternalServerError("S3 file store bucket is not configured")
+        return S3FileStore(
+            bucket=settings.file_store_s3_bucket,
+            prefix=settings.file_store_s3_prefix,
+            endpoint_url=settings.file_store_s3_endpoint_url,
+            region=settings.file_store_s3_region,
+            url_expiry_seconds=settings.file_store_url_expiry_seconds,
+            compression_level=settings.file_store_compression_level,
+            min_compression_savings=settings.file_store_min_compression_savings,
+        )
+    return LocalFileStore(
+        settings.file_store_dir,
+        compression_level=settings.file_store_compression_level,
+        min_compression_savings=settings.file_store_min_compression_savings,
+    )
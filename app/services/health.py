@@ -0,0 +1,104 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.auth import HealthCheckResult
+
+settings = get_settings()
+logger = get_logger("services.health")
+
+# A probe returns normally when its dependency is healthy and raises otherwise
+HealthProbe = Callable[[], Awaitable[None]]
+
+
+class HealthMonitor:
+    """Runs registered health probes in the background and caches their latest results"""
+
+    def __init__(self, interval_seconds: float, timeout_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self._probes: Dict[str, HealthProbe] = {}
+        self._results: Dict[str, HealthCheckResult] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register_probe(self, name: str, probe: HealthProbe) -> None:
+        self._probes[name] = probe
+
+    async def run_probes(self) -> None:
+        await asyncio.gather(
+            *(self._run_probe(name, probe) for name, probe in self._probes.items())
+        )
+
+    async def _run_probe(self, name: str, probe: HealthProbe) -> None:
+        checked_at = datetime.utcnow()
+        start = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(probe(), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            error = f"Probe timed out after {self.timeout_seconds}s"
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+
+        result = HealthCheckResult(
+            healthy=error is None,
+            latency_ms=round((time.perf_counter() - start) * 1000, 2),
+            checked_at=checked_at,
+            error=error,
+        )
+
+        previous = self._results.get(name)
+        if previous is None or previous.healthy != result.healthy:
+            log = logger.info if result.healthy else logger.warning
+            log("health_probe_state_changed", probe=name, healthy=result.healthy, error=error)
+
+        self._results[name] = result
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.run_probes()
+
+    async def start(self) -> None:
+        """Run every probe once so the cache is warm, then keep probing in the background"""
+        if self._task is not None:
+            return
+        await self.run_probes()
+        self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def get_results(self) -> Dict[str, HealthCheckResult]:
+        """Cached results, with probes that stopped reporting marked unhealthy"""
+        stale_before = datetime.utcnow() - timedelta(
+            seconds=self.interval_seconds * 3 + self.timeout_seconds
+        )
+        results = {}
+        for name, result in self._results.items():
+            if result.checked_at < stale_before:
+                result = result.model_copy(
+                    update={"healthy": False, "error": "Probe result is stale"}
+                )
+            results[name] = result
+        return results
+
+
+health_monitor = HealthMonitor(
+    interval_seconds=settings.health_probe_interval_seconds,
+    timeout_seconds=settings.health_probe_timeout_seconds,
+)
+
+
+def get_health_monitor() -> HealthMonitor:
+    return health_monitor
@@ -0,0 +1,76 @@
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.enums import TransactionType
+from app.models.statement import ParsedTransaction
+
+# Direction of each transaction type's units/amount relative to the holding.
+# SWITCH and STP legs carry their direction in the sign of the parsed units.
+UNIT_SIGNS = {
+    TransactionType.PURCHASE: 1,
+    TransactionType.SIP: 1,
+    TransactionType.BONUS: 1,
+    TransactionType.SPLIT: 1,
+    TransactionType.SALE: -1,
+    TransactionType.REDEMPTION: -1,
+    TransactionType.SWP: -1,
+}
+SIGNED_TRANSACTION_TYPES = (TransactionType.SWITCH, TransactionType.STP)
+
+
+def signed(column):
+    """SQL expression applying the holding direction of each transaction to `column`"""
+    return case(
+        *[
+            (ParsedTransaction.transaction_type == transaction_type, column * sign)
+            for transaction_type, sign in UNIT_SIGNS.items()
+        ],
+        (ParsedTransaction.transaction_type.in_(SIGNED_TRANSACTION_TYPES), column),
+        else_=0,
+    )
+
+
+def end_of_day(as_of: date) -> datetime:
+    """Exclusive upper bound for transactions dated on or before `as_of`"""
+    return datetime.combine(as_of + timedelta(days=1), time.min)
+
+
+def select_holdings(user_id: Optional[str] = None, as_of: Optional[date] = None) -> Select:
+    """Net units and invested amount per user and security, aggregated in the database"""
+    stmt = (
+        select(
+            ParsedTransaction.user_id,
+            ParsedTransaction.security_symbol,
+            func.max(ParsedTransaction.security_name).label("security_name"),
+            func.sum(signed(func.coalesce(ParsedTransaction.units, 0))).label("units"),
+            func.sum(signed(func.coalesce(ParsedTransaction.amount, 0))).label("invested_amount"),
+            func.max(ParsedTransaction.transaction_date).label("last_transaction_date"),
+        )
+        .where(ParsedTransaction.is_confirmed.is_(True))
+        .where(ParsedTransaction.is_duplicate.is_(False))
+        .where(ParsedTransaction.security_symbol.is_not(None))
+        .group_by(ParsedTransaction.user_id, ParsedTransaction.security_symbol)
+        .order_by(ParsedTransaction.user_id, ParsedTransaction.security_symbol)
+    )
+    if user_id is not None:
+        stmt = stmt.where(ParsedTransaction.user_id == user_id)
+    if as_of is not None:
+        stmt = stmt.where(ParsedTransaction.transaction_date < end_of_day(as_of))
+    return stmt
+
+
+class HoldingsService:
+    """Service for deriving current holdings from parsed transactions"""
+
+    async def get_holdings(self, session: AsyncSession, user_id: str) -> List[Row]:
+        """Get a user's holdings with non-zero units"""
+        result = await session.execute(select_holdings(user_id))
+        return [row for row in result.all() if row.units]
+
+
+def get_holdings_service() -> HoldingsService:
+    return HoldingsService()
@@ -0,0 +1,164 @@
+import shutil
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.price import NavIngestResult
+from app.services.price_store import PriceStore, get_price_store
+
+settings = get_settings()
+logger = get_logger("services.nav_ingest")
+
+NAV_FILE_PATTERNS = ("*.txt", "*.csv")
+PROCESSED_DIR = "processed"
+FAILED_DIR = "failed"
+
+# Column layout of the daily AMFI NAVAll.txt file; history downloads announce
+# their own layout in a header line, which takes precedence
+DEFAULT_COLUMNS = {
+    "scheme code": 0,
+    "isin div payout/isin growth": 1,
+    "isin div reinvestment": 2,
+    "scheme name": 3,
+    "net asset value": 4,
+    "date": 5,
+}
+MISSING_VALUES = {"", "N.A.", "NA", "-"}
+ISIN_COLUMNS = ("isin div payout/isin growth", "isin div reinvestment")
+
+
+@dataclass
+class SchemeInfo:
+    scheme_code: str
+    name: str
+    isins: List[str]
+    fund_house: Optional[str] = None
+    category: Optional[str] = None
+
+
+@dataclass
+class ParsedNavFile:
+    symbols: List[str] = field(default_factory=list)
+    dates: List[date] = field(default_factory=list)
+    navs: List[float] = field(default_factory=list)
+    schemes: Dict[str, SchemeInfo] = field(default_factory=dict)
+    skipped_lines: int = 0
+
+    @property
+    def aliases(self) -> Dict[str, List[str]]:
+        return {code: scheme.isins for code, scheme in self.schemes.items()}
+
+
+def _normalize_header(name: str) -> str:
+    return "/".join(part.strip() for part in name.strip().lower().split("/"))
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value.strip(), "%d-%b-%Y").date()
+
+
+def parse_amfi_lines(lines: Iterable[str]) -> ParsedNavFile:
+    """Parse AMFI NAV text (daily or history) into parallel symbol/date/NAV lists.
+
+    Scheme codes are the symbols; each scheme's name, ISINs and the fund house and
+    category headings it appears under are collected for the security master.
+    Rows without a published NAV are counted as skipped.
+    """
+    parsed = ParsedNavFile()
+    columns = DEFAULT_COLUMNS
+    fund_house: Optional[str] = None
+    category: Optional[str] = None
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if ";" not in line:
+            # Headings: "Open Ended Schemes(Equity Scheme - Large Cap Fund)" or a fund house
+            if "Schemes(" in line or "Schemes (" in line:
+                category = line
+            else:
+                fund_house = line
+            continue
+        parts = [part.strip() for part in line.split(";")]
+        if parts[0].lower() == "scheme code":
+            columns = {_normalize_header(name): i for i, name in enumerate(parts)}
+            continue
+
+        try:
+            code = parts[columns["scheme code"]]
+            if code and code not in parsed.schemes and "scheme name" in columns:
+                isins = [parts[columns[name]] for name in ISIN_COLUMNS if name in columns]
+                parsed.schemes[code] = SchemeInfo(
+                    scheme_code=code,
+                    name=parts[columns["scheme name"]],
+                    isins=[isin for isin in isins if isin not in MISSING_VALUES],
+                    fund_house=fund_house,
+                    category=category,
+                )
+            value = parts[columns["net asset value"]]
+            if not code or value in MISSING_VALUES:
+                parsed.skipped_lines += 1
+                continue
+            nav = float(value)
+            nav_date = _parse_date(parts[columns["date"]])
+        except (IndexError, KeyError, ValueError):
+            parsed.skipped_lines += 1
+            continue
+
+        parsed.symbols.append(code)
+        parsed.dates.append(nav_date)
+        parsed.navs.append(nav)
+
+    return parsed
+
+
+class NavIngestService:
+    """Loads AMFI NAV files from the drop directory into the price store"""
+
+    def __init__(self, store: PriceStore, drop_dir: Path):
+        self.store = store
+        self.drop_dir = drop_dir
+        # Schemes seen in ingested files, for refreshing the security master
+        self.schemes: Dict[str, SchemeInfo] = {}
+
+    def ingest_file(self, path: Path) -> Tuple[int, int]:
+        """Ingest one NAV file and return (records stored, lines skipped)"""
+        with open(path, encoding="utf-8", errors="replace") as f:
+            parsed = parse_amfi_lines(f)
+        records = self.store.write(parsed.symbols, parsed.dates, parsed.navs, parsed.aliases)
+        self.schemes.update(parsed.schemes)
+        logger.info("nav_file_ingested", file=path.name, records=records, skipped_lines=parsed.skipped_lines)
+        return records, parsed.skipped_lines
+
+    def pending_files(self) -> List[Path]:
+        files = {path for pattern in NAV_FILE_PATTERNS for path in self.drop_dir.glob(pattern)}
+        return sorted(files, key=lambda path: (path.stat().st_mtime, path.name))
+
+    def ingest_pending(self) -> NavIngestResult:
+        """Ingest every file in the drop directory, moving each to processed/ or failed/"""
+        result = NavIngestResult(files=0, records=0, skipped_lines=0)
+        for path in self.pending_files():
+            try:
+                records, skipped = self.ingest_file(path)
+            except Exception as e:
+                logger.error("nav_file_ingest_failed", file=path.name, error=str(e))
+                self._move(path, FAILED_DIR)
+                continue
+            self._move(path, PROCESSED_DIR)
+            result.files += 1
+            result.records += records
+            result.skipped_lines += skipped
+        return result
+
+    def _move(self, path: Path, folder: str) -> None:
+        target = self.drop_dir / folder
+        target.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(path), target / path.name)
+
+
+def get_nav_ingest_service(store: Optional[PriceStore] = None) -> NavIngestService:
+    return NavIngestService(store or get_price_store(), Path(settings.nav_drop_dir))
@@ -0,0 +1,220 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+from app.core.config import get_settings
+from app.core.exceptions import ValidationError
+from app.core.logging import get_logger
+from app.models.enums import FileCodec
+from app.services.file_store import FileStore, get_file_store, shard_path
+
+settings = get_settings()
+logger = get_logger("services.pdf_extract")
+
+# Called with (pages done, page count) as extraction advances
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+# Bump when extraction output changes (library upgrade, layout options) to start a fresh cache
+EXTRACTOR_VERSION = 1
+
+
+class EncryptedPdfError(Exception):
+    """The PDF is encrypted and no (correct) password was given"""
+
+
+def _open_reader(path: str, password: Optional[str]):
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    if reader.is_encrypted and (password is None or not reader.decrypt(password)):
+        raise EncryptedPdfError(path)
+    return reader
+
+
+def count_pages(path: str, password: Optional[str] = None) -> int:
+    return len(_open_reader(path, password).pages)
+
+
+def extract_pages(path: str, start: int, stop: int, password: Optional[str] = None) -> List[str]:
+    """Text of pages [start, stop); runs in worker processes, so it only takes picklable arguments"""
+    reader = _open_reader(path, password)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def page_ranges(pages: List[int], min_shard_size: int, workers: int) -> List[Tuple[int, int]]:
+    """Split sorted page numbers into contiguous [start, stop) shards, about one per worker.
+
+    Every shard re-parses the document structure, so shards are no smaller than
+    `min_shard_size` pages and never span a gap of already cached pages.
+    """
+    if not pages:
+        return []
+    size = max(min_shard_size, math.ceil(len(pages) / max(workers, 1)))
+    ranges: List[Tuple[int, int]] = []
+    start = previous = pages[0]
+    for page in pages[1:]:
+        if page != previous + 1 or page - start >= size:
+            ranges.append((start, previous + 1))
+            start = page
+        previous = page
+    ranges.append((start, previous + 1))
+    return ranges
+
+
+class PageCache:
+    """Extracted page text on disk, keyed by file hash and page number.
+
+    Each file's pages live in one zstd-compressed JSON document, rewritten atomically
+    when pages are added; re-parsing a statement after a parser fix reads its text
+    from here instead of extracting the PDF again.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root) / f"v{EXTRACTOR_VERSION}"
+
+    def _path(self, file_hash: str) -> Path:
+        return self.root / f"{shard_path(file_hash)}.json.zst"
+
+    def load(self, file_hash: str) -> Tuple[Optional[int], Dict[int, str]]:
+        """Page count and cached pages of a file"""
+        import zstandard
+
+        try:
+            data = self._path(file_hash).read_bytes()
+        except FileNotFoundError:
+            return None, {}
+        document = orjson.loads(zstandard.ZstdDecompressor().decompress(data))
+        return document["page_count"], {int(page): text for page, text in document["pages"].items()}
+
+    def store(self, file_hash: str, page_count: int, pages: Dict[int, str]) -> None:
+        import zstandard
+
+        path = self._path(file_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        document = orjson.dumps(
+            {"page_count": page_count, "pages": pages}, option=orjson.OPT_NON_STR_KEYS
+        )
+        temp = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+        temp.write_bytes(zstandard.ZstdCompressor(level=3).compress(document))
+        os.replace(temp, path)
+
+
+class PdfExtractionService:
+    """Extracts PDF text page-parallel across a process pool, with a per-page cache.
+
+    Consolidated account statements run to hundreds of pages and pypdf is pure
+    Python, so pages are split into contiguous ranges that worker processes extract
+    concurrently; results are merged back in page order.
+    """
+
+    def __init__(self, file_store: FileStore, cache: PageCache, workers: int, min_pages_per_shard: int):
+        self.file_store = file_store
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.min_pages_per_shard = min_pages_per_shard
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a process that runs an event loop and DB connections is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def extract(
+        self,
+        path: str,
+        file_hash: str,
+        password: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> List[str]:
+        """Text of every page of a PDF, from the cache where possible"""
+        page_count, pages = await asyncio.to_thread(self.cache.load, file_hash)
+        try:
+            if page_count is None:
+                page_count = await asyncio.to_thread(count_pages, path, password)
+            missing = [page for page in range(page_count) if page not in pages]
+            ranges = page_ranges(missing, self.min_pages_per_shard, self.workers)
+            done = page_count - len(missing)
+            loop = asyncio.get_running_loop()
+
+            async def run_shard(start: int, stop: int) -> List[str]:
+                nonlocal done
+                if len(ranges) > 1:
+                    texts = await loop.run_in_executor(self.executor, extract_pages, path, start, stop, password)
+                else:
+                    # A single shard is not worth shipping to another process
+                    texts = await asyncio.to_thread(extract_pages, path, start, stop, password)
+                done += len(texts)
+                if on_progress is not None:
+                    await on_progress(done, page_count)
+                return texts
+
+            results = await asyncio.gather(*(run_shard(start, stop) for start, stop in ranges))
+        except EncryptedPdfError:
+            raise ValidationError("Statement PDF is password protected")
+
+        for (start, _), texts in zip(ranges, results):
+            pages.update(enumerate(texts, start))
+        if missing:
+            await asyncio.to_thread(self.cache.store, file_hash, page_count, pages)
+        logger.info(
+            "pdf_text_extracted",
+            file_hash=file_hash,
+            pages=page_count,
+            extracted=len(missing),
+            shards=len(ranges),
+        )
+        return [pages[page] for page in range(page_count)]
+
+    async def cached_pages(self, file_hash: str) -> Optional[List[str]]:
+        """Text of every page if the whole file has been extracted before"""
+        page_count, pages = await asyncio.to_thread(self.cache.load, file_hash)
+        if page_count is None or len(pages) < page_count:
+            return None
+        return [pages[page] for page in range(page_count)]
+
+    async def extract_stored(
+        self,
+        file_hash: str,
+        codec: FileCodec = FileCodec.IDENTITY,
+        password: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> List[str]:
+        """Text of every page of a PDF in the file store"""
+        cached = await self.cached_pages(file_hash)
+        if cached is not None:
+            # Fully cached: no need to fetch or decode the file at all
+            if on_progress is not None:
+                await on_progress(len(cached), len(cached))
+            return cached
+        async with self.file_store.local_copy(file_hash, codec) as path:
+            return await self.extract(path, file_hash, password, on_progress)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+# The process budget is split across web workers like parse admission, so a host runs
+# about one extraction process per CPU however many workers gunicorn starts
+pdf_extraction_service = PdfExtractionService(
+    file_store=get_file_store(),
+    cache=PageCache(settings.pdf_page_cache_dir),
+    workers=(settings.pdf_extract_workers or os.cpu_count() or 1) // max(1, settings.web_concurrency),
+    min_pages_per_shard=settings.pdf_min_pages_per_shard,
+)
+
+
+def get_pdf_extraction_service() -> PdfExtractionService:
+    return pdf_extraction_service
@@ -0,0 +1,149 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.exceptions import PasswordRequiredError
+from app.core.logging import get_logger
+from app.db.session import async_session_factory
+from app.models.enums import StatementType
+from app.models.statement import StatementPasswordPattern
+
+logger = get_logger("services.pdf_unlock")
+
+
+@dataclass
+class PasswordHints:
+    """What statement passwords are derived from; held in memory for one upload only"""
+
+    email: Optional[str] = None
+    pan: Optional[str] = None
+    date_of_birth: Optional[date] = None
+    # Typed by the user for this upload
+    password: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, current_user: Dict[str, Any], **hints: Any) -> "PasswordHints":
+        return cls(email=current_user.get("email"), **hints)
+
+
+def _pan(hints: PasswordHints) -> Optional[str]:
+    return hints.pan.strip().upper() if hints.pan else None
+
+
+# Ways institutions derive statement passwords from investor details
+PASSWORD_PATTERNS: Dict[str, Callable[[PasswordHints], Optional[str]]] = {
+    "password": lambda hints: hints.password,
+    "pan_upper": _pan,
+    "pan_lower": lambda hints: _pan(hints).lower() if hints.pan else None,
+    "pan_dob": lambda hints: (
+        f"{_pan(hints)}{hints.date_of_birth:%d%m%Y}" if hints.pan and hints.date_of_birth else None
+    ),
+    "dob": lambda hints: f"{hints.date_of_birth:%d%m%Y}" if hints.date_of_birth else None,
+    "email": lambda hints: hints.email.strip() if hints.email else None,
+    "email_lower": lambda hints: hints.email.strip().lower() if hints.email else None,
+}
+
+# Most likely patterns first; the pattern that worked last time is tried before all of these
+DEFAULT_PATTERN_ORDER = ["pan_upper", "email", "email_lower", "pan_lower", "pan_dob", "dob"]
+PATTERN_ORDER: Dict[StatementType, List[str]] = {
+    StatementType.CAMS: ["email", "email_lower", "pan_upper", "pan_lower", "pan_dob", "dob"],
+    StatementType.KFINTECH: ["pan_upper", "pan_lower", "pan_dob", "email", "email_lower", "dob"],
+}
+
+
+def find_password(path: str, candidates: List[Tuple[str, str]]) -> Tuple[bool, Optional[str]]:
+    """Whether the PDF is encrypted, and the name of the first candidate that opens it"""
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    if not reader.is_encrypted:
+        return False, None
+    for pattern, password in candidates:
+        if reader.decrypt(password):
+            return True, pattern
+    return True, None
+
+
+class PdfUnlockService:
+    """Decryption stage of statement ingestion.
+
+    Tries passwords derived from the user's hints and remembers, per user and
+    institution, which pattern worked (only its name), so later uploads open on the
+    first attempt instead of running through every candidate.
+    """
+
+    def candidates(
+        self, statement_type: StatementType, hints: PasswordHints, remembered: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        """Distinct (pattern, password) pairs in the order they should be tried"""
+        order = ["password", remembered, *PATTERN_ORDER.get(statement_type, DEFAULT_PATTERN_ORDER)]
+        candidates: Dict[str, str] = {}
+        for pattern in order:
+            if pattern not in PASSWORD_PATTERNS:
+                continue
+            password = PASSWORD_PATTERNS[pattern](hints)
+            if password and password not in candidates:
+                candidates[password] = pattern
+        return [(pattern, password) for password, pattern in candidates.items()]
+
+    async def remembered_pattern(self, user_id: str, statement_type: StatementType) -> Optional[str]:
+        async with async_session_factory() as session:
+            return await session.scalar(
+                select(StatementPasswordPattern.pattern)
+                .where(StatementPasswordPattern.user_id == user_id)
+                .where(StatementPasswordPattern.statement_type == statement_type)
+            )
+
+    async def remember(self, user_id: str, statement_type: StatementType, pattern: str) -> None:
+        """Record the pattern that opened a user's statements from an institution.
+
+        An upsert, because concurrent uploads from the same user and institution can
+        both find nothing remembered and race to insert.
+        """
+        row = StatementPasswordPattern(user_id=user_id, statement_type=statement_type, pattern=pattern)
+        async with async_session_factory() as session:
+            insert = postgresql.insert if session.bind.dialect.name == "postgresql" else sqlite.insert
+            stmt = insert(StatementPasswordPattern).values(**row.model_dump())
+            await session.execute(stmt.on_conflict_do_update(
+                index_elements=["user_id", "statement_type"],
+                set_={"pattern": stmt.excluded.pattern, "updated_at": stmt.excluded.updated_at},
+            ))
+            await session.commit()
+
+    async def unlock(
+        self, path: str, user_id: str, statement_type: StatementType, hints: PasswordHints
+    ) -> Optional[str]:
+        """Password that opens a statement PDF, or None if it is not encrypted.
+
+        The remembered pattern is read and saved in short transactions of their own, so
+        no database connection is held while candidates are tried.
+        """
+        remembered = await self.remembered_pattern(user_id, statement_type)
+        candidates = self.candidates(statement_type, hints, remembered)
+        encrypted, pattern = await asyncio.to_thread(find_password, path, candidates)
+        if not encrypted:
+            return None
+        if pattern is None:
+            logger.warning(
+                "pdf_unlock_failed", user_id=user_id, statement_type=statement_type.value, attempts=len(candidates)
+            )
+            raise PasswordRequiredError(
+                "Statement PDF is password protected and could not be opened with the details provided"
+            )
+
+        attempts = [name for name, _ in candidates].index(pattern) + 1
+        logger.info(
+            "pdf_unlocked", user_id=user_id, statement_type=statement_type.value, pattern=pattern, attempts=attempts
+        )
+        # A password typed by the user says nothing about the next upload
+        if pattern not in ("password", remembered):
+            await self.remember(user_id, statement_type, pattern)
+        return dict(candidates)[pattern]
+
+
+def get_pdf_unlock_service() -> PdfUnlockService:
+    return PdfUnlockService()
@@ -0,0 +1,198 @@
+import math
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import Date, Select, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.performance import (
+    PerformancePoint,
+    PerformanceSeriesResponse,
+    PortfolioPerformance,
+    PortfolioPerformanceState,
+)
+from app.models.statement import ParsedTransaction
+from app.services.holdings import end_of_day, select_holdings, signed
+from app.services.price_store import PriceStore, get_price_store
+
+settings = get_settings()
+logger = get_logger("services.performance")
+
+DEFAULT_MAX_POINTS = 366
+
+
+def select_daily_flows(user_id: str, start: date, end: date) -> Select:
+    """Signed units and amount per day and security for a user between two dates"""
+    day = func.date(ParsedTransaction.transaction_date, type_=Date).label("day")
+    return (
+        select(
+            day,
+            ParsedTransaction.security_symbol,
+            func.sum(signed(func.coalesce(ParsedTransaction.units, 0))).label("units"),
+            func.sum(signed(func.coalesce(ParsedTransaction.amount, 0))).label("amount"),
+        )
+        .where(ParsedTransaction.user_id == user_id)
+        .where(ParsedTransaction.is_confirmed.is_(True))
+        .where(ParsedTransaction.is_duplicate.is_(False))
+        .where(ParsedTransaction.security_symbol.is_not(None))
+        .where(ParsedTransaction.transaction_date >= end_of_day(start - timedelta(days=1)))
+        .where(ParsedTransaction.transaction_date < end_of_day(end))
+        .group_by(day, ParsedTransaction.security_symbol)
+    )
+
+
+class PerformanceService:
+    """Maintains each user's daily value / invested-amount series.
+
+    The series is only ever rebuilt from the earliest day that changed: the
+    position on the day before is taken from the holdings aggregate, and every
+    later day is a cumulative sum of daily flows valued against the NAV matrix.
+    """
+
+    def __init__(self, price_store: PriceStore):
+        self.price_store = price_store
+
+    async def _get_state(self, session: AsyncSession, user_id: str) -> PortfolioPerformanceState:
+        result = await session.execute(
+            select(PortfolioPerformanceState).where(PortfolioPerformanceState.user_id == user_id)
+        )
+        state = result.scalar_one_or_none()
+        if state is None:
+            state = PortfolioPerformanceState(user_id=user_id)
+            session.add(state)
+        return state
+
+    async def invalidate(self, session: AsyncSession, user_id: str, from_date: date) -> None:
+        """Mark the series stale from a date, e.g. after transactions on it were confirmed"""
+        state = await self._get_state(session, user_id)
+        if state.dirty_from is None or from_date < state.dirty_from:
+            state.dirty_from = from_date
+
+    async def _first_transaction_date(self, session: AsyncSession, user_id: str) -> Optional[date]:
+        first = await session.scalar(
+            select(func.min(ParsedTransaction.transaction_date))
+            .where(ParsedTransaction.user_id == user_id)
+            .where(ParsedTransaction.is_confirmed.is_(True))
+            .where(ParsedTransaction.is_duplicate.is_(False))
+        )
+        return first.date() if first else None
+
+    async def _compute(self, session: AsyncSession, user_id: str, start: date, end: date):
+        """Dates with end-of-day market value and invested amount arrays for a range"""
+        import numpy as np
+
+        opening = (await session.execute(select_holdings(user_id, as_of=start - timedelta(days=1)))).all()
+        flows = (await session.execute(select_daily_flows(user_id, start, end))).all()
+
+        symbols: Dict[str, int] = {}
+        for row in opening + flows:
+            symbols.setdefault(row.security_symbol, len(symbols))
+        days = (end - start).days + 1
+        dates = [start + timedelta(days=i) for i in range(days)]
+
+        opening_units = np.zeros(len(symbols))
+        for row in opening:
+            opening_units[symbols[row.security_symbol]] = float(row.units)
+        opening_invested = sum(float(row.invested_amount) for row in opening)
+
+        unit_flows = np.zeros((days, len(symbols)))
+        amount_flows = np.zeros(days)
+        if flows:
+            day_index = np.array([(row.day - start).days for row in flows])
+            symbol_index = np.array([symbols[row.security_symbol] for row in flows])
+            np.add.at(unit_flows, (day_index, symbol_index), [float(row.units) for row in flows])
+            np.add.at(amount_flows, day_index, [float(row.amount) for row in flows])
+
+        units = opening_units + np.cumsum(unit_flows, axis=0)
+        prices = self.price_store.get_price_matrix(list(symbols), dates)
+        # Unpriced positions contribute nothing rather than poisoning the day's total
+        values = np.nansum(np.where(units != 0, units * prices, 0.0), axis=1)
+        invested = opening_invested + np.cumsum(amount_flows)
+        return dates, values, invested
+
+    async def recompute(self, session: AsyncSession, user_id: str, end: Optional[date] = None) -> int:
+        """Bring a user's series up to `end`, redoing only invalidated or missing days"""
+        state = await self._get_state(session, user_id)
+        end = end or self.price_store.end_date or date.today()
+
+        candidates = [d for d in (state.dirty_from,) if d is not None]
+        if state.computed_through is not None:
+            candidates.append(state.computed_through + timedelta(days=1))
+        else:
+            first = await self._first_transaction_date(session, user_id)
+            if first is None:
+                return 0
+            candidates.append(first)
+        start = min(candidates)
+        if start > end:
+            return 0
+
+        dates, values, invested = await self._compute(session, user_id, start, end)
+        await session.execute(
+            delete(PortfolioPerformance)
+            .where(PortfolioPerformance.user_id == user_id)
+            .where(PortfolioPerformance.series_date >= start)
+        )
+        await session.execute(
+            insert(PortfolioPerformance),
+            [
+                {
+                    "user_id": user_id,
+                    "series_date": day,
+                    "market_value": round(float(value), 2),
+                    "invested_amount": round(float(amount), 2),
+                }
+                for day, value, amount in zip(dates, values, invested)
+            ],
+        )
+        state.computed_through = end
+        state.dirty_from = None
+
+        logger.info("performance_recomputed", user_id=user_id, start=start.isoformat(), end=end.isoformat(), days=len(dates))
+        return len(dates)
+
+    async def get_series(
+        self,
+        session: AsyncSession,
+        user_id: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        max_points: int = DEFAULT_MAX_POINTS,
+    ) -> PerformanceSeriesResponse:
+        """Stored series between two dates, thinned to at most `max_points` points.
+
+        Long ranges keep every n-th day counted back from the last day, so the most
+        recent value is always included.
+        """
+        stmt = (
+            select(
+                PortfolioPerformance.series_date,
+                PortfolioPerformance.market_value,
+                PortfolioPerformance.invested_amount,
+            )
+            .where(PortfolioPerformance.user_id == user_id)
+            .order_by(PortfolioPerformance.series_date)
+        )
+        if start is not None:
+            stmt = stmt.where(PortfolioPerformance.series_date >= start)
+        if end is not None:
+            stmt = stmt.where(PortfolioPerformance.series_date <= end)
+        rows = (await session.execute(stmt)).all()
+
+        interval = max(1, math.ceil(len(rows) / max_points))
+        sampled = rows[::-1][::interval][::-1]
+        return PerformanceSeriesResponse(
+            start=rows[0].series_date if rows else start,
+            end=rows[-1].series_date if rows else end,
+            interval_days=interval,
+            points=[
+                PerformancePoint(date=row.series_date, market_value=row.market_value, invested_amount=row.invested_amount)
+                for row in sampled
+            ],
+        )
+
+
+def get_performance_service() -> PerformanceService:
+    return PerformanceService(get_price_store())
@@ -0,0 +1,354 @@
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+settings = get_settings()
+logger = get_logger("services.price_store")
+
+META_FILE = "meta.json"
+LOCK_FILE = ".lock"
+DATE_CAPACITY_STEP = 366
+INITIAL_SCHEME_CAPACITY = 1024
+
+
+class PriceStore:
+    """Append-only NAV history kept in memory-mapped date x scheme matrices.
+
+    Row ``r`` holds calendar day ``start_date + r`` and each scheme owns one column.
+    ``navs`` is forward-filled at write time so a point-in-time lookup is a single
+    index, and ``source`` records which row each value was published on (``-1`` before
+    the first NAV), so ``source[r, c] == r`` marks an actual publication. Readers map
+    the files read-only, so every worker process shares the same page cache.
+    """
+
+    def __init__(self, root: Path, refresh_interval_seconds: float = 1.0):
+        self.root = root
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self._meta: Optional[Dict[str, Any]] = None
+        self._meta_mtime: Optional[int] = None
+        self._checked_at = 0.0
+        self._navs = None
+        self._source = None
+        self._index: Dict[str, int] = {}
+
+    # Layout -----------------------------------------------------------------
+
+    @staticmethod
+    def _data_paths(root: Path, generation: int) -> Tuple[Path, Path]:
+        return root / f"navs-{generation}.f64", root / f"source-{generation}.i32"
+
+    def _open(self, meta: Dict[str, Any], mode: str):
+        import numpy as np
+
+        shape = (meta["date_capacity"], meta["scheme_capacity"])
+        navs_path, source_path = self._data_paths(self.root, meta["generation"])
+        return (
+            np.memmap(navs_path, dtype=np.float64, mode=mode, shape=shape),
+            np.memmap(source_path, dtype=np.int32, mode=mode, shape=shape),
+        )
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads((self.root / META_FILE).read_text())
+        except FileNotFoundError:
+            return None
+
+    def _write_meta(self, meta: Dict[str, Any]) -> None:
+        tmp = self.root / f".{META_FILE}.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.root / META_FILE)
+
+    def _refresh(self) -> bool:
+        """Remap the store if the writer published a new version; False if it is empty"""
+        now = time.monotonic()
+        if self._meta is not None and now - self._checked_at < self.refresh_interval_seconds:
+            return True
+        self._checked_at = now
+
+        try:
+            mtime = (self.root / META_FILE).stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime != self._meta_mtime:
+            meta = self._read_meta()
+            if meta is None:
+                return False
+            self._navs, self._source = self._open(meta, "r")
+            self._index = meta["index"]
+            self._meta, self._meta_mtime = meta, mtime
+        return self._meta is not None and self._meta["num_dates"] > 0
+
+    # Reads ------------------------------------------------------------------
+
+    @property
+    def start_date(self) -> Optional[date]:
+        if not self._refresh():
+            return None
+        return date.fromisoformat(self._meta["start_date"])
+
+    @property
+    def end_date(self) -> Optional[date]:
+        if not self._refresh():
+            return None
+        return self.start_date + timedelta(days=self._meta["num_dates"] - 1)
+
+    def has_symbol(self, symbol: str) -> bool:
+        return self._refresh() and symbol in self._index
+
+    def _row(self, as_of: date) -> int:
+        """Row for a date; dates past the last ingested day use the latest row"""
+        offset = (as_of - date.fromisoformat(self._meta["start_date"])).days
+        return min(offset, self._meta["num_dates"] - 1)
+
+    def _columns(self, symbols: Sequence[str]):
+        import numpy as np
+
+        return np.array([self._index.get(symbol, -1) for symbol in symbols], dtype=np.int64)
+
+    def get_prices(self, symbols: Sequence[str], as_of: date):
+        """NAV of each symbol as of a date (NaN if unknown), as one vectorized lookup"""
+        import numpy as np
+
+        prices = np.full(len(symbols), np.nan)
+        if not self._refresh():
+            return prices
+        row = self._row(as_of)
+        columns = self._columns(symbols)
+        known = columns >= 0
+        if row >= 0:
+            prices[known] = self._navs[row, columns[known]]
+        return prices
+
+    def get_price_matrix(self, symbols: Sequence[str], dates: Sequence[date]):
+        """NAVs for every (date, symbol) pair as a len(dates) x len(symbols) matrix"""
+        import numpy as np
+
+        matrix = np.full((len(dates), len(symbols)), np.nan)
+        if not self._refresh() or not len(dates):
+            return matrix
+        start = np.datetime64(self._meta["start_date"], "D")
+        rows = (np.array(dates, dtype="datetime64[D]") - start).astype(np.int64)
+        rows = np.minimum(rows, self._meta["num_dates"] - 1)
+        columns = self._columns(symbols)
+        valid_rows = rows >= 0
+        valid_columns = columns >= 0
+        matrix[np.ix_(valid_rows, valid_columns)] = self._navs[
+            np.ix_(rows[valid_rows], columns[valid_columns])
+        ]
+        return matrix
+
+    def get_price(self, symbol: str, as_of: date) -> Optional[Tuple[float, date]]:
+        """NAV as of a date together with the date it was published"""
+        if not self.has_symbol(symbol):
+            return None
+        row = self._row(as_of)
+        if row < 0:
+            return None
+        column = self._index[symbol]
+        source_row = int(self._source[row, column])
+        if source_row < 0:
+            return None
+        start = date.fromisoformat(self._meta["start_date"])
+        return float(self._navs[row, column]), start + timedelta(days=source_row)
+
+    def get_history(self, symbol: str, start: date, end: date) -> List[Tuple[date, float]]:
+        """Published NAVs of a symbol between two dates, inclusive"""
+        import numpy as np
+
+        if not self.has_symbol(symbol):
+            return []
+        store_start = date.fromisoformat(self._meta["start_date"])
+        first = max(0, (start - store_start).days)
+        last = min(self._meta["num_dates"] - 1, (end - store_start).days)
+        if last < first:
+            return []
+        column = self._index[symbol]
+        rows = np.arange(first, last + 1)
+        published = rows[self._source[first:last + 1, column] == rows]
+        values = self._navs[published, column]
+        return [
+            (store_start + timedelta(days=int(row)), float(value))
+            for row, value in zip(published, values)
+        ]
+
+    # Writes -----------------------------------------------------------------
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / LOCK_FILE, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _allocate(self, meta: Dict[str, Any]) -> None:
+        import numpy as np
+
+        navs_path, source_path = self._data_paths(self.root, meta["generation"])
+        shape = (meta["date_capacity"], meta["scheme_capacity"])
+        for path, dtype, fill in ((navs_path, np.float64, np.nan), (source_path, np.int32, -1)):
+            array = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+            array[:] = fill
+            array.flush()
+
+    def _relayout(self, meta: Dict[str, Any], start: date, date_capacity: int, scheme_capacity: int) -> Dict[str, Any]:
+        """Copy the store into a new generation with a new origin or capacity"""
+        new_meta = {
+            **meta,
+            "generation": meta["generation"] + 1,
+            "start_date": start.isoformat(),
+            "date_capacity": date_capacity,
+            "scheme_capacity": scheme_capacity,
+        }
+        self._allocate(new_meta)
+        if meta["num_dates"]:
+            shift = (date.fromisoformat(meta["start_date"]) - start).days
+            old_navs, old_source = self._open(meta, "r")
+            navs, source = self._open(new_meta, "r+")
+            rows, width = meta["num_dates"], meta["scheme_capacity"]
+            navs[shift:shift + rows, :width] = old_navs[:rows]
+            old = old_source[:rows]
+            source[shift:shift + rows, :width] = (old + shift) * (old >= 0) - (old < 0)
+            new_meta["num_dates"] = rows + shift
+            navs.flush()
+            source.flush()
+        return new_meta
+
+    def _extend_rows(self, meta: Dict[str, Any], num_dates: int) -> Dict[str, Any]:
+        """Grow the date axis in place, carrying every scheme forward into the new days"""
+        if num_dates > meta["date_capacity"]:
+            capacity = (num_dates // DATE_CAPACITY_STEP + 1) * DATE_CAPACITY_STEP
+            for path, itemsize in zip(self._data_paths(self.root, meta["generation"]), (8, 4)):
+                with open(path, "r+b") as f:
+                    f.truncate(capacity * meta["scheme_capacity"] * itemsize)
+            meta = {**meta, "date_capacity": capacity}
+
+        navs, source = self._open(meta, "r+")
+        old = meta["num_dates"]
+        navs[old:num_dates] = float("nan")
+        source[old:num_dates] = -1
+        meta = {**meta, "num_dates": num_dates}
+        self._forward_fill(navs, source, old, num_dates, slice(0, len(meta["schemes"])))
+        return meta
+
+    @staticmethod
+    def _forward_fill(navs, source, first_row: int, end_row: int, columns) -> None:
+        """Recompute carried-forward values for rows [first_row, end_row) of some columns"""
+        import numpy as np
+
+        if end_row <= first_row:
+            return
+        rows = np.arange(first_row, end_row)[:, None]
+        segment_source = source[first_row:end_row, columns]
+        carry = source[first_row - 1, columns] if first_row > 0 else np.full(segment_source.shape[1], -1)
+        published = np.where(segment_source == rows, rows, -1)
+        filled_source = np.maximum.accumulate(np.vstack([carry[None, :], published]), axis=0)[1:]
+
+        if isinstance(columns, slice):
+            column_ids = np.arange(columns.start, columns.stop)
+        else:
+            column_ids = np.asarray(columns)
+        values = navs[np.maximum(filled_source, 0), column_ids[None, :]]
+        navs[first_row:end_row, columns] = np.where(filled_source >= 0, values, np.nan)
+        source[first_row:end_row, columns] = filled_source
+
+    def write(
+        self,
+        symbols: Sequence[str],
+        dates: Sequence[date],
+        navs: Sequence[float],
+        aliases: Optional[Dict[str, Sequence[str]]] = None,
+    ) -> int:
+        """Record published NAVs (one entry per symbol/date) and return how many were stored"""
+        import numpy as np
+
+        if not len(symbols):
+            return 0
+        aliases = aliases or {}
+
+        with self._write_lock():
+            meta = self._read_meta() or {
+                "generation": 0,
+                "start_date": min(dates).isoformat(),
+                "num_dates": 0,
+                "date_capacity": DATE_CAPACITY_STEP,
+                "scheme_capacity": INITIAL_SCHEME_CAPACITY,
+                "schemes": [],
+                "index": {},
+            }
+            if not (self.root / META_FILE).exists():
+                self._allocate(meta)
+
+            # Register unseen schemes and their aliases (e.g. ISINs for an AMFI code)
+            schemes, index = list(meta["schemes"]), dict(meta["index"])
+            for symbol in dict.fromkeys(symbols):
+                if symbol not in index:
+                    index[symbol] = len(schemes)
+                    schemes.append(symbol)
+                for alias in aliases.get(symbol, ()):
+                    index.setdefault(alias, index[symbol])
+            meta = {**meta, "schemes": schemes, "index": index}
+
+            start = date.fromisoformat(meta["start_date"])
+            earliest = min(dates)
+            scheme_capacity = meta["scheme_capacity"]
+            while scheme_capacity < len(schemes):
+                scheme_capacity *= 2
+            if earliest < start or scheme_capacity != meta["scheme_capacity"]:
+                new_start = min(start, earliest)
+                span = meta["date_capacity"] + (start - new_start).days
+                meta = self._relayout(meta, new_start, span, scheme_capacity)
+                start = new_start
+
+            start64 = np.datetime64(start.isoformat(), "D")
+            rows = (np.array(dates, dtype="datetime64[D]") - start64).astype(np.int64)
+            columns = np.array([index[symbol] for symbol in symbols], dtype=np.int64)
+            values = np.asarray(navs, dtype=np.float64)
+
+            if rows.max() + 1 > meta["num_dates"]:
+                meta = self._extend_rows(meta, int(rows.max()) + 1)
+
+            nav_matrix, source_matrix = self._open(meta, "r+")
+            nav_matrix[rows, columns] = values
+            source_matrix[rows, columns] = rows
+            touched = np.unique(columns)
+            self._forward_fill(nav_matrix, source_matrix, int(rows.min()), meta["num_dates"], touched)
+            nav_matrix.flush()
+            source_matrix.flush()
+
+            previous_generation = self._read_meta()
+            self._write_meta(meta)
+            # Readers holding the old generation keep their mappings until they refresh
+            if previous_generation and previous_generation["generation"] != meta["generation"]:
+                for path in self._data_paths(self.root, previous_generation["generation"]):
+                    path.unlink(missing_ok=True)
+
+        self._meta_mtime = None
+        logger.info(
+            "prices_written",
+            records=len(symbols),
+            schemes=len(touched),
+            first_date=min(dates).isoformat(),
+            last_date=max(dates).isoformat(),
+        )
+        return len(symbols)
+
+
+_price_store: Optional[PriceStore] = None
+
+
+def get_price_store() -> PriceStore:
+    global _price_store
+    if _price_store is None:
+        _price_store = PriceStore(Path(settings.price_store_dir))
+    return _price_store
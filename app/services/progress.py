@@ -0,0 +1,202 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.enums import UploadSessionStatus
+from app.models.statement import UploadSession
+from app.models.upload import UploadProgressEvent
+from app.services.pdf_extract import ProgressCallback
+
+settings = get_settings()
+logger = get_logger("services.progress")
+
+CHANNEL = "upload_progress"
+# Progress events supersede each other, so a slow subscriber only loses intermediate ones
+SUBSCRIBER_QUEUE_SIZE = 64
+LISTEN_RETRY_SECONDS = 5.0
+# Progress reports within this window are coalesced and sent together
+REPORT_FLUSH_SECONDS = 0.25
+TERMINAL_STATUSES = {UploadSessionStatus.COMPLETED, UploadSessionStatus.FAILED, UploadSessionStatus.EXPIRED}
+
+
+class UploadProgressBroker:
+    """Pushes upload session status and progress to subscribers such as SSE streams.
+
+    Each process keeps one set of in-memory subscriber queues per upload session. On
+    Postgres, events are published with NOTIFY and every process holds a single
+    LISTEN connection that fans them out locally, so thousands of waiting clients
+    cost no queries at all; elsewhere events are delivered within the process.
+    """
+
+    def __init__(self, listen_url: Optional[str]):
+        self.listen_url = listen_url
+        self._subscribers: Dict[UUID, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+        # The LISTEN connection also sends progress reports; asyncpg runs one query at a time
+        self._connection = None
+        self._connection_lock = asyncio.Lock()
+        self._pending: Dict[UUID, UploadProgressEvent] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @property
+    def uses_notify(self) -> bool:
+        return self.listen_url is not None
+
+    @asynccontextmanager
+    async def subscribe(self, upload_session_id: UUID) -> AsyncIterator["asyncio.Queue[UploadProgressEvent]"]:
+        queue: "asyncio.Queue[UploadProgressEvent]" = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(upload_session_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(upload_session_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[upload_session_id]
+
+    def dispatch(self, event: UploadProgressEvent) -> None:
+        """Hand an event to this process's subscribers of its session"""
+        for queue in self._subscribers.get(event.upload_session_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def publish(self, event: UploadProgressEvent, session: AsyncSession) -> None:
+        """Send an event to every process when the session's transaction commits"""
+        if not self.uses_notify:
+            self.dispatch(event)
+            return
+        await session.execute(select(func.pg_notify(CHANNEL, event.model_dump_json())))
+
+    async def transition(
+        self,
+        session: AsyncSession,
+        upload_session_id: UUID,
+        status: UploadSessionStatus,
+        detail: Optional[str] = None,
+    ) -> None:
+        """Move an upload session to a new status and announce it with the same commit"""
+        values = {"status": status, "updated_at": datetime.utcnow()}
+        if status == UploadSessionStatus.FAILED:
+            values["error_message"] = detail
+        # A report still waiting to be sent would only follow the new status
+        self._pending.pop(upload_session_id, None)
+        await session.execute(update(UploadSession).where(UploadSession.id == upload_session_id).values(**values))
+        await self.publish(
+            UploadProgressEvent(upload_session_id=upload_session_id, status=status, detail=detail), session
+        )
+
+    async def report(self, upload_session_id: UUID, **progress: Optional[int]) -> None:
+        """Announce progress of a processing session shortly, outside any transaction.
+
+        Reports are coalesced per session and sent in batches over the LISTEN
+        connection, so progress never holds a pooled database connection.
+        """
+        event = UploadProgressEvent(
+            upload_session_id=upload_session_id, status=UploadSessionStatus.PROCESSING, **progress
+        )
+        if not self.uses_notify:
+            self.dispatch(event)
+            return
+        self._pending[upload_session_id] = event
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_reports())
+
+    async def _flush_reports(self) -> None:
+        await asyncio.sleep(REPORT_FLUSH_SECONDS)
+        events, self._pending = list(self._pending.values()), {}
+        if not events:
+            return
+        async with self._connection_lock:
+            connection = self._connection
+            if connection is None or connection.is_closed():
+                # Only intermediate progress is lost; statuses go out with their commits
+                logger.warning("progress_reports_dropped", events=len(events))
+                return
+            try:
+                await connection.executemany(
+                    "SELECT pg_notify($1, $2)", [(CHANNEL, event.model_dump_json()) for event in events]
+                )
+            except Exception as e:
+                logger.warning("progress_reports_failed", events=len(events), error=str(e))
+
+    def page_reporter(self, upload_session_id: UUID) -> ProgressCallback:
+        """Callback for PDF extraction that reports pages processed for a session"""
+
+        async def report_pages(done: int, total: int) -> None:
+            await self.report(upload_session_id, pages_processed=done, pages_total=total)
+
+        return report_pages
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            self.dispatch(UploadProgressEvent.model_validate_json(payload))
+        except ValueError as e:
+            logger.warning("progress_event_invalid", error=str(e))
+
+    async def _listen_forever(self) -> None:
+        import asyncpg
+
+        while True:
+            try:
+                connection = await asyncpg.connect(self.listen_url)
+                try:
+                    await connection.add_listener(CHANNEL, self._on_notification)
+                    self._connection = connection
+                    logger.info("progress_listener_started", channel=CHANNEL)
+                    while not connection.is_closed():
+                        await asyncio.sleep(LISTEN_RETRY_SECONDS)
+                        # Surfaces a dropped connection as an error
+                        async with self._connection_lock:
+                            await connection.execute("SELECT 1")
+                finally:
+                    self._connection = None
+                    await connection.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("progress_listener_disconnected", error=str(e))
+            await asyncio.sleep(LISTEN_RETRY_SECONDS)
+
+    async def start(self) -> None:
+        if self._task is not None or not self.uses_notify:
+            return
+        self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+def _listen_url() -> Optional[str]:
+    if settings.progress_listen_url:
+        return settings.progress_listen_url
+    if not settings.database_url.startswith("postgresql"):
+        return None
+    # asyncpg takes a plain libpq-style URL
+    return make_url(settings.database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+upload_progress = UploadProgressBroker(_listen_url())
+
+
+def get_upload_progress() -> UploadProgressBroker:
+    return upload_progress
@@ -0,0 +1,155 @@
+import asyncio
+import math
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import get_settings
+from app.core.exceptions import RateLimitError
+from app.core.logging import get_logger
+from app.db.session import async_session_factory
+from app.models.rate_limit import RateLimitBucket
+
+settings = get_settings()
+logger = get_logger("services.rate_limit")
+
+# In-memory buckets kept per worker before full (idle) ones are dropped
+MAX_MEMORY_BUCKETS = 100_000
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    per_minute: float
+    burst: int
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60.0
+
+
+def take_token(tokens: float, elapsed: float, limit: RateLimit) -> Tuple[float, float]:
+    """Refill a bucket for the elapsed seconds and take one token.
+
+    Returns the tokens left and how long to wait before retrying (0 when the token
+    was taken).
+    """
+    tokens = min(float(limit.burst), tokens + max(elapsed, 0.0) * limit.rate)
+    if tokens >= 1.0:
+        return tokens - 1.0, 0.0
+    return tokens, (1.0 - tokens) / limit.rate if limit.rate > 0 else 60.0
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def take(self, key: str, limit: RateLimit) -> float:
+        """Take a token from a bucket; seconds until one is available if it is empty"""
+
+    async def acquire(self, key: str, limit: RateLimit) -> None:
+        """Wait until a token can be taken from a bucket, then take it"""
+        while (retry_after := await self.take(key, limit)) > 0:
+            await asyncio.sleep(retry_after)
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Buckets in this process only; each worker enforces the limit on its own.
+
+    Each bucket keeps (tokens, updated, full_at), where full_at is when its own limit
+    will have refilled it; a full bucket is the same as a missing one, so those are
+    the ones pruned.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        now = time.monotonic()
+        tokens, updated, _ = self._buckets.get(key, (float(limit.burst), now, now))
+        tokens, retry_after = take_token(tokens, now - updated, limit)
+        missing = limit.burst - tokens
+        if missing <= 0:
+            full_at = now
+        else:
+            # A limit that never refills keeps its buckets
+            full_at = now + missing / limit.rate if limit.rate > 0 else math.inf
+        self._buckets[key] = (tokens, now, full_at)
+        if len(self._buckets) > MAX_MEMORY_BUCKETS:
+            self._prune(now)
+        return retry_after
+
+    def _prune(self, now: float) -> None:
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[2] > now}
+
+
+class DatabaseRateLimitBackend(RateLimitBackend):
+    """Buckets in the rate_limit_buckets table, shared by every worker and host.
+
+    Each take locks the bucket row for one short transaction of its own, so it works
+    the same against Postgres and the local SQLite database.
+    """
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        for _ in range(2):
+            async with async_session_factory() as session:
+                now = datetime.utcnow()
+                bucket = await session.scalar(
+                    select(RateLimitBucket).where(RateLimitBucket.key == key).with_for_update()
+                )
+                if bucket is None:
+                    tokens, retry_after = take_token(float(limit.burst), 0.0, limit)
+                    session.add(RateLimitBucket(key=key, tokens=tokens, updated_at=now))
+                else:
+                    elapsed = (now - bucket.updated_at).total_seconds()
+                    bucket.tokens, retry_after = take_token(bucket.tokens, elapsed, limit)
+                    bucket.updated_at = now
+                try:
+                    await session.commit()
+                except IntegrityError:
+                    # Another worker created the bucket first; take from that one
+                    continue
+                return retry_after
+        return 0.0
+
+
+class RateLimitService:
+    """Token bucket rate limits per scope (e.g. login, upload) and client"""
+
+    def __init__(self, backend: RateLimitBackend, limits: Dict[str, RateLimit], enabled: bool = True):
+        self.backend = backend
+        self.limits = limits
+        self.enabled = enabled
+
+    async def check(self, scope: str, client: str) -> None:
+        """Take a token for a client in a scope, or raise a 429 saying when to retry"""
+        if not self.enabled:
+            return
+        limit = self.limits[scope]
+        try:
+            retry_after = await self.backend.take(f"{scope}:{client}", limit)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # An unavailable shared store must not lock everyone out
+            logger.warning("rate_limit_backend_failed", scope=scope, error=str(e))
+            return
+        if retry_after > 0:
+            logger.info("rate_limited", scope=scope, client=client, retry_after=round(retry_after, 1))
+            raise RateLimitError("Too many requests, please retry later", retry_after=retry_after)
+
+
+rate_limit_service = RateLimitService(
+    DatabaseRateLimitBackend() if settings.rate_limit_backend == "database" else MemoryRateLimitBackend(),
+    {
+        "login": RateLimit(settings.rate_limit_login_per_minute, settings.rate_limit_login_burst),
+        "upload": RateLimit(settings.rate_limit_upload_per_minute, settings.rate_limit_upload_burst),
+    },
+    enabled=settings.rate_limit_enabled,
+)
+
+
+def get_rate_limit_service() -> RateLimitService:
+    return rate_limit_service
@@ -0,0 +1,282 @@
+import asyncio
+import os
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import orjson
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.exceptions import PasswordRequiredError
+from app.core.logging import get_logger
+from app.db.session import async_session_factory
+from app.models.enums import StatementType
+from app.models.reprocess import ReprocessResult
+from app.models.statement import ParsedTransaction, Statement, StatementFile
+from app.services.performance import PerformanceService, get_performance_service
+from app.services.rate_limit import MemoryRateLimitBackend, RateLimit
+from app.services.security_master import SecurityMasterService, get_security_master_service
+from app.services.statement import StatementService, get_statement_service
+from app.services.statement_parsers import PARSED_FIELDS, ParsedRow, StatementParser, get_parser
+
+settings = get_settings()
+logger = get_logger("services.reprocess")
+
+
+@dataclass
+class RowDiff:
+    unchanged: int = 0
+    updates: List[Tuple[UUID, ParsedRow]] = field(default_factory=list)
+    deletes: List[UUID] = field(default_factory=list)
+    inserts: List[ParsedRow] = field(default_factory=list)
+    # Transaction dates touched by the change, for downstream invalidation
+    dates: List[date] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.updates or self.deletes or self.inserts)
+
+
+def diff_rows(existing: Sequence, parsed: Sequence[ParsedRow]) -> RowDiff:
+    """Minimal set of row changes turning the stored transactions into the re-parsed ones.
+
+    Rows identical in every parsed field are left alone (keeping their ids, scores and
+    confirmation); remaining rows are paired by identity (date, type, security) and
+    updated in place; only what is left over is deleted or inserted.
+    """
+    diff = RowDiff()
+    new_rows: Dict[ParsedRow, int] = defaultdict(int)
+    for row in parsed:
+        new_rows[row] += 1
+
+    leftover: Dict[Tuple, List[Tuple[UUID, ParsedRow]]] = defaultdict(list)
+    for row in existing:
+        old = ParsedRow(**{name: getattr(row, name) for name in PARSED_FIELDS})
+        if new_rows.get(old):
+            new_rows[old] -= 1
+            diff.unchanged += 1
+        else:
+            leftover[old.identity].append((row.id, old))
+
+    for new, count in new_rows.items():
+        for _ in range(count):
+            candidates = leftover.get(new.identity)
+            if candidates:
+                row_id, old = candidates.pop(0)
+                diff.updates.append((row_id, new))
+                diff.dates.extend((old.transaction_date.date(), new.transaction_date.date()))
+            else:
+                diff.inserts.append(new)
+                diff.dates.append(new.transaction_date.date())
+    for candidates in leftover.values():
+        for row_id, old in candidates:
+            diff.deletes.append(row_id)
+            diff.dates.append(old.transaction_date.date())
+    return diff
+
+
+class ReprocessService:
+    """Re-runs a statement type's parser over every stored file of that type.
+
+    Statements are read in id order a page at a time and re-parsed concurrently, each
+    in its own transaction, with changes diff-applied to ParsedTransaction. After each
+    page the last id is checkpointed to disk, so an interrupted run resumes where it
+    stopped; redoing a partly finished page is harmless because unchanged rows are
+    left alone. Statements that failed are kept in the checkpoint and retried first
+    by the next run.
+
+    Password-protected PDFs are only re-parsed from the page cache: the password
+    hints (PAN, date of birth) are never stored, so one whose cached text is gone
+    cannot be decrypted here and is reported as locked instead.
+    """
+
+    def __init__(
+        self,
+        statement_service: StatementService,
+        performance_service: PerformanceService,
+        security_master: SecurityMasterService,
+        batch_size: int,
+        checkpoint_dir: str,
+    ):
+        self.statement_service = statement_service
+        self.performance_service = performance_service
+        self.security_master = security_master
+        self.batch_size = batch_size
+        self.checkpoint_dir = Path(checkpoint_dir)
+
+    def _checkpoint_path(self, statement_type: StatementType) -> Path:
+        return self.checkpoint_dir / f"{statement_type.value}.json"
+
+    def load_checkpoint(self, statement_type: StatementType, parser_version: int) -> Optional[ReprocessResult]:
+        """Progress of an unfinished run with the same parser version"""
+        try:
+            result = ReprocessResult.model_validate_json(self._checkpoint_path(statement_type).read_bytes())
+        except FileNotFoundError:
+            return None
+        return result if result.parser_version == parser_version else None
+
+    def save_checkpoint(self, result: ReprocessResult) -> None:
+        path = self._checkpoint_path(result.statement_type)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+        temp.write_bytes(orjson.dumps(result.model_dump(mode="json")))
+        os.replace(temp, path)
+
+    async def apply(self, session: AsyncSession, statement: Statement, diff: RowDiff) -> None:
+        """Write a row diff for one statement in the caller's transaction"""
+        now = datetime.utcnow()
+        table = ParsedTransaction.__table__
+        if diff.updates:
+            # Re-parsed values need fresh scores; confirmation of the row is kept
+            await session.execute(
+                update(table)
+                .where(table.c.id == bindparam("row_id"))
+                .values(
+                    **{name: bindparam(f"new_{name}") for name in PARSED_FIELDS},
+                    confidence_score=None,
+                    updated_at=now,
+                ),
+                [
+                    {"row_id": row_id, **{f"new_{name}": value for name, value in row.values().items()}}
+                    for row_id, row in diff.updates
+                ],
+            )
+        if diff.deletes:
+            await session.execute(delete(ParsedTransaction).where(ParsedTransaction.id.in_(diff.deletes)))
+        # Rows a re-parse adds to a confirmed statement count as confirmed, like the rows it
+        # updates in place; otherwise holdings and performance would silently leave them out
+        session.add_all([
+            ParsedTransaction(
+                statement_id=statement.id,
+                user_id=statement.user_id,
+                is_confirmed=statement.confirmed_at is not None,
+                **row.values(),
+            )
+            for row in diff.inserts
+        ])
+
+        if statement.confirmed_at is None:
+            # Back into the scoring queue with the new rows
+            statement.parsing_confidence = None
+        else:
+            await self.performance_service.invalidate(session, statement.user_id, min(diff.dates))
+        statement.updated_at = now
+        await session.flush()
+
+    async def reprocess_statement(self, statement_id: UUID, parser: StatementParser, dry_run: bool) -> RowDiff:
+        async with async_session_factory() as session:
+            statement = await session.get(Statement, statement_id)
+            if statement is None:
+                return RowDiff()
+            # Ends the read, so no connection is held while the file is extracted and parsed
+            await session.commit()
+            text = await self.statement_service.extract_text(statement_id)
+            parsed = await asyncio.to_thread(parser, text)
+            # Resolved the same way as at upload, so unchanged rows still diff as unchanged
+            parsed = await self.security_master.canonicalize(session, parsed)
+            existing = (await session.execute(
+                select(ParsedTransaction.id, *(getattr(ParsedTransaction, name) for name in PARSED_FIELDS))
+                .where(ParsedTransaction.statement_id == statement_id)
+            )).all()
+            diff = diff_rows(existing, parsed)
+            if diff.changed and not dry_run:
+                await self.apply(session, statement, diff)
+                await session.commit()
+        return diff
+
+    async def run(
+        self,
+        statement_type: StatementType,
+        concurrency: int,
+        rate: float = 0.0,
+        dry_run: bool = False,
+        restart: bool = False,
+        limit: Optional[int] = None,
+    ) -> ReprocessResult:
+        """Re-parse every stored statement of a type, resuming from the last checkpoint"""
+        parser, version = get_parser(statement_type)
+        result = None if restart or dry_run else self.load_checkpoint(statement_type, version)
+        if result is None:
+            result = ReprocessResult(statement_type=statement_type, parser_version=version, dry_run=dry_run)
+        after = result.resumed_after
+        logger.info("reprocess_started", statement_type=statement_type.value, version=version, after=after)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        # One token bucket without burst spaces statements 1/rate seconds apart
+        limiter, limit_per_statement = MemoryRateLimitBackend(), RateLimit(rate * 60, 1)
+
+        async def process(statement_id: UUID) -> None:
+            async with semaphore:
+                if rate > 0:
+                    await limiter.acquire("reprocess", limit_per_statement)
+                try:
+                    diff = await self.reprocess_statement(statement_id, parser, dry_run)
+                except PasswordRequiredError:
+                    # Retrying cannot help; the statement needs a fresh upload by its owner
+                    result.locked += 1
+                    result.locked_ids.append(str(statement_id))
+                    logger.warning("statement_reprocess_locked", statement_id=str(statement_id))
+                    return
+                except Exception as e:
+                    result.failed += 1
+                    result.failed_ids.append(str(statement_id))
+                    logger.warning("statement_reprocess_failed", statement_id=str(statement_id), error=str(e))
+                    return
+            result.changed += diff.changed
+            result.rows_unchanged += diff.unchanged
+            result.rows_updated += len(diff.updates)
+            result.rows_inserted += len(diff.inserts)
+            result.rows_deleted += len(diff.deletes)
+
+        if result.failed_ids:
+            # Already counted in statements; only the ones failing again stay failed
+            retry, result.failed_ids = result.failed_ids, []
+            result.failed -= len(retry)
+            await asyncio.gather(*(process(UUID(statement_id)) for statement_id in retry))
+            self.save_checkpoint(result)
+            logger.info("reprocess_retried", retried=len(retry), failed=result.failed)
+
+        while limit is None or result.statements < limit:
+            size = self.batch_size if limit is None else min(self.batch_size, limit - result.statements)
+            stmt = (
+                select(Statement.id)
+                .join(StatementFile, StatementFile.statement_id == Statement.id)
+                .where(Statement.statement_type == statement_type)
+                .order_by(Statement.id)
+                .limit(size)
+            )
+            if after is not None:
+                stmt = stmt.where(Statement.id > UUID(after))
+            async with async_session_factory() as session:
+                page = list((await session.execute(stmt)).scalars())
+            if not page:
+                break
+
+            await asyncio.gather(*(process(statement_id) for statement_id in page))
+            result.statements += len(page)
+            after = result.resumed_after = str(page[-1])
+            if not dry_run:
+                self.save_checkpoint(result)
+            logger.info("reprocess_progress", statements=result.statements, changed=result.changed, after=after)
+
+        if limit is None and not dry_run and not result.failed_ids:
+            # Finished: the next run starts from the beginning
+            self._checkpoint_path(statement_type).unlink(missing_ok=True)
+        logger.info("reprocess_completed", **result.model_dump(mode="json"))
+        return result
+
+
+def get_reprocess_service() -> ReprocessService:
+    return ReprocessService(
+        get_statement_service(),
+        get_performance_service(),
+        get_security_master_service(),
+        settings.reprocess_batch_size,
+        settings.reprocess_checkpoint_dir,
+    )
@@ -0,0 +1,331 @@
+import bisect
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.security import Security, SecurityMatch
+from app.models.statement import ParsedTransaction
+from app.services.nav_ingest import SchemeInfo
+from app.services.statement_parsers import ParsedRow
+
+settings = get_settings()
+logger = get_logger("services.security_master")
+
+MIN_MATCH_SCORE = 0.6
+# Symbols are only replaced on an exact code, ISIN or scheme-name match; a ticker that
+# merely resembles a scheme name must not be remapped
+EXACT_MATCH_SCORE = 1.0
+INDEX_REFRESH_SECONDS = 60.0
+RESOLVED_CACHE_SIZE = 50_000
+UPSERT_CHUNK_SIZE = 1000
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# RTAs abbreviate plan and option names differently; fold them to one spelling
+_SYNONYMS = {
+    "dir": "direct",
+    "drct": "direct",
+    "reg": "regular",
+    "gr": "growth",
+    "grw": "growth",
+    "gth": "growth",
+    "div": "idcw",
+    "dividend": "idcw",
+    "payout": "idcw",
+    "reinv": "reinvestment",
+    "reinvest": "reinvestment",
+    "govt": "government",
+    "mf": "",
+}
+_STOPWORDS = {"fund", "plan", "option", "scheme", "the", "of", "and", "mutual", "an", "open", "ended", "a"}
+
+
+def name_tokens(name: str) -> List[str]:
+    """Normalized, de-duplicated tokens of a scheme name"""
+    tokens = []
+    for token in _TOKEN_RE.findall(name.lower().replace("&", " and ")):
+        token = _SYNONYMS.get(token, token)
+        if token and token not in _STOPWORDS and token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+class SecurityIndex:
+    """In-memory token index over scheme names with IDF-weighted Jaccard scoring.
+
+    Each token maps to the array of schemes containing it, so scoring a name is a
+    handful of vectorized additions over one score array instead of a scan of
+    every scheme; rare tokens (fund house, strategy) dominate common ones
+    (direct, growth) through their IDF weight.
+    """
+
+    def __init__(self, securities: Sequence[Tuple[str, str, Sequence[str]]]):
+        import numpy as np
+
+        self.codes = [code for code, _, _ in securities]
+        self.names = [name for _, name, _ in securities]
+        self._exact: Dict[str, int] = {}
+        postings: Dict[str, List[int]] = {}
+        for i, (code, name, isins) in enumerate(securities):
+            for key in (code, *isins, " ".join(name_tokens(name))):
+                self._exact.setdefault(key.upper(), i)
+            for token in name_tokens(name):
+                postings.setdefault(token, []).append(i)
+
+        count = len(securities)
+        self._postings = {token: np.array(ids, dtype=np.int64) for token, ids in postings.items()}
+        self._idf = {token: math.log((count + 1) / (len(ids) + 1)) + 1 for token, ids in postings.items()}
+        # Tokens never seen in the master weigh as much as the rarest possible token
+        self._unknown_idf = math.log(count + 1) + 1
+        self._doc_weight = np.zeros(count)
+        for token, ids in self._postings.items():
+            self._doc_weight[ids] += self._idf[token]
+        self._vocabulary = sorted(self._postings)
+
+    def _expand(self, token: str) -> Optional[str]:
+        """Known token an abbreviation stands for ("pru" -> "prudential"), if unambiguous enough"""
+        if len(token) < 3:
+            return None
+        start = bisect.bisect_left(self._vocabulary, token)
+        candidates = []
+        for known in self._vocabulary[start:]:
+            if not known.startswith(token):
+                break
+            candidates.append(known)
+        # Prefer the most frequent expansion: abbreviations are of common words
+        return min(candidates, key=lambda known: self._idf[known], default=None)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _scores(self, query: str):
+        import numpy as np
+
+        scores = np.zeros(len(self.codes))
+        query_weight = 0.0
+        for token in name_tokens(query):
+            if token not in self._idf:
+                token = self._expand(token) or token
+            weight = self._idf.get(token, self._unknown_idf)
+            query_weight += weight
+            ids = self._postings.get(token)
+            if ids is not None:
+                scores[ids] += weight
+        union = query_weight + self._doc_weight - scores
+        return np.divide(scores, union, out=np.zeros_like(scores), where=union > 0)
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[int, float]]:
+        """Best matching schemes for a name, code or ISIN as (position, score) pairs"""
+        import numpy as np
+
+        if not self.codes:
+            return []
+        exact = self._exact.get(query.strip().upper())
+        if exact is None:
+            exact = self._exact.get(" ".join(name_tokens(query)).upper())
+        if exact is not None:
+            return [(exact, 1.0)]
+        scores = self._scores(query)
+        top = np.argsort(-scores, kind="stable")[:limit]
+        return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+
+    def match(self, query: str) -> Optional[Tuple[int, float]]:
+        best = self.search(query, limit=1)
+        if best and best[0][1] >= MIN_MATCH_SCORE:
+            return best[0]
+        return None
+
+
+class SecurityMasterService:
+    """Canonical scheme table plus a shared in-memory index for resolving parsed names.
+
+    The index is rebuilt when the securities table changes (checked at most once a
+    minute) and resolved names are kept in an LRU cache, so ingesting a statement
+    costs one dictionary lookup per distinct name in the common case.
+    """
+
+    def __init__(self):
+        self._index: Optional[SecurityIndex] = None
+        self._fingerprint: Optional[tuple] = None
+        self._checked_at = 0.0
+        self._resolved: "OrderedDict[str, SecurityMatch]" = OrderedDict()
+
+    async def get_index(self, session: AsyncSession) -> SecurityIndex:
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at < INDEX_REFRESH_SECONDS:
+            return self._index
+        self._checked_at = now
+
+        fingerprint = tuple((await session.execute(
+            select(func.count(), func.max(Security.updated_at))
+        )).one())
+        if self._index is None or fingerprint != self._fingerprint:
+            rows = (await session.execute(
+                select(Security.scheme_code, Security.name, Security.isin_growth, Security.isin_reinvestment)
+                .order_by(Security.scheme_code)
+            )).all()
+            self._index = SecurityIndex([
+                (row.scheme_code, row.name, [isin for isin in (row.isin_growth, row.isin_reinvestment) if isin])
+                for row in rows
+            ])
+            self._fingerprint = fingerprint
+            self._resolved.clear()
+            logger.info("security_index_built", securities=len(self._index))
+        return self._index
+
+    async def resolve_many(self, session: AsyncSession, names: Iterable[str]) -> Dict[str, SecurityMatch]:
+        """Map parsed security names (or codes / ISINs) to canonical schemes in bulk"""
+        index = await self.get_index(session)
+        matches: Dict[str, SecurityMatch] = {}
+        for name in dict.fromkeys(names):
+            cached = self._resolved.get(name)
+            if cached is not None:
+                self._resolved.move_to_end(name)
+                matches[name] = cached
+                continue
+
+            found = index.match(name)
+            match = SecurityMatch(query=name)
+            if found is not None:
+                position, score = found
+                match = SecurityMatch(
+                    query=name,
+                    scheme_code=index.codes[position],
+                    name=index.names[position],
+                    score=round(score, 4),
+                )
+            self._resolved[name] = match
+            matches[name] = match
+
+        while len(self._resolved) > RESOLVED_CACHE_SIZE:
+            self._resolved.popitem(last=False)
+        return matches
+
+    async def canonicalize(self, session: AsyncSession, rows: Sequence[ParsedRow]) -> List[ParsedRow]:
+        """Parsed rows with their symbol set to the canonical scheme code where one is known.
+
+        Rows with a symbol keep it unless it exactly names a known scheme (code, ISIN
+        or full name); rows without one are matched by security name.
+        """
+        symbols = await self.resolve_many(session, [row.security_symbol for row in rows if row.security_symbol])
+        names = await self.resolve_many(
+            session, [row.security_name for row in rows if not row.security_symbol and row.security_name]
+        )
+        resolved = []
+        for row in rows:
+            code = None
+            if row.security_symbol:
+                match = symbols[row.security_symbol]
+                if match.score >= EXACT_MATCH_SCORE:
+                    code = match.scheme_code
+            elif row.security_name:
+                code = names[row.security_name].scheme_code
+            resolved.append(replace(row, security_symbol=code) if code and code != row.security_symbol else row)
+        return resolved
+
+    async def search(self, session: AsyncSession, query: str, limit: int = 10) -> List[SecurityMatch]:
+        index = await self.get_index(session)
+        return [
+            SecurityMatch(query=query, scheme_code=index.codes[i], name=index.names[i], score=round(score, 4))
+            for i, score in index.search(query, limit)
+        ]
+
+    async def upsert_schemes(self, session: AsyncSession, schemes: Iterable[SchemeInfo]) -> int:
+        """Insert new schemes and refresh changed ones; returns the number written"""
+        schemes = list(schemes)
+        written = 0
+        for i in range(0, len(schemes), UPSERT_CHUNK_SIZE):
+            chunk = {scheme.scheme_code: scheme for scheme in schemes[i:i + UPSERT_CHUNK_SIZE]}
+            existing = {
+                security.scheme_code: security
+                for security in (await session.execute(
+                    select(Security).where(Security.scheme_code.in_(list(chunk)))
+                )).scalars()
+            }
+            for code, scheme in chunk.items():
+                values = {
+                    "name": scheme.name,
+                    "isin_growth": scheme.isins[0] if scheme.isins else None,
+                    "isin_reinvestment": scheme.isins[1] if len(scheme.isins) > 1 else None,
+                    "fund_house": scheme.fund_house,
+                    "category": scheme.category,
+                }
+                security = existing.get(code)
+                if security is None:
+                    session.add(Security(scheme_code=code, **values))
+                    written += 1
+                elif any(getattr(security, key) != value for key, value in values.items() if value is not None):
+                    for key, value in values.items():
+                        if value is not None:
+                            setattr(security, key, value)
+                    security.updated_at = datetime.utcnow()
+                    written += 1
+            await session.flush()
+        logger.info("security_master_updated", schemes=len(schemes), written=written)
+        return written
+
+    async def resolve_transactions(self, session: AsyncSession) -> Dict[str, int]:
+        """Backfill canonical scheme codes on stored transactions.
+
+        New statements are resolved as they are ingested; this catches rows stored
+        before that, or before the master knew their scheme. Missing symbols are
+        matched by name and symbols that exactly name a scheme (its ISIN, say) are
+        replaced by its code.
+        """
+        table = ParsedTransaction.__table__
+        now = datetime.utcnow()
+        result = await session.execute(
+            select(ParsedTransaction.security_name)
+            .where(ParsedTransaction.security_symbol.is_(None))
+            .where(ParsedTransaction.security_name.is_not(None))
+            .distinct()
+        )
+        names = list(result.scalars())
+        matches = await self.resolve_many(session, names)
+        params = [
+            {"match_name": name, "match_code": match.scheme_code}
+            for name, match in matches.items()
+            if match.scheme_code is not None
+        ]
+        if params:
+            stmt = (
+                update(table)
+                .where(table.c.security_symbol.is_(None))
+                .where(table.c.security_name == bindparam("match_name"))
+                .values(security_symbol=bindparam("match_code"), updated_at=now)
+            )
+            await session.execute(stmt, params)
+
+        symbols = list((await session.execute(
+            select(ParsedTransaction.security_symbol).where(ParsedTransaction.security_symbol.is_not(None)).distinct()
+        )).scalars())
+        renames = [
+            {"old_symbol": symbol, "new_symbol": match.scheme_code}
+            for symbol, match in (await self.resolve_many(session, symbols)).items()
+            if match.score >= EXACT_MATCH_SCORE and match.scheme_code != symbol
+        ]
+        if renames:
+            await session.execute(
+                update(table)
+                .where(table.c.security_symbol == bindparam("old_symbol"))
+                .values(security_symbol=bindparam("new_symbol"), updated_at=now),
+                renames,
+            )
+        stats = {"names": len(names), "resolved": len(params), "symbols": len(symbols), "normalized": len(renames)}
+        logger.info("transactions_resolved", **stats)
+        return stats
+
+
+security_master_service = SecurityMasterService()
+
+
+def get_security_master_service() -> SecurityMasterService:
+    return security_master_service
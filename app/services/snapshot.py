@@ -0,0 +1,248 @@
+import json
+import os
+import shutil
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.exceptions import NotFoundError
+from app.core.logging import get_logger
+from app.db.session import streaming_session
+from app.models.snapshot import SnapshotFile, SnapshotManifest
+from app.models.statement import ParsedTransaction
+from app.services.holdings import select_holdings
+from app.services.transaction import EXPORT_COLUMNS
+
+settings = get_settings()
+logger = get_logger("services.snapshot")
+
+TRANSACTION_COLUMNS = (ParsedTransaction.user_id,) + EXPORT_COLUMNS
+LATEST_POINTER = "LATEST"
+MANIFEST_NAME = "_manifest.json"
+
+
+def _transaction_schema(pa):
+    # Measures are float64: analytics consumers aggregate them, the primary keeps exact decimals
+    return pa.schema([
+        ("user_id", pa.string()),
+        ("id", pa.string()),
+        ("statement_id", pa.string()),
+        ("transaction_type", pa.string()),
+        ("transaction_date", pa.timestamp("us")),
+        ("security_name", pa.string()),
+        ("security_symbol", pa.string()),
+        ("quantity", pa.float64()),
+        ("price_per_unit", pa.float64()),
+        ("nav", pa.float64()),
+        ("amount", pa.float64()),
+        ("units", pa.float64()),
+        ("brokerage_charges", pa.float64()),
+        ("confidence_score", pa.float64()),
+        ("is_duplicate", pa.bool_()),
+        ("is_confirmed", pa.bool_()),
+    ])
+
+
+def _holdings_schema(pa):
+    return pa.schema([
+        ("user_id", pa.string()),
+        ("security_symbol", pa.string()),
+        ("security_name", pa.string()),
+        ("units", pa.float64()),
+        ("invested_amount", pa.float64()),
+        ("last_transaction_date", pa.timestamp("us")),
+    ])
+
+
+def _arrow_value(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _to_record_batch(pa, rows: Sequence[Row], schema):
+    columns = list(zip(*rows)) if rows else [() for _ in schema]
+    return pa.record_batch(
+        [
+            pa.array([_arrow_value(value) for value in column], type=field.type)
+            for column, field in zip(columns, schema)
+        ],
+        schema=schema,
+    )
+
+
+class _PartitionedParquetWriter:
+    """Appends record batches to one Parquet file per partition directory"""
+
+    def __init__(self, root: Path, dataset: str, schema):
+        import pyarrow.parquet as pq
+
+        self._pq = pq
+        self.root = root
+        self.dataset = dataset
+        self.schema = schema
+        self._writers: Dict[str, Any] = {}
+        self._rows: Dict[str, int] = {}
+
+    def write(self, partition: str, batch) -> None:
+        relative = f"{self.dataset}/{partition}/part-0.parquet" if partition else f"{self.dataset}/part-0.parquet"
+        writer = self._writers.get(relative)
+        if writer is None:
+            path = self.root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            writer = self._pq.ParquetWriter(path, self.schema, compression="zstd")
+            self._writers[relative] = writer
+            self._rows[relative] = 0
+        writer.write_batch(batch)
+        self._rows[relative] += batch.num_rows
+
+    def close(self) -> List[SnapshotFile]:
+        files = []
+        for relative, writer in self._writers.items():
+            writer.close()
+            files.append(SnapshotFile(
+                dataset=self.dataset,
+                path=relative,
+                rows=self._rows[relative],
+                size_bytes=(self.root / relative).stat().st_size,
+            ))
+        return files
+
+
+class SnapshotService:
+    """Writes columnar Parquet snapshots of transactions and holdings for analytics"""
+
+    def __init__(self, root: Path, batch_size: int, keep: int):
+        self.root = root
+        self.batch_size = batch_size
+        self.keep = max(1, keep)
+
+    def _scope_dir(self, user_id: Optional[str]) -> Path:
+        return self.root / "users" / user_id if user_id else self.root / "all"
+
+    async def _write_transactions(
+        self, session: AsyncSession, pa, pc, target: Path, user_id: Optional[str]
+    ) -> List[SnapshotFile]:
+        schema = _transaction_schema(pa)
+        writer = _PartitionedParquetWriter(target, "transactions", schema)
+        stmt = (
+            select(*TRANSACTION_COLUMNS)
+            .order_by(ParsedTransaction.transaction_date, ParsedTransaction.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+        if user_id is not None:
+            stmt = stmt.where(ParsedTransaction.user_id == user_id)
+
+        result = await session.stream(stmt)
+        async for rows in result.partitions():
+            batch = _to_record_batch(pa, rows, schema)
+            # Hive-style year partitions let consumers prune by transaction date
+            years = pc.year(batch.column("transaction_date"))
+            for year in pc.unique(years).to_pylist():
+                writer.write(f"year={year}", batch.filter(pc.equal(years, year)))
+        return writer.close()
+
+    async def _write_holdings(
+        self, session: AsyncSession, pa, target: Path, user_id: Optional[str]
+    ) -> List[SnapshotFile]:
+        schema = _holdings_schema(pa)
+        writer = _PartitionedParquetWriter(target, "holdings", schema)
+        result = await session.stream(select_holdings(user_id).execution_options(yield_per=self.batch_size))
+        async for rows in result.partitions():
+            writer.write("", _to_record_batch(pa, rows, schema))
+        return writer.close()
+
+    def _prune(self, scope_dir: Path) -> List[str]:
+        """Delete all but the newest published snapshots of a scope"""
+        # Snapshot ids are UTC timestamps, so name order is age order
+        published = sorted(
+            path.name for path in scope_dir.iterdir() if path.is_dir() and not path.name.startswith(".")
+        )
+        pruned = published[:-self.keep]
+        for snapshot_id in pruned:
+            shutil.rmtree(scope_dir / snapshot_id, ignore_errors=True)
+        return pruned
+
+    async def create_snapshot(self, user_id: Optional[str] = None) -> SnapshotManifest:
+        """Export a consistent snapshot and publish it as the latest for its scope"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        created_at = datetime.utcnow()
+        snapshot_id = created_at.strftime("%Y%m%dT%H%M%S%fZ")
+        scope_dir = self._scope_dir(user_id)
+        staging = scope_dir / f".tmp-{snapshot_id}"
+        staging.mkdir(parents=True, exist_ok=True)
+
+        try:
+            # One repeatable-read transaction, so holdings agree with the transactions exported
+            async with streaming_session(repeatable_read=True) as session:
+                transaction_files = await self._write_transactions(session, pa, pc, staging, user_id)
+                holding_files = await self._write_holdings(session, pa, staging, user_id)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        manifest = SnapshotManifest(
+            snapshot_id=snapshot_id,
+            created_at=created_at,
+            user_id=user_id,
+            transaction_rows=sum(f.rows for f in transaction_files),
+            holding_rows=sum(f.rows for f in holding_files),
+            files=transaction_files + holding_files,
+        )
+        (staging / MANIFEST_NAME).write_text(manifest.model_dump_json(indent=2))
+
+        # Readers only ever see complete snapshots: rename the directory, then swap the pointer
+        os.rename(staging, scope_dir / snapshot_id)
+        pointer_tmp = scope_dir / f".{LATEST_POINTER}.tmp"
+        pointer_tmp.write_text(snapshot_id)
+        os.replace(pointer_tmp, scope_dir / LATEST_POINTER)
+        pruned = self._prune(scope_dir)
+
+        logger.info(
+            "snapshot_created",
+            snapshot_id=snapshot_id,
+            user_id=user_id,
+            transaction_rows=manifest.transaction_rows,
+            holding_rows=manifest.holding_rows,
+            pruned=len(pruned),
+        )
+        return manifest
+
+    def get_latest_manifest(self, user_id: Optional[str] = None) -> SnapshotManifest:
+        scope_dir = self._scope_dir(user_id)
+        try:
+            snapshot_id = (scope_dir / LATEST_POINTER).read_text().strip()
+            data = json.loads((scope_dir / snapshot_id / MANIFEST_NAME).read_text())
+        except FileNotFoundError:
+            raise NotFoundError("No snapshot has been exported yet")
+        return SnapshotManifest(**data)
+
+    def resolve_file(self, snapshot_id: str, relative_path: str, user_id: Optional[str] = None) -> Path:
+        """Path of a file inside a published snapshot, rejecting anything outside it"""
+        snapshot_dir = (self._scope_dir(user_id) / snapshot_id).resolve()
+        path = (snapshot_dir / relative_path).resolve()
+        if (
+            snapshot_id.startswith(".")
+            or snapshot_dir.parent != self._scope_dir(user_id).resolve()
+            or snapshot_dir not in path.parents
+            or not path.is_file()
+        ):
+            raise NotFoundError("Snapshot file not found")
+        return path
+
+
+def get_snapshot_service() -> SnapshotService:
+    return SnapshotService(Path(settings.snapshot_dir), settings.export_batch_size, settings.snapshot_keep)
@@ -0,0 +1,225 @@
+from datetime import datetime
+from typing import List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Row, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import NotFoundError, ValidationError
+from app.core.logging import get_logger
+from app.db.locks import lock_for_transaction
+from app.db.session import async_session_factory
+from app.models.review import ConfirmStatementResponse
+from app.models.statement import ParsedTransaction, Statement, StatementFile
+from app.services.file_store import FileStore, file_lock, get_file_store
+from app.services.pdf_extract import PdfExtractionService, ProgressCallback, get_pdf_extraction_service
+from app.services.pdf_unlock import PasswordHints, PdfUnlockService, get_pdf_unlock_service
+from app.services.performance import PerformanceService, get_performance_service
+
+logger = get_logger("services.statement")
+
+
+class StatementService:
+    """Service for statement review and confirmation"""
+
+    def __init__(
+        self,
+        performance_service: PerformanceService,
+        file_store: FileStore,
+        extraction_service: PdfExtractionService,
+        unlock_service: PdfUnlockService,
+    ):
+        self.performance_service = performance_service
+        self.file_store = file_store
+        self.extraction_service = extraction_service
+        self.unlock_service = unlock_service
+
+    async def attach_file(
+        self,
+        session: AsyncSession,
+        statement_id: UUID,
+        path: str,
+        file_name: Optional[str] = None,
+    ) -> StatementFile:
+        """Put an uploaded file in the file store and record it against its statement.
+
+        The object's lock is held until the caller commits, so the upload sweeper
+        cannot delete a deduplicated object between this check and the new row
+        becoming visible as a reference.
+        """
+        stored = await self.file_store.put_file(path, file_name)
+        await lock_for_transaction(session, [file_lock(stored.key)])
+        if not await self.file_store.exists(stored.key):
+            # Reclaimed by a sweep that finished before the lock was taken
+            stored = await self.file_store.put_file(path, file_name)
+        statement_file = StatementFile(
+            statement_id=statement_id,
+            local_file_path=stored.location,
+            file_hash=stored.key,
+            codec=stored.codec,
+        )
+        session.add(statement_file)
+        await session.flush()
+        return statement_file
+
+    async def extract_text(
+        self,
+        statement_id: UUID,
+        hints: Optional[PasswordHints] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> List[str]:
+        """Text of a statement file: one entry per page for PDFs, the whole file otherwise.
+
+        PDF text comes from the page cache when present, else the stored file is
+        decrypted and extracted. Extraction can take minutes, so it uses short sessions
+        of its own rather than holding a pooled connection in the caller's transaction.
+        """
+        async with async_session_factory() as session:
+            row = (await session.execute(
+                select(
+                    Statement.user_id,
+                    Statement.statement_type,
+                    Statement.file_name,
+                    StatementFile.file_hash,
+                    StatementFile.codec,
+                )
+                .join(StatementFile, StatementFile.statement_id == Statement.id)
+                .where(Statement.id == statement_id)
+            )).one_or_none()
+        if row is None:
+            raise NotFoundError("Statement file not found")
+
+        if not row.file_name.lower().endswith(".pdf"):
+            content = b"".join([chunk async for chunk in self.file_store.open(row.file_hash, row.codec)])
+            return [content.decode("utf-8-sig", errors="replace")]
+
+        cached = await self.extraction_service.cached_pages(row.file_hash)
+        if cached is not None:
+            if on_progress is not None:
+                await on_progress(len(cached), len(cached))
+            return cached
+        async with self.file_store.local_copy(row.file_hash, row.codec) as path:
+            password = await self.unlock_service.unlock(
+                path, row.user_id, row.statement_type, hints or PasswordHints()
+            )
+            return await self.extraction_service.extract(path, row.file_hash, password, on_progress)
+
+    async def get_file(self, session: AsyncSession, statement_id: UUID, user_id: str) -> Row:
+        """Stored file of a user's statement with its original name"""
+        row = (await session.execute(
+            select(
+                Statement.file_name,
+                StatementFile.file_hash,
+                StatementFile.codec,
+                StatementFile.local_file_path,
+            )
+            .join(StatementFile, StatementFile.statement_id == Statement.id)
+            .where(Statement.id == statement_id)
+            .where(Statement.user_id == user_id)
+        )).one_or_none()
+        if row is None:
+            raise NotFoundError("Statement file not found")
+        return row
+
+    async def confirm(
+        self,
+        session: AsyncSession,
+        statement_id: UUID,
+        user_id: Optional[str] = None,
+        excluded_transaction_ids: Sequence[UUID] = (),
+    ) -> ConfirmStatementResponse:
+        """Confirm a statement and its transactions in the caller's transaction.
+
+        Runs one UPDATE for the statement and one per confirmed/excluded set of
+        transactions, whatever their number, then marks the owner's performance
+        series stale from the earliest confirmed date.
+        """
+        now = datetime.utcnow()
+        stmt = (
+            update(Statement)
+            .where(Statement.id == statement_id)
+            .where(Statement.confirmed_at.is_(None))
+            .values(confirmed_at=now, updated_at=now)
+            .returning(Statement.user_id)
+        )
+        if user_id is not None:
+            stmt = stmt.where(Statement.user_id == user_id)
+        owner = (await session.execute(stmt)).scalar_one_or_none()
+        if owner is None:
+            exists = select(Statement.id).where(Statement.id == statement_id)
+            if user_id is not None:
+                exists = exists.where(Statement.user_id == user_id)
+            if await session.scalar(exists) is None:
+                raise NotFoundError("Statement not found")
+            raise ValidationError("Statement is already confirmed")
+
+        transactions = ParsedTransaction.statement_id == statement_id
+        excluded = ParsedTransaction.id.in_(list(excluded_transaction_ids))
+        confirmed = await session.execute(
+            update(ParsedTransaction)
+            .where(transactions, ~excluded)
+            .values(is_confirmed=True, updated_at=now)
+        )
+        rejected = 0
+        if excluded_transaction_ids:
+            result = await session.execute(
+                update(ParsedTransaction)
+                .where(transactions, excluded)
+                .values(is_confirmed=False, updated_at=now)
+            )
+            rejected = result.rowcount
+
+        earliest = await session.scalar(
+            select(func.min(ParsedTransaction.transaction_date)).where(transactions, ~excluded)
+        )
+        if earliest is not None:
+            await self.performance_service.invalidate(session, owner, earliest.date())
+
+        logger.info(
+            "statement_confirmed",
+            statement_id=str(statement_id),
+            confirmed=confirmed.rowcount,
+            excluded=rejected,
+        )
+        return ConfirmStatementResponse(
+            statement_id=statement_id,
+            user_id=owner,
+            confirmed_at=now,
+            confirmed_transactions=confirmed.rowcount,
+            excluded_transactions=rejected,
+            earliest_transaction_date=earliest.date() if earliest else None,
+        )
+
+    async def list_for_review(self, session: AsyncSession, user_id: str, limit: int = 50) -> List[Row]:
+        """Unconfirmed statements of a user, least confident first"""
+        transactions = (
+            select(func.count())
+            .where(ParsedTransaction.statement_id == Statement.id)
+            .scalar_subquery()
+        )
+        result = await session.execute(
+            select(
+                Statement.id,
+                Statement.file_name,
+                Statement.statement_type,
+                Statement.statement_date,
+                Statement.folio_number,
+                Statement.parsing_confidence,
+                Statement.created_at,
+                transactions.label("transaction_count"),
+            )
+            .where(Statement.user_id == user_id)
+            .where(Statement.confirmed_at.is_(None))
+            .order_by(Statement.parsing_confidence.asc().nulls_first(), Statement.created_at)
+            .limit(limit)
+        )
+        return list(result.all())
+
+
+def get_statement_service() -> StatementService:
+    return StatementService(
+        get_performance_service(),
+        get_file_store(),
+        get_pdf_extraction_service(),
+        get_pdf_unlock_service(),
+    )
@@ -0,0 +1,62 @@
+from dataclasses import dataclass, fields
+from datetime import datetime
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.exceptions import ValidationError
+from app.models.enums import StatementType, TransactionType
+
+
+@dataclass(frozen=True)
+class ParsedRow:
+    """One transaction as read from a statement, before it becomes a ParsedTransaction"""
+
+    transaction_type: TransactionType
+    transaction_date: datetime
+    security_name: Optional[str] = None
+    security_symbol: Optional[str] = None
+    quantity: Optional[Decimal] = None
+    price_per_unit: Optional[Decimal] = None
+    nav: Optional[Decimal] = None
+    amount: Optional[Decimal] = None
+    units: Optional[Decimal] = None
+    brokerage_charges: Optional[Decimal] = None
+
+    def values(self) -> Dict[str, object]:
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+    @property
+    def identity(self) -> Tuple:
+        """What makes two versions of a row "the same transaction" across parser versions"""
+        return (
+            self.transaction_date.date(),
+            self.transaction_type,
+            self.security_symbol or self.security_name,
+        )
+
+
+# A parser turns the text of a statement file (one entry per PDF page, or the whole
+# file for text formats) into transactions
+StatementParser = Callable[[List[str]], List[ParsedRow]]
+
+PARSED_FIELDS = [field.name for field in fields(ParsedRow)]
+
+_parsers: Dict[StatementType, Tuple[StatementParser, int]] = {}
+
+
+def register_parser(statement_type: StatementType, version: int = 1) -> Callable[[StatementParser], StatementParser]:
+    """Register the parser for a statement type; bump `version` when its output changes"""
+
+    def decorator(parser: StatementParser) -> StatementParser:
+        _parsers[statement_type] = (parser, version)
+        return parser
+
+    return decorator
+
+
+def get_parser(statement_type: StatementType) -> Tuple[StatementParser, int]:
+    """Parser and parser version for a statement type"""
+    try:
+        return _parsers[statement_type]
+    except KeyError:
+        raise ValidationError(f"No parser is registered for {statement_type.value} statements")
@@ -0,0 +1,94 @@
+from typing import AsyncIterator, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Row, lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from app.models.statement import ParsedTransaction
+
+
+def select_transaction(user_id: str, transaction_id: UUID) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(ParsedTransaction).where(
+            ParsedTransaction.id == transaction_id,
+            ParsedTransaction.user_id == user_id,
+        )
+    )
+
+
+def select_user_transactions(user_id: str, limit: int, offset: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(ParsedTransaction)
+        .where(ParsedTransaction.user_id == user_id)
+        .order_by(ParsedTransaction.transaction_date.desc(), ParsedTransaction.id)
+        .limit(limit)
+        .offset(offset)
+    )
+
+
+# Columns included in exports, in output order
+EXPORT_COLUMNS = (
+    ParsedTransaction.id,
+    ParsedTransaction.statement_id,
+    ParsedTransaction.transaction_type,
+    ParsedTransaction.transaction_date,
+    ParsedTransaction.security_name,
+    ParsedTransaction.security_symbol,
+    ParsedTransaction.quantity,
+    ParsedTransaction.price_per_unit,
+    ParsedTransaction.nav,
+    ParsedTransaction.amount,
+    ParsedTransaction.units,
+    ParsedTransaction.brokerage_charges,
+    ParsedTransaction.confidence_score,
+    ParsedTransaction.is_duplicate,
+    ParsedTransaction.is_confirmed,
+)
+
+
+class TransactionService:
+    """Service for reading parsed transactions"""
+
+    async def get_transaction(
+        self,
+        session: AsyncSession,
+        user_id: str,
+        transaction_id: UUID,
+    ) -> Optional[ParsedTransaction]:
+        """Get a single transaction owned by the user"""
+        result = await session.execute(select_transaction(user_id, transaction_id))
+        return result.scalar_one_or_none()
+
+    async def list_transactions(
+        self,
+        session: AsyncSession,
+        user_id: str,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[ParsedTransaction]:
+        """List a user's transactions, most recent first"""
+        result = await session.execute(select_user_transactions(user_id, limit, offset))
+        return list(result.scalars().all())
+
+
+    async def stream_transaction_batches(
+        self,
+        session: AsyncSession,
+        user_id: str,
+        batch_size: int,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Yield a user's full history in batches from a server-side cursor"""
+        stmt = (
+            select(*EXPORT_COLUMNS)
+            .where(ParsedTransaction.user_id == user_id)
+            .order_by(ParsedTransaction.transaction_date, ParsedTransaction.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await session.stream(stmt)
+        async for batch in result.partitions():
+            yield batch
+
+
+def get_transaction_service() -> TransactionService:
+    return TransactionService()
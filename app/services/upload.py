@@ -0,0 +1,140 @@
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, Optional
+from uuid import UUID
+
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.exceptions import BaseAPIException, ValidationError
+from app.core.logging import get_logger
+from app.db.session import async_session_factory
+from app.models.enums import StatementType, UploadSessionStatus
+from app.models.statement import ParsedTransaction, Statement, UploadSession
+from app.models.upload import UploadResponse
+from app.services.admission import ParseSlot
+from app.services.confidence import ConfidenceService, get_confidence_service
+from app.services.pdf_unlock import PasswordHints
+from app.services.progress import UploadProgressBroker, get_upload_progress
+from app.services.security_master import SecurityMasterService, get_security_master_service
+from app.services.statement import StatementService, get_statement_service
+from app.services.statement_parsers import get_parser
+
+settings = get_settings()
+logger = get_logger("services.upload")
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def save_upload(source: BinaryIO, path: str, max_bytes: int) -> int:
+    """Copy an uploaded file to disk, refusing files over the size limit"""
+    size = 0
+    with open(path, "wb") as target:
+        while chunk := source.read(COPY_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                raise ValidationError(f"Statement file is larger than {max_bytes // (1024 * 1024)} MB")
+            target.write(chunk)
+    return size
+
+
+class UploadService:
+    """Statement uploads: stores the file, then extracts, parses and scores it in the background"""
+
+    def __init__(
+        self,
+        statement_service: StatementService,
+        confidence_service: ConfidenceService,
+        security_master: SecurityMasterService,
+        progress: UploadProgressBroker,
+        max_bytes: int,
+        session_ttl: timedelta,
+    ):
+        self.statement_service = statement_service
+        self.confidence_service = confidence_service
+        self.security_master = security_master
+        self.progress = progress
+        self.max_bytes = max_bytes
+        self.session_ttl = session_ttl
+
+    async def create(
+        self, session: AsyncSession, user_id: str, file: UploadFile, statement_type: StatementType
+    ) -> UploadResponse:
+        """Record an upload session and statement for a file and put the file in the store"""
+        file_name = Path(file.filename or "statement").name
+        fd, temp = tempfile.mkstemp(suffix=Path(file_name).suffix)
+        os.close(fd)
+        try:
+            size = await asyncio.to_thread(save_upload, file.file, temp, self.max_bytes)
+            if not size:
+                raise ValidationError("Statement file is empty")
+            upload = UploadSession(
+                user_id=user_id,
+                statement_type=statement_type,
+                expires_at=datetime.utcnow() + self.session_ttl,
+            )
+            statement = Statement(
+                upload_session_id=upload.id,
+                user_id=user_id,
+                file_name=file_name,
+                file_size_bytes=size,
+                statement_type=statement_type,
+            )
+            session.add_all([upload, statement])
+            await session.flush()
+            await self.statement_service.attach_file(session, statement.id, temp, file_name)
+        finally:
+            os.unlink(temp)
+        logger.info("statement_uploaded", upload_session_id=str(upload.id), user_id=user_id, size=size)
+        return UploadResponse(upload_session_id=upload.id, statement_id=statement.id, status=upload.status)
+
+    async def process(
+        self, upload_session_id: UUID, statement_id: UUID, hints: PasswordHints, slot: Optional[ParseSlot] = None
+    ) -> None:
+        """Extract, parse and score an uploaded statement, announcing each step"""
+        try:
+            async with async_session_factory() as session:
+                await self.progress.transition(session, upload_session_id, UploadSessionStatus.PROCESSING)
+                await session.commit()
+
+                text = await self.statement_service.extract_text(
+                    statement_id, hints, self.progress.page_reporter(upload_session_id)
+                )
+                statement = await session.get(Statement, statement_id)
+                parser, _ = get_parser(statement.statement_type)
+                rows = await asyncio.to_thread(parser, text)
+                rows = await self.security_master.canonicalize(session, rows)
+                session.add_all([
+                    ParsedTransaction(statement_id=statement.id, user_id=statement.user_id, **row.values())
+                    for row in rows
+                ])
+                await session.flush()
+                await self.progress.report(upload_session_id, transactions_parsed=len(rows))
+
+                await self.confidence_service.score_statement(session, statement)
+                await self.progress.transition(session, upload_session_id, UploadSessionStatus.COMPLETED)
+                await session.commit()
+        except Exception as e:
+            detail = e.detail if isinstance(e, BaseAPIException) else "Statement could not be processed"
+            logger.warning("statement_processing_failed", upload_session_id=str(upload_session_id), error=str(e))
+            async with async_session_factory() as session:
+                await self.progress.transition(session, upload_session_id, UploadSessionStatus.FAILED, detail)
+                await session.commit()
+        finally:
+            if slot is not None:
+                slot.release()
+
+
+def get_upload_service() -> UploadService:
+    return UploadService(
+        get_statement_service(),
+        get_confidence_service(),
+        get_security_master_service(),
+        get_upload_progress(),
+        settings.upload_max_bytes,
+        timedelta(hours=settings.upload_session_ttl_hours),
+    )
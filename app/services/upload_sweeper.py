@@ -0,0 +1,201 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.locks import lock_for_transaction, try_exclusive
+from app.db.session import async_session_factory
+from app.models.enums import UploadSessionStatus
+from app.models.statement import Statement, StatementFile, UploadSession
+from app.models.upload import UploadSweepResult
+from app.services.file_store import FileStore, file_lock, get_file_store
+
+settings = get_settings()
+logger = get_logger("services.upload_sweeper")
+
+# Sessions in these states are abandoned once past expires_at; completed ones are kept
+EXPIRABLE_STATUSES = (
+    UploadSessionStatus.PENDING,
+    UploadSessionStatus.PROCESSING,
+    UploadSessionStatus.FAILED,
+)
+
+
+def _remove_file(path: str) -> Optional[int]:
+    """Delete a file and return its size, or None if it was already gone"""
+    try:
+        size = os.stat(path).st_size
+        os.unlink(path)
+    except FileNotFoundError:
+        return None
+    return size
+
+
+class UploadSweeper:
+    """Expires abandoned upload sessions and reclaims the files of their unconfirmed statements.
+
+    Work is done in batches of `batch_size` rows, each committed on its own so a large
+    backlog never holds one long transaction, and file deletions run in worker threads
+    with at most `file_concurrency` in flight.
+    """
+
+    def __init__(self, file_store: FileStore, batch_size: int, file_concurrency: int, interval_seconds: float):
+        self.file_store = file_store
+        self.batch_size = batch_size
+        self.file_concurrency = file_concurrency
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def _session(self, conn: Optional[AsyncConnection]) -> AsyncSession:
+        return async_session_factory(bind=conn) if conn is not None else async_session_factory()
+
+    async def expire_sessions(self, now: Optional[datetime] = None, conn: Optional[AsyncConnection] = None) -> int:
+        """Mark sessions past their expiry as expired; returns how many were marked"""
+        now = now or datetime.utcnow()
+        expired = 0
+        while True:
+            async with self._session(conn) as session:
+                ids = list((await session.execute(
+                    select(UploadSession.id)
+                    .where(UploadSession.expires_at < now)
+                    .where(UploadSession.status.in_(EXPIRABLE_STATUSES))
+                    .limit(self.batch_size)
+                )).scalars())
+                if not ids:
+                    return expired
+                await session.execute(
+                    update(UploadSession)
+                    .where(UploadSession.id.in_(ids))
+                    .values(status=UploadSessionStatus.EXPIRED, updated_at=now)
+                )
+                await session.commit()
+            expired += len(ids)
+
+    async def _delete_files(self, files: Dict[str, str], result: UploadSweepResult) -> List[str]:
+        """Delete no longer referenced files by hash; returns the hashes whose file is gone"""
+        semaphore = asyncio.Semaphore(self.file_concurrency)
+
+        async def remove(file_hash: str, path: str) -> Optional[str]:
+            async with semaphore:
+                try:
+                    if self.file_store.owns(path):
+                        size = await self.file_store.delete(file_hash)
+                    else:
+                        # Stored before the content-addressed store existed
+                        size = await asyncio.to_thread(_remove_file, path)
+                except OSError as e:
+                    result.files_failed += 1
+                    logger.warning("upload_file_delete_failed", path=path, error=str(e))
+                    return None
+            if size is None:
+                result.files_missing += 1
+            else:
+                result.files_deleted += 1
+                result.bytes_reclaimed += size
+            return file_hash
+
+        removed = await asyncio.gather(*(remove(file_hash, path) for file_hash, path in files.items()))
+        return [file_hash for file_hash in removed if file_hash is not None]
+
+    async def reclaim_files(self, result: UploadSweepResult, conn: Optional[AsyncConnection] = None) -> None:
+        """Delete the stored files of unconfirmed statements in expired sessions, and their rows.
+
+        Identical uploads share one stored object, so a file is only deleted once no
+        StatementFile row outside the batch still refers to its hash. The check and the
+        deletion happen under the objects' locks, which uploads take before adding a
+        reference, so a concurrent upload of the same content either becomes visible
+        to the check or stores the content again after the deletion.
+        """
+        # Rows whose file could not be deleted are skipped so the next batch makes progress;
+        # they are retried on the next sweep
+        failed: List[UUID] = []
+        while True:
+            async with self._session(conn) as session:
+                stmt = (
+                    select(StatementFile.id, StatementFile.file_hash, StatementFile.local_file_path)
+                    .join(Statement, Statement.id == StatementFile.statement_id)
+                    .join(UploadSession, UploadSession.id == Statement.upload_session_id)
+                    .where(UploadSession.status == UploadSessionStatus.EXPIRED)
+                    .where(Statement.confirmed_at.is_(None))
+                    .limit(self.batch_size)
+                )
+                if failed:
+                    stmt = stmt.where(StatementFile.id.not_in(failed))
+                rows = (await session.execute(stmt)).all()
+                if not rows:
+                    return
+                ids = [row.id for row in rows]
+                await lock_for_transaction(session, [file_lock(row.file_hash) for row in rows])
+                shared = set((await session.execute(
+                    select(StatementFile.file_hash)
+                    .where(StatementFile.file_hash.in_({row.file_hash for row in rows}))
+                    .where(StatementFile.id.not_in(ids))
+                )).scalars())
+                files = {row.file_hash: row.local_file_path for row in rows if row.file_hash not in shared}
+                removed = set(await self._delete_files(files, result))
+                done = [row.id for row in rows if row.file_hash in shared or row.file_hash in removed]
+                if done:
+                    await session.execute(delete(StatementFile).where(StatementFile.id.in_(done)))
+                    await session.commit()
+            failed.extend(set(ids) - set(done))
+
+    async def sweep(self) -> UploadSweepResult:
+        """Run one full sweep, unless another worker or host is running one.
+
+        The whole sweep runs on the connection holding the sweep lock, so it takes a
+        single pooled connection and gives it back when done.
+        """
+        result = UploadSweepResult()
+        async with try_exclusive("upload_sweeper") as conn:
+            if conn is None:
+                logger.info("upload_sweep_skipped", reason="running elsewhere")
+                return result
+            result.expired_sessions = await self.expire_sessions(conn=conn)
+            await self.reclaim_files(result, conn)
+        logger.info("upload_sweep_completed", **result.model_dump())
+        return result
+
+    async def _run_forever(self) -> None:
+        # Every worker tries each interval; whichever gets the sweep lock first sweeps
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("upload_sweep_failed", error=str(e))
+
+    async def start(self) -> None:
+        """Sweep periodically in the background; disabled when the interval is zero"""
+        if self._task is not None or self.interval_seconds <= 0 or async_session_factory is None:
+            return
+        self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+upload_sweeper = UploadSweeper(
+    file_store=get_file_store(),
+    batch_size=settings.upload_sweep_batch_size,
+    file_concurrency=settings.upload_sweep_file_concurrency,
+    interval_seconds=settings.upload_sweep_interval_seconds,
+)
+
+
+def get_upload_sweeper() -> UploadSweeper:
+    return upload_sweeper
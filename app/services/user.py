@@ -1,25 +1,36 @@
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from app.core.exceptions import AuthenticationError, NotFoundError
 from app.core.password import hash_password, verify_password
 from app.models.user import User
 
 
+# Hot-path lookups are lambda statements: SQLAlchemy caches the constructed statement
+# and its compiled form keyed on the lambda's code, so each call only binds parameters
+def select_user_by_id(user_id: UUID) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.id == user_id))
+
+
+def select_user_by_email(email: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.email == email))
+
+
 class UserService:
     """Service for user management and authentication"""
     
     async def get_user_by_id(self, session: AsyncSession, user_id: UUID) -> Optional[User]:
         """Get user by ID"""
-        result = await session.execute(select(User).where(User.id == user_id))
+        result = await session.execute(select_user_by_id(user_id))
         return result.scalar_one_or_none()
     
     async def get_user_by_email(self, session: AsyncSession, email: str) -> Optional[User]:
         """Get user by email"""
-        result = await session.execute(select(User).where(User.email == email))
+        result = await session.execute(select_user_by_email(email))
         return result.scalar_one_or_none()
     
     async def create_user(
@@ -0,0 +1,172 @@
+import time
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.session import async_session_factory, streaming_session
+from app.models.statement import ParsedTransaction
+from app.models.valuation import HoldingValuation, PortfolioValuation, PortfolioValuationResponse
+from app.services.holdings import select_holdings
+from app.services.price_store import PriceStore, get_price_store
+
+settings = get_settings()
+logger = get_logger("services.valuation")
+
+
+class ValuationService:
+    """Values portfolios by joining holdings to the price store as whole arrays"""
+
+    def __init__(self, price_store: PriceStore, batch_size: int):
+        self.price_store = price_store
+        self.batch_size = batch_size
+
+    def value_holdings(
+        self,
+        rows: Sequence[Row],
+        as_of: date,
+        include_holdings: bool = False,
+    ) -> List[PortfolioValuationResponse]:
+        """Value holdings rows of any number of users with one price lookup and per-user sums"""
+        import numpy as np
+
+        rows = [row for row in rows if row.units]
+        if not rows:
+            return []
+
+        user_ids, user_index = np.unique([row.user_id for row in rows], return_inverse=True)
+        units = np.array([row.units for row in rows], dtype=np.float64)
+        invested = np.array([row.invested_amount for row in rows], dtype=np.float64)
+        navs = self.price_store.get_prices([row.security_symbol for row in rows], as_of)
+
+        priced = ~np.isnan(navs)
+        market_values = np.where(priced, units * navs, 0.0)
+        users = len(user_ids)
+        totals = np.bincount(user_index, weights=market_values, minlength=users)
+        invested_totals = np.bincount(user_index, weights=invested, minlength=users)
+        counts = np.bincount(user_index, minlength=users)
+        unpriced = np.bincount(user_index, weights=~priced, minlength=users)
+
+        details: Dict[int, List[HoldingValuation]] = {}
+        if include_holdings:
+            for i, row in enumerate(rows):
+                details.setdefault(int(user_index[i]), []).append(HoldingValuation(
+                    security_symbol=row.security_symbol,
+                    security_name=row.security_name,
+                    units=float(units[i]),
+                    invested_amount=float(invested[i]),
+                    nav=float(navs[i]) if priced[i] else None,
+                    market_value=float(market_values[i]) if priced[i] else None,
+                ))
+
+        return [
+            PortfolioValuationResponse(
+                user_id=str(user_id),
+                as_of=as_of,
+                market_value=round(float(totals[i]), 2),
+                invested_amount=round(float(invested_totals[i]), 2),
+                holdings_count=int(counts[i]),
+                unpriced_holdings=int(unpriced[i]),
+                holdings=details.get(i, []) if include_holdings else None,
+            )
+            for i, user_id in enumerate(user_ids)
+        ]
+
+    def resolve_as_of(self, as_of: Optional[date]) -> date:
+        """Default valuation date: the latest NAV date in the store"""
+        return as_of or self.price_store.end_date or date.today()
+
+    async def value_portfolios(
+        self,
+        session: AsyncSession,
+        user_ids: Sequence[str],
+        as_of: date,
+        include_holdings: bool = False,
+    ) -> List[PortfolioValuationResponse]:
+        """Value the given users' portfolios with a single holdings query"""
+        stmt = select_holdings(as_of=as_of).where(ParsedTransaction.user_id.in_(user_ids))
+        result = await session.execute(stmt)
+        valuations = {v.user_id: v for v in self.value_holdings(result.all(), as_of, include_holdings)}
+        # Users without holdings are still reported, with a zero value
+        return [
+            valuations.get(user_id) or PortfolioValuationResponse(
+                user_id=user_id,
+                as_of=as_of,
+                market_value=0.0,
+                invested_amount=0.0,
+                holdings_count=0,
+                unpriced_holdings=0,
+                holdings=[] if include_holdings else None,
+            )
+            for user_id in user_ids
+        ]
+
+    async def _save(self, valuations: List[PortfolioValuationResponse], as_of: date) -> None:
+        async with async_session_factory() as session:
+            await session.execute(
+                delete(PortfolioValuation)
+                .where(PortfolioValuation.as_of_date == as_of)
+                .where(PortfolioValuation.user_id.in_([v.user_id for v in valuations]))
+            )
+            await session.execute(
+                insert(PortfolioValuation),
+                [
+                    {
+                        "user_id": v.user_id,
+                        "as_of_date": as_of,
+                        "market_value": v.market_value,
+                        "invested_amount": v.invested_amount,
+                        "holdings_count": v.holdings_count,
+                        "unpriced_holdings": v.unpriced_holdings,
+                    }
+                    for v in valuations
+                ],
+            )
+            await session.commit()
+
+    async def value_all(self, as_of: date) -> Dict[str, float]:
+        """Value every user's portfolio as of a date and store the results.
+
+        Holdings stream from a server-side cursor ordered by user and each partition
+        is valued as one array operation. The trailing user of a partition is carried
+        into the next one so no portfolio is split. Results are written in batches
+        once the cursor is closed, so the read transaction never waits on writes.
+        """
+        started = time.perf_counter()
+        valuations: List[PortfolioValuationResponse] = []
+        carry: List[Row] = []
+
+        async with streaming_session() as session:
+            result = await session.stream(
+                select_holdings(as_of=as_of).execution_options(yield_per=self.batch_size)
+            )
+            async for rows in result.partitions():
+                rows = carry + list(rows)
+                last_user = rows[-1].user_id
+                split = len(rows)
+                while split and rows[split - 1].user_id == last_user:
+                    split -= 1
+                carry = rows[split:]
+                valuations.extend(self.value_holdings(rows[:split], as_of))
+        valuations.extend(self.value_holdings(carry, as_of))
+
+        for i in range(0, len(valuations), self.batch_size):
+            await self._save(valuations[i:i + self.batch_size], as_of)
+        users = len(valuations)
+
+        elapsed = time.perf_counter() - started
+        stats = {
+            "users": users,
+            "seconds": round(elapsed, 3),
+            "users_per_second": round(users / elapsed, 1) if elapsed else 0.0,
+        }
+        logger.info("portfolios_valued", as_of=as_of.isoformat(), **stats)
+        return stats
+
+
+def get_valuation_service() -> ValuationService:
+    return ValuationService(get_price_store(), settings.export_batch_size)
@@ -0,0 +1,114 @@
+"""Import-time profile of the API entry point.
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter, summarises
+total startup import time and the slowest packages, and fails if any module that
+must stay lazy (boto3, PDF/NumPy/Arrow stacks) was imported at startup:
+
+    python -m benchmarks.import_time --top 15 --output import_time.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List
+
+# Heavy optional stacks that must only be imported on first use
+LAZY_MODULES = [
+    "boto3",
+    "botocore",
+    "numpy",
+    "pyarrow",
+    "pandas",
+    "pypdf",
+    "pdfplumber",
+    "fitz",
+    "zstandard",
+]
+
+
+def profile_imports(target: str, runs: int) -> List[Dict[str, Any]]:
+    """Return per-module (self_us, cumulative_us) from the fastest of `runs` cold imports"""
+    best: List[Dict[str, Any]] = []
+    best_total = None
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            raise SystemExit(completed.stderr.strip().splitlines()[-1])
+
+        modules = []
+        for line in completed.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            modules.append({
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            })
+
+        total = sum(m["self_us"] for m in modules)
+        if best_total is None or total < best_total:
+            best, best_total = modules, total
+    return best
+
+
+def summarise(modules: List[Dict[str, Any]], target: str, top: int) -> Dict[str, Any]:
+    by_package: Dict[str, int] = defaultdict(int)
+    for m in modules:
+        by_package[m["module"].split(".")[0]] += m["self_us"]
+
+    loaded = {m["module"] for m in modules}
+    eager = sorted(
+        name for name in LAZY_MODULES
+        if name in loaded or any(mod.startswith(f"{name}.") for mod in loaded)
+    )
+
+    return {
+        "target": target,
+        "total_ms": round(sum(m["self_us"] for m in modules) / 1000, 1),
+        "module_count": len(modules),
+        "slowest_packages_ms": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(by_package.items(), key=lambda item: -item[1])[:top]
+        },
+        "slowest_app_modules_ms": {
+            m["module"]: round(m["cumulative_us"] / 1000, 1)
+            for m in sorted(modules, key=lambda m: -m["cumulative_us"])
+            if m["module"].startswith("app.")
+        },
+        "eager_lazy_modules": eager,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--runs", type=int, default=3, help="report the fastest of N runs")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", help="write the JSON summary to this file")
+    args = parser.parse_args()
+
+    summary = summarise(profile_imports(args.target, args.runs), args.target, args.top)
+    summary["slowest_app_modules_ms"] = dict(
+        list(summary["slowest_app_modules_ms"].items())[:args.top]
+    )
+    report = json.dumps(summary, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+
+    if summary["eager_lazy_modules"]:
+        raise SystemExit(
+            f"Imported at startup but must be lazy: {', '.join(summary['eager_lazy_modules'])}"
+        )
+
+
+if __name__ == "__main__":
+    main()
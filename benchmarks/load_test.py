@@ -0,0 +1,200 @@
+"""HTTP load test for the auth and health endpoints.
+
+Drives a running API (e.g. `docker-compose up -d db api`) with an async httpx client
+and records p50/p95/p99 latency and throughput per endpoint to a JSON report, so
+runs from different commits can be compared:
+
+    python -m benchmarks.load_test --requests 500 --concurrency 20 --output bench-main.json
+    python -m benchmarks.load_test --output bench-branch.json --compare bench-main.json
+
+Every user is registered and logged in from this one IP, which the login rate limit would
+turn into mostly 429s. Run the API under test with RATE_LIMIT_ENABLED=false:
+
+    RATE_LIMIT_ENABLED=false docker-compose up -d db api
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import platform
+import subprocess
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+import httpx
+
+PASSWORD = "load-test-password"
+
+RequestFn = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    request_fn: RequestFn,
+    total_requests: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    counter = itertools.count()
+
+    async def worker() -> None:
+        while (index := next(counter)) < total_requests:
+            start = time.perf_counter()
+            try:
+                response = await request_fn(client, index)
+                if response.is_success:
+                    latencies.append((time.perf_counter() - start) * 1000)
+                else:
+                    errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+            except httpx.HTTPError as e:
+                errors[e.__class__.__name__] = errors.get(e.__class__.__name__, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "endpoint": name,
+        "requests": total_requests,
+        "succeeded": len(latencies),
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+    }
+
+
+async def run_load_test(base_url: str, total_requests: int, concurrency: int) -> List[Dict[str, Any]]:
+    run_id = uuid4().hex[:8]
+    emails = [f"load-{run_id}-{i}@example.com" for i in range(total_requests)]
+    tokens: List[Dict[str, str]] = [{} for _ in range(total_requests)]
+
+    async def register(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        response = await client.post(
+            "/auth/register",
+            json={"email": emails[i], "password": PASSWORD, "full_name": "Load Test"},
+        )
+        if response.is_success:
+            tokens[i] = response.json()
+        return response
+
+    async def login(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.post("/auth/login", json={"email": emails[i], "password": PASSWORD})
+
+    async def refresh(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.post(
+            "/auth/refresh",
+            json={"refresh_token": tokens[i].get("refresh_token", "")},
+        )
+
+    async def me(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get(
+            "/auth/me",
+            headers={"Authorization": f"Bearer {tokens[i].get('access_token', '')}"},
+        )
+
+    async def health(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get("/health")
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        # Registration seeds the users and tokens the later scenarios reuse
+        return [
+            await run_scenario(client, name, fn, total_requests, concurrency)
+            for name, fn in (
+                ("POST /auth/register", register),
+                ("POST /auth/login", login),
+                ("POST /auth/refresh", refresh),
+                ("GET /auth/me", me),
+                ("GET /health", health),
+            )
+        ]
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any]) -> None:
+    previous = {row["endpoint"]: row for row in baseline.get("results", [])}
+    print(f"\nCompared with {baseline.get('git_revision')} ({baseline.get('timestamp')}):")
+    for row in results:
+        before = previous.get(row["endpoint"])
+        if before is None:
+            continue
+        deltas = []
+        for key in ("p50", "p95", "p99"):
+            old, new = before["latency_ms"][key], row["latency_ms"][key]
+            change = (new - old) / old * 100 if old else 0.0
+            deltas.append(f"{key} {old:.1f}->{new:.1f}ms ({change:+.1f}%)")
+        print(f"  {row['endpoint']:<20} " + "  ".join(deltas))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--compare", help="previous JSON report to diff latencies against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load_test(args.base_url, args.requests, args.concurrency))
+    report = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "base_url": args.base_url,
+        "requests_per_endpoint": args.requests,
+        "concurrency": args.concurrency,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for row in results:
+        latency = row["latency_ms"]
+        print(
+            f"{row['endpoint']:<20} {row['throughput_rps']:>9.1f} req/s  "
+            f"p50 {latency['p50']:>8.2f}ms  p95 {latency['p95']:>8.2f}ms  "
+            f"p99 {latency['p99']:>8.2f}ms  errors {sum(row['errors'].values())}"
+        )
+    print(f"Report written to {args.output}")
+    if any("429" in row["errors"] for row in results):
+        print("Warning: requests were rate limited; start the API with RATE_LIMIT_ENABLED=false")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
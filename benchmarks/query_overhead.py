@@ -0,0 +1,117 @@
+"""Per-query overhead of the hot user and transaction lookups.
+
+Compares ad hoc `select()` construction against the cached lambda statements in
+`app.services.user` / `app.services.transaction`. The `build` section needs no
+database and times statement construction plus cache-key generation (the work
+SQLAlchemy repeats on every execute) and, for reference, an uncached compile.
+With `--execute` the lookups also run against DATABASE_URL through the read-only
+session, exercising asyncpg's prepared statement cache.
+
+    python -m benchmarks.query_overhead --iterations 20000
+    python -m benchmarks.query_overhead --iterations 2000 --execute
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg as pg_asyncpg
+
+from app.db.session import async_engine, async_read_session_factory
+from app.models.statement import ParsedTransaction
+from app.models.user import User
+from app.services.transaction import select_transaction, select_user_transactions
+from app.services.user import select_user_by_email, select_user_by_id
+
+USER_ID = uuid4()
+TRANSACTION_ID = uuid4()
+EMAIL = "benchmark@example.com"
+
+QUERIES: Dict[str, Dict[str, Callable[[], Any]]] = {
+    "user_by_id": {
+        "select": lambda: select(User).where(User.id == USER_ID),
+        "lambda": lambda: select_user_by_id(USER_ID),
+    },
+    "user_by_email": {
+        "select": lambda: select(User).where(User.email == EMAIL),
+        "lambda": lambda: select_user_by_email(EMAIL),
+    },
+    "transaction_by_id": {
+        "select": lambda: select(ParsedTransaction).where(
+            ParsedTransaction.id == TRANSACTION_ID,
+            ParsedTransaction.user_id == str(USER_ID),
+        ),
+        "lambda": lambda: select_transaction(str(USER_ID), TRANSACTION_ID),
+    },
+    "user_transactions_page": {
+        "select": lambda: select(ParsedTransaction)
+        .where(ParsedTransaction.user_id == str(USER_ID))
+        .order_by(ParsedTransaction.transaction_date.desc(), ParsedTransaction.id)
+        .limit(100)
+        .offset(0),
+        "lambda": lambda: select_user_transactions(str(USER_ID), 100, 0),
+    },
+}
+
+
+def _per_call_us(fn: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return round((time.perf_counter() - start) / iterations * 1_000_000, 2)
+
+
+def bench_build(iterations: int) -> List[Dict[str, Any]]:
+    dialect = pg_asyncpg.dialect()
+    results = []
+    for name, variants in QUERIES.items():
+        row: Dict[str, Any] = {"query": name}
+        for variant, factory in variants.items():
+            row[f"{variant}_build_cache_key_us"] = _per_call_us(
+                lambda: factory()._generate_cache_key(), iterations
+            )
+        row["uncached_compile_us"] = _per_call_us(
+            lambda: variants["select"]().compile(dialect=dialect), max(1, iterations // 10)
+        )
+        results.append(row)
+    return results
+
+
+async def bench_execute(iterations: int) -> List[Dict[str, Any]]:
+    if async_engine is None:
+        raise SystemExit("DATABASE_URL is not configured")
+
+    results = []
+    async with async_read_session_factory() as session:
+        for name, variants in QUERIES.items():
+            row: Dict[str, Any] = {"query": name}
+            for variant, factory in variants.items():
+                for _ in range(20):
+                    await session.execute(factory())
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    await session.execute(factory())
+                elapsed = time.perf_counter() - start
+                row[f"{variant}_execute_us"] = round(elapsed / iterations * 1_000_000, 2)
+            results.append(row)
+    await async_engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--execute", action="store_true", help="also execute against DATABASE_URL")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {"build": bench_build(args.iterations)}
+    if args.execute:
+        report["execute"] = asyncio.run(bench_execute(args.iterations))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Serialization cost of large transaction-list responses.
+
+Renders lists of `ParsedTransaction`-shaped rows (UUID, datetime, Decimal fields)
+with FastAPI's previous default path (`jsonable_encoder` + stdlib `JSONResponse`)
+and with the orjson-backed `ORJSONResponse`, both from plain rows and from the
+`ParsedTransaction` models a handler would return.
+
+    python -m benchmarks.serialization --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import ORJSONResponse
+from app.models.enums import TransactionType
+from app.models.statement import ParsedTransaction
+
+
+def build_transactions(count: int) -> List[ParsedTransaction]:
+    statement_id = uuid4()
+    user_id = str(uuid4())
+    start = datetime(2015, 1, 1)
+    return [
+        ParsedTransaction(
+            statement_id=statement_id,
+            user_id=user_id,
+            transaction_type=TransactionType.SIP,
+            transaction_date=start + timedelta(days=i),
+            security_name="Example Flexi Cap Fund - Direct Growth",
+            security_symbol="INF000K01234",
+            units=Decimal("12.3456"),
+            nav=Decimal("81.0123"),
+            amount=Decimal("1000.00"),
+            confidence_score=Decimal("0.98"),
+        )
+        for i in range(count)
+    ]
+
+
+def _best_ms(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 2)
+
+
+def bench(count: int, repeat: int) -> Dict[str, Any]:
+    models = build_transactions(count)
+    rows = [m.model_dump() for m in models]
+
+    return {
+        "rows": count,
+        "payload_kb": round(len(ORJSONResponse(rows).body) / 1024, 1),
+        "stdlib_rows_ms": _best_ms(lambda: JSONResponse(jsonable_encoder(rows)), repeat),
+        "orjson_rows_ms": _best_ms(lambda: ORJSONResponse(rows), repeat),
+        "stdlib_models_ms": _best_ms(lambda: JSONResponse(jsonable_encoder(models)), repeat),
+        "orjson_models_ms": _best_ms(
+            lambda: ORJSONResponse([m.model_dump() for m in models]), repeat
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps([bench(size, args.repeat) for size in args.sizes], indent=2))
+
+
+if __name__ == "__main__":
+    main()
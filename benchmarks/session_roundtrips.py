@@ -0,0 +1,96 @@
+"""Compare database round-trips of the read-write and read-only session dependencies.
+
+Runs the `/auth/me` lookup (`UserService.get_user_by_id`) through both
+`get_async_session` and `get_async_read_session` against DATABASE_URL and counts
+the statements asyncpg sends to the server (PING / BEGIN / SELECT / COMMIT / ROLLBACK).
+
+    python -m benchmarks.session_roundtrips --iterations 500
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import Any, AsyncGenerator, Callable, Dict
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import async_engine, get_async_read_session, get_async_session
+from app.services.user import UserService
+
+statements: Counter = Counter()
+
+
+def _count_query(record) -> None:
+    # pool_pre_ping sends an empty ";" statement on every checkout
+    keyword = record.query.split(None, 1)[0].upper() if record.query.strip(" ;") else "PING"
+    statements[keyword] += 1
+
+
+def _attach_query_logger(dbapi_connection, connection_record) -> None:
+    dbapi_connection.driver_connection.add_query_logger(_count_query)
+
+
+async def _run_request(
+    dependency: Callable[[], AsyncGenerator[AsyncSession, None]],
+    user_service: UserService,
+) -> None:
+    # Drive the dependency the same way FastAPI does: enter, run handler, resume
+    session_gen = dependency()
+    session = await session_gen.__anext__()
+    await user_service.get_user_by_id(session, uuid4())
+    try:
+        await session_gen.__anext__()
+    except StopAsyncIteration:
+        pass
+
+
+async def _measure(
+    name: str,
+    dependency: Callable[[], AsyncGenerator[AsyncSession, None]],
+    iterations: int,
+) -> Dict[str, Any]:
+    user_service = UserService()
+    # Warm up the pool and asyncpg's prepared statement cache
+    for _ in range(10):
+        await _run_request(dependency, user_service)
+
+    statements.clear()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await _run_request(dependency, user_service)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "dependency": name,
+        "iterations": iterations,
+        "statements_per_request": {
+            key: round(count / iterations, 2) for key, count in sorted(statements.items())
+        },
+        "round_trips_per_request": round(sum(statements.values()) / iterations, 2),
+        "mean_latency_ms": round(elapsed / iterations * 1000, 3),
+    }
+
+
+async def main(iterations: int) -> None:
+    if async_engine is None:
+        raise SystemExit("DATABASE_URL is not configured")
+
+    event.listen(async_engine.sync_engine, "connect", _attach_query_logger)
+    await async_engine.dispose()
+
+    results = [
+        await _measure("get_async_session", get_async_session, iterations),
+        await _measure("get_async_read_session", get_async_read_session, iterations),
+    ]
+    await async_engine.dispose()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,46 @@
+# Gunicorn configuration for running the API with multiple Uvicorn workers
+#
+#   gunicorn -c gunicorn.conf.py app.main:app
+#
+# Every setting can be overridden through the environment variables below.
+import os
+
+
+def _cpu_count() -> int:
+    try:
+        # Respects CPU affinity / cpuset limits applied to the container
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+# Async workers are not blocked on I/O, so one per core saturates the box
+workers = _env_int("WEB_CONCURRENCY", _cpu_count())
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+
+# The app reads WEB_CONCURRENCY to split the database connection budget across
+# workers, so make sure it sees the resolved worker count
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Import the app once in the master so workers share its memory copy-on-write.
+# Importing opens no database connections; each worker connects lazily after fork.
+preload_app = True
+
+# Recycle workers periodically (with jitter so they don't restart together)
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 10000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 1000)
+
+# On SIGTERM, stop accepting connections and let in-flight requests finish
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+timeout = _env_int("GUNICORN_TIMEOUT", 60)
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+
+accesslog = None
+errorlog = "-"
+loglevel = os.environ.get("LOG_LEVEL", "info").lower()
@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+# Settings are read once at import time, so point the app at a scratch SQLite database first
+_data_dir = tempfile.mkdtemp(prefix="portfolio-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_data_dir}/test.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("FILE_STORE_DIR", os.path.join(_data_dir, "statements"))
+os.environ.setdefault("PDF_PAGE_CACHE_DIR", os.path.join(_data_dir, "page_cache"))
+os.environ.setdefault("UPLOAD_SWEEP_INTERVAL_SECONDS", "0")
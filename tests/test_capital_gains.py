@@ -0,0 +1,75 @@
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.models.enums import TransactionType
+from app.services.capital_gains import match_lots, summarise_by_year
+
+
+def _row(kind: TransactionType, day: date, units: str, amount: str = "0", folio: str = "F1"):
+    return SimpleNamespace(
+        transaction_type=kind,
+        transaction_date=datetime.combine(day, datetime.min.time()),
+        units=Decimal(units),
+        amount=Decimal(amount),
+        security_symbol="100001",
+        security_name="Some Flexi Cap Fund",
+        folio_number=folio,
+    )
+
+
+def _summary(gains):
+    return [
+        (gain.acquired_on, gain.sold_on, gain.units, gain.cost, gain.proceeds, gain.long_term, gain.unmatched)
+        for gain in gains
+    ]
+
+
+def test_partial_sells_consume_lots_fifo():
+    gains = match_lots([
+        _row(TransactionType.SALE, date(2021, 7, 1), "-15", "4500"),
+        _row(TransactionType.PURCHASE, date(2021, 6, 1), "10", "2000"),
+        _row(TransactionType.PURCHASE, date(2020, 1, 1), "10", "1000"),
+        _row(TransactionType.REDEMPTION, date(2021, 8, 1), "2", "700"),
+    ], long_term_days=365)
+
+    assert _summary(gains) == [
+        (date(2020, 1, 1), date(2021, 7, 1), Decimal("10"), Decimal("1000"), Decimal("3000"), True, False),
+        (date(2021, 6, 1), date(2021, 7, 1), Decimal("5"), Decimal("1000"), Decimal("1500"), False, False),
+        # The rest of the second lot keeps its proportional cost
+        (date(2021, 6, 1), date(2021, 8, 1), Decimal("2"), Decimal("400"), Decimal("700"), False, False),
+    ]
+    assert sum(gain.gain for gain in gains) == Decimal("2800")
+
+
+def test_bonus_and_split_adjust_open_lots():
+    gains = match_lots([
+        _row(TransactionType.PURCHASE, date(2021, 6, 1), "10", "1000"),
+        _row(TransactionType.BONUS, date(2022, 1, 1), "5"),
+        # 1:2 split of the 15 units held
+        _row(TransactionType.SPLIT, date(2022, 2, 1), "15"),
+        _row(TransactionType.SALE, date(2022, 3, 1), "25", "5000"),
+        _row(TransactionType.SALE, date(2022, 4, 1), "10", "1000"),
+    ], long_term_days=365)
+
+    assert _summary(gains) == [
+        (date(2021, 6, 1), date(2022, 3, 1), Decimal("20"), Decimal("1000"), Decimal("4000"), False, False),
+        (date(2022, 1, 1), date(2022, 3, 1), Decimal("5"), Decimal("0"), Decimal("1000"), False, False),
+        (date(2022, 1, 1), date(2022, 4, 1), Decimal("5"), Decimal("0"), Decimal("500"), False, False),
+        # Sold beyond what the statements show was bought
+        (None, date(2022, 4, 1), Decimal("5"), Decimal("0"), Decimal("500"), False, True),
+    ]
+    summaries = summarise_by_year(gains)
+    assert list(summaries) == ["2021-22", "2022-23"]
+    assert summaries["2022-23"].unmatched_units == Decimal("5")
+
+
+def test_same_day_purchase_is_matched_before_sale_and_folios_are_separate():
+    day = date(2023, 5, 2)
+    gains = match_lots([
+        _row(TransactionType.SALE, day, "-4", "480"),
+        _row(TransactionType.SIP, day, "4", "400"),
+        _row(TransactionType.PURCHASE, date(2020, 1, 1), "4", "100", folio="F2"),
+    ], long_term_days=365)
+
+    assert _summary(gains) == [(day, day, Decimal("4"), Decimal("400"), Decimal("480"), False, False)]
@@ -0,0 +1,100 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlmodel import SQLModel
+
+from app.db.session import async_engine, async_session_factory
+from app.models.enums import StatementType, TransactionType
+from app.models.statement import ParsedTransaction, Statement, UploadSession
+from app.services.confidence import get_confidence_service, score_transactions
+
+PERIOD_END = datetime(2024, 3, 31)
+
+
+def _row(kind=TransactionType.PURCHASE, day=2, symbol="A", units="10", nav="100", amount="1000", duplicate=False):
+    return SimpleNamespace(
+        transaction_type=kind,
+        transaction_date=datetime(2024, 1, day) if isinstance(day, int) else day,
+        security_symbol=symbol,
+        security_name=None,
+        units=Decimal(units) if units is not None else None,
+        nav=Decimal(nav) if nav is not None else None,
+        price_per_unit=None,
+        amount=Decimal(amount) if amount is not None else None,
+        is_duplicate=duplicate,
+    )
+
+
+def test_each_check_costs_its_penalty():
+    scores = score_transactions([
+        _row(),
+        # Within the stamp duty tolerance
+        _row(amount="1005"),
+        _row(amount="1250"),
+        _row(units=None),
+        _row(nav=None),
+        _row(day=datetime(2024, 4, 10)),
+        _row(TransactionType.BONUS, units="5", nav=None, amount=None),
+    ], PERIOD_END)
+
+    assert scores.round(4).tolist() == [1.0, 1.0, 0.6, 0.5, 0.95, 0.6, 1.0]
+
+
+def test_running_balance_ignores_duplicates_and_is_kept_per_scheme():
+    scores = score_transactions([
+        _row(day=1, symbol="B", duplicate=True),
+        _row(TransactionType.REDEMPTION, day=3, symbol="B", units="5", amount="500"),
+        _row(day=1, symbol="C"),
+        _row(TransactionType.REDEMPTION, day=3, symbol="C", units="5", amount="500"),
+        _row(TransactionType.SALE, day=4, symbol="C", units="6", amount="600"),
+    ], PERIOD_END)
+
+    assert scores.round(4).tolist() == [1.0, 0.7, 1.0, 1.0, 0.7]
+
+
+async def _score(amounts):
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    user_id = str(uuid4())
+    async with async_session_factory() as session:
+        upload = UploadSession(user_id=user_id)
+        statement = Statement(
+            upload_session_id=upload.id,
+            user_id=user_id,
+            file_name="cas.pdf",
+            file_size_bytes=1,
+            statement_type=StatementType.CAMS,
+            statement_date=PERIOD_END,
+        )
+        session.add_all([upload, statement, *(
+            ParsedTransaction(statement_id=statement.id, user_id=user_id, **vars(_row(amount=amount)))
+            for amount in amounts
+        )])
+        await session.commit()
+
+        outcome = await get_confidence_service().score_statement(session, statement)
+        await session.commit()
+        await session.refresh(statement)
+    await async_engine.dispose()
+    return outcome, statement
+
+
+def test_confident_statement_is_auto_confirmed():
+    outcome, statement = asyncio.run(_score(["1000", "1000"]))
+
+    assert outcome["auto_confirmed"] and outcome["confidence"] == 1.0
+    assert statement.confirmed_at is not None
+
+
+def test_one_doubtful_row_sends_the_statement_to_review():
+    # The mean clears the auto-confirm threshold, the worst row does not
+    outcome, statement = asyncio.run(_score(["1000"] * 19 + ["1250"]))
+
+    assert outcome["confidence"] >= 0.95
+    assert not outcome["auto_confirmed"] and outcome["low_confidence_transactions"] == 1
+    assert statement.confirmed_at is None
+    assert statement.parsing_confidence == Decimal(str(outcome["confidence"]))
@@ -0,0 +1,84 @@
+import asyncio
+from uuid import uuid4
+
+from pypdf import PdfWriter
+from sqlalchemy import select
+from sqlmodel import SQLModel
+
+from app.db.session import async_engine, async_session_factory
+from app.models.enums import StatementType
+from app.models.statement import Statement, StatementPasswordPattern, UploadSession
+from app.services.pdf_extract import get_pdf_extraction_service
+from app.services.pdf_unlock import PasswordHints, get_pdf_unlock_service
+from app.services.statement import get_statement_service
+
+
+async def _remember_concurrently():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    user_id = str(uuid4())
+    unlock_service = get_pdf_unlock_service()
+    # Two uploads that both found nothing remembered
+    await asyncio.gather(
+        unlock_service.remember(user_id, StatementType.CAMS, "email"),
+        unlock_service.remember(user_id, StatementType.CAMS, "pan_upper"),
+    )
+    await unlock_service.remember(user_id, StatementType.CAMS, "dob")
+    async with async_session_factory() as session:
+        patterns = (await session.scalars(
+            select(StatementPasswordPattern.pattern).where(StatementPasswordPattern.user_id == user_id)
+        )).all()
+    await async_engine.dispose()
+    return patterns
+
+
+def test_remember_upserts_one_pattern_per_user_and_institution():
+    assert asyncio.run(_remember_concurrently()) == ["dob"]
+
+
+async def _extract_encrypted(path: str):
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    user_id = str(uuid4())
+    statement_service = get_statement_service()
+    async with async_session_factory() as session:
+        upload = UploadSession(user_id=user_id)
+        statement = Statement(
+            upload_session_id=upload.id,
+            user_id=user_id,
+            file_name="cas.pdf",
+            file_size_bytes=1,
+            statement_type=StatementType.KFINTECH,
+        )
+        session.add_all([upload, statement])
+        await session.flush()
+        await statement_service.attach_file(session, statement.id, path, "cas.pdf")
+        await session.commit()
+
+    checked_out = []
+
+    async def on_progress(done: int, total: int) -> None:
+        checked_out.append(async_engine.pool.checkedout())
+
+    pages = await statement_service.extract_text(statement.id, PasswordHints(pan="abcde1234f"), on_progress)
+    remembered = await get_pdf_unlock_service().remembered_pattern(user_id, StatementType.KFINTECH)
+    get_pdf_extraction_service().close()
+    await async_engine.dispose()
+    return pages, checked_out, remembered
+
+
+def test_encrypted_statement_is_extracted_without_holding_a_connection(tmp_path):
+    writer = PdfWriter()
+    writer.add_blank_page(width=100, height=100)
+    writer.encrypt("ABCDE1234F")
+    path = tmp_path / "cas.pdf"
+    with open(path, "wb") as target:
+        writer.write(target)
+
+    pages, checked_out, remembered = asyncio.run(_extract_encrypted(str(path)))
+
+    assert pages == [""]
+    assert checked_out and set(checked_out) == {0}
+    assert remembered == "pan_upper"
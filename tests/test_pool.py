@@ -0,0 +1,72 @@
+from app.core.config import get_settings
+from app.db import pool
+from app.db.pool import compute_pool_limits
+
+
+class _Recorder:
+    def __init__(self):
+        self.events = []
+
+    def warning(self, event, **fields):
+        self.events.append((event, fields))
+
+
+def _limits(monkeypatch, **overrides):
+    recorder = _Recorder()
+    monkeypatch.setattr(pool, "logger", recorder)
+    settings = get_settings().model_copy(update={
+        "database_pool_size": None,
+        "database_max_overflow": None,
+        "progress_listen_url": None,
+        **overrides,
+    })
+    return compute_pool_limits(settings), recorder.events
+
+
+def test_share_leaves_room_for_the_listen_connection(monkeypatch):
+    limits, events = _limits(
+        monkeypatch,
+        database_url="postgresql+asyncpg://app@db/app",
+        database_max_connections=20,
+        web_concurrency=4,
+    )
+
+    # 5 per worker, one of them the LISTEN connection
+    assert limits == (2, 2)
+    assert events == []
+
+
+def test_no_listen_connection_off_postgres(monkeypatch):
+    limits, events = _limits(
+        monkeypatch, database_url="sqlite+aiosqlite:///app.db", database_max_connections=15, web_concurrency=1
+    )
+
+    assert limits == (5, 10)
+    assert events == []
+
+
+def test_budget_too_small_for_the_workers_is_logged(monkeypatch):
+    limits, events = _limits(
+        monkeypatch,
+        database_url="postgresql+asyncpg://app@db/app",
+        database_max_connections=6,
+        web_concurrency=8,
+    )
+
+    assert limits == (1, 0)
+    assert [(event, fields["needed"]) for event, fields in events] == [("database_connection_budget_exceeded", 16)]
+
+
+def test_explicit_sizes_over_the_budget_are_logged(monkeypatch):
+    limits, events = _limits(
+        monkeypatch,
+        database_url="sqlite+aiosqlite:///app.db",
+        progress_listen_url="postgresql://app@db/app",
+        database_max_connections=15,
+        web_concurrency=2,
+        database_pool_size=5,
+        database_max_overflow=5,
+    )
+
+    assert limits == (5, 5)
+    assert events[0][1]["needed"] == 22
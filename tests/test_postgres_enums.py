@@ -0,0 +1,96 @@
+import asyncio
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, List
+
+import pytest
+from sqlalchemy import Enum as SAEnum, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel
+
+from app.db.session import async_engine, async_session_factory
+from app.models.enums import UploadSessionStatus
+from app.models.statement import UploadSession
+from app.services.file_store import get_file_store
+from app.services.progress import UploadProgressBroker
+from app.services.upload_sweeper import UploadSweeper
+
+# Tests run on SQLite, which accepts any string; these check what Postgres would be sent
+DIALECT = postgresql.asyncpg.dialect()
+
+
+def _enum_columns():
+    return [
+        column
+        for table in SQLModel.metadata.tables.values()
+        for column in table.columns
+        if isinstance(column.type, SAEnum) and column.type.enum_class is not None
+    ]
+
+
+def _bound_enum_values(statement, parameters) -> List[Any]:
+    """Enum parameters of a statement as the Postgres driver would receive them"""
+    compiled = statement.compile(dialect=DIALECT)
+    values = []
+    for key, value in compiled.construct_params(parameters).items():
+        column_type = compiled.binds[key].type
+        if not isinstance(column_type, SAEnum):
+            continue
+        processor = column_type.dialect_impl(DIALECT).bind_processor(DIALECT)
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            values.append(processor(item) if processor else item)
+    return values
+
+
+@pytest.mark.parametrize("column", _enum_columns(), ids=str)
+def test_enum_columns_round_trip_values(column):
+    # The migrations create every Postgres enum type with the members' lowercase values
+    column_type = column.type.dialect_impl(DIALECT)
+    bind = column_type.bind_processor(DIALECT)
+    result = column_type.result_processor(DIALECT, None)
+    for member in column.type.enum_class:
+        assert (bind(member) if bind else member) == member.value
+        assert (result(member.value) if result else member.value) == member
+
+
+async def _capture_upload_status_statements():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    statements = []
+
+    def capture(orm_execute_state) -> None:
+        statements.append((orm_execute_state.statement, orm_execute_state.parameters))
+
+    event.listen(Session, "do_orm_execute", capture)
+    try:
+        async with async_session_factory() as session:
+            upload = UploadSession(user_id="user", expires_at=datetime.utcnow() - timedelta(hours=1))
+            session.add(upload)
+            await session.commit()
+
+        sweeper = UploadSweeper(get_file_store(), batch_size=10, file_concurrency=1, interval_seconds=0)
+        expired = await sweeper.expire_sessions()
+
+        async with async_session_factory() as session:
+            await UploadProgressBroker(None).transition(session, upload.id, UploadSessionStatus.FAILED, "boom")
+            await session.commit()
+            session.expunge_all()
+            stored = await session.get(UploadSession, upload.id)
+    finally:
+        event.remove(Session, "do_orm_execute", capture)
+    await async_engine.dispose()
+    return expired, statements, stored
+
+
+def test_upload_status_statements_bind_values():
+    expired, statements, stored = asyncio.run(_capture_upload_status_statements())
+
+    assert expired == 1
+    assert stored.status == UploadSessionStatus.FAILED
+    bound = [value for statement, parameters in statements for value in _bound_enum_values(statement, parameters)]
+    # The sweeper's filter and EXPIRED update, then the FAILED transition
+    assert {"pending", "processing", "failed", "expired"} <= set(bound)
+    assert all(isinstance(value, str) and value == value.lower() for value in bound)
+    assert not any(isinstance(value, Enum) for value in bound)
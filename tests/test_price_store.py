@@ -0,0 +1,46 @@
+import math
+from datetime import date
+
+from app.services import price_store
+from app.services.price_store import PriceStore
+
+
+def test_backfill_relayout_keeps_history_and_forward_fill(tmp_path, monkeypatch):
+    # Small enough that a third scheme forces a relayout too
+    monkeypatch.setattr(price_store, "INITIAL_SCHEME_CAPACITY", 2)
+    writer = PriceStore(tmp_path)
+    reader = PriceStore(tmp_path, refresh_interval_seconds=0)
+
+    writer.write(["A"], [date(2024, 1, 10)], [10.0], aliases={"A": ["INF000A01"]})
+    writer.write(["A", "B"], [date(2024, 1, 12), date(2024, 1, 12)], [12.0, 20.0])
+    assert reader.get_price("A", date(2024, 1, 11)) == (10.0, date(2024, 1, 10))
+    assert reader.get_price("B", date(2024, 1, 11)) is None
+
+    # Earlier history for A and a new scheme: a new origin and a wider matrix
+    writer.write(["A", "C"], [date(2024, 1, 5), date(2024, 1, 11)], [5.0, 30.0])
+
+    assert reader.start_date == date(2024, 1, 5)
+    assert reader.end_date == date(2024, 1, 12)
+    assert reader.get_price("A", date(2024, 1, 8)) == (5.0, date(2024, 1, 5))
+    assert reader.get_price("INF000A01", date(2024, 1, 11)) == (10.0, date(2024, 1, 10))
+    assert reader.get_price("B", date(2024, 1, 12)) == (20.0, date(2024, 1, 12))
+    assert reader.get_price("C", date(2024, 1, 20)) == (30.0, date(2024, 1, 11))
+    assert reader.get_history("A", date(2024, 1, 1), date(2024, 1, 31)) == [
+        (date(2024, 1, 5), 5.0),
+        (date(2024, 1, 10), 10.0),
+        (date(2024, 1, 12), 12.0),
+    ]
+    assert all(math.isnan(price) for price in reader.get_prices(["A", "UNKNOWN"], date(2024, 1, 4)))
+    # The superseded generation is removed once the new one is published
+    assert sorted(path.name for path in tmp_path.glob("*-*.*")) == ["navs-1.f64", "source-1.i32"]
+
+
+def test_backfilled_gap_does_not_override_later_publications(tmp_path):
+    store = PriceStore(tmp_path, refresh_interval_seconds=0)
+    store.write(["A", "A"], [date(2024, 3, 1), date(2024, 3, 4)], [1.0, 4.0])
+    store.write(["A"], [date(2024, 3, 2)], [2.0])
+
+    matrix = store.get_price_matrix(["A"], [date(2024, 3, day) for day in range(1, 6)])
+
+    assert matrix[:, 0].tolist() == [1.0, 2.0, 2.0, 4.0, 4.0]
+    assert store.get_price("A", date(2024, 3, 3)) == (2.0, date(2024, 3, 2))
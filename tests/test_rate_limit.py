@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from app.core.exceptions import RateLimitError
+from app.services import rate_limit
+from app.services.rate_limit import MemoryRateLimitBackend, RateLimit, RateLimitService, take_token
+
+# One token every 10 seconds, bursts of 3
+LIMIT = RateLimit(per_minute=6, burst=3)
+
+
+def test_take_token_refills_at_the_limit_rate_up_to_the_burst():
+    assert take_token(3.0, 0.0, LIMIT) == (2.0, 0.0)
+    # An empty bucket waits for the rest of one token
+    assert take_token(0.0, 4.0, LIMIT) == pytest.approx((0.4, 6.0))
+    assert take_token(0.0, 10.0, LIMIT) == pytest.approx((0.0, 0.0))
+    # Idle time never refills past the burst
+    assert take_token(1.0, 3600.0, LIMIT) == (2.0, 0.0)
+    # Clock steps backwards are ignored
+    assert take_token(0.5, -30.0, LIMIT) == pytest.approx((0.5, 5.0))
+
+
+def test_exhausted_bucket_raises_429_with_retry_after():
+    service = RateLimitService(MemoryRateLimitBackend(), {"login": LIMIT})
+
+    async def attempts():
+        for _ in range(LIMIT.burst):
+            await service.check("login", "1.2.3.4")
+        # Other clients have their own buckets
+        await service.check("login", "5.6.7.8")
+        with pytest.raises(RateLimitError) as raised:
+            await service.check("login", "1.2.3.4")
+        return raised.value
+
+    error = asyncio.run(attempts())
+
+    assert error.status_code == 429
+    assert error.headers == {"Retry-After": "10"}
+
+
+def test_prune_drops_only_buckets_their_own_limit_has_refilled(monkeypatch):
+    monkeypatch.setattr(rate_limit, "MAX_MEMORY_BUCKETS", 2)
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    backend = MemoryRateLimitBackend()
+    fast = RateLimit(per_minute=60, burst=1)
+    slow = RateLimit(per_minute=1, burst=1)
+
+    async def take_all():
+        await backend.take("upload:a", slow)
+        await backend.take("login:a", fast)
+        now[0] += 5
+        # Prunes: the login bucket refilled after 1s, the upload one needs 60s
+        await backend.take("login:b", fast)
+        return await backend.take("upload:a", slow)
+
+    retry_after = asyncio.run(take_all())
+
+    assert sorted(backend._buckets) == ["login:b", "upload:a"]
+    assert retry_after == pytest.approx(55.0)
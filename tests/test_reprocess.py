@@ -0,0 +1,89 @@
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlmodel import SQLModel
+
+from app.db.session import async_engine, async_session_factory
+from app.models.enums import StatementType, TransactionType
+from app.models.performance import PortfolioPerformanceState
+from app.models.statement import ParsedTransaction, Statement, UploadSession
+from app.services.holdings import get_holdings_service
+from app.services.reprocess import diff_rows, get_reprocess_service
+from app.services.statement_parsers import PARSED_FIELDS, ParsedRow
+
+
+def _row(symbol: str, day: int, units: str = "10") -> ParsedRow:
+    return ParsedRow(
+        transaction_type=TransactionType.PURCHASE,
+        transaction_date=datetime(2024, 1, day),
+        security_symbol=symbol,
+        units=Decimal(units),
+        amount=Decimal(units) * 100,
+    )
+
+
+def test_diff_rows_keeps_unchanged_updates_matches_and_inserts_the_rest():
+    existing = [
+        ParsedTransaction(id=uuid4(), statement_id=uuid4(), user_id="u", **row.values())
+        for row in (_row("SAME", 2), _row("FIXED", 3, units="5"), _row("GONE", 4))
+    ]
+    parsed = [_row("SAME", 2), _row("FIXED", 3, units="7"), _row("MISSED", 5)]
+
+    diff = diff_rows(existing, parsed)
+
+    assert diff.unchanged == 1
+    assert [(row_id, row.units) for row_id, row in diff.updates] == [(existing[1].id, Decimal("7"))]
+    assert diff.inserts == [_row("MISSED", 5)]
+    assert diff.deletes == [existing[2].id]
+    assert min(diff.dates) == date(2024, 1, 3)
+
+
+async def _reprocess_confirmed_statement():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    user_id = str(uuid4())
+    async with async_session_factory() as session:
+        upload = UploadSession(user_id=user_id)
+        statement = Statement(
+            upload_session_id=upload.id,
+            user_id=user_id,
+            file_name="cas.pdf",
+            file_size_bytes=1,
+            statement_type=StatementType.CAMS,
+            confirmed_at=datetime(2024, 2, 1),
+        )
+        session.add_all([
+            upload,
+            statement,
+            ParsedTransaction(statement_id=statement.id, user_id=user_id, is_confirmed=True, **_row("KEPT", 2).values()),
+        ])
+        await session.commit()
+
+        existing = (await session.execute(
+            select(ParsedTransaction.id, *(getattr(ParsedTransaction, name) for name in PARSED_FIELDS))
+            .where(ParsedTransaction.statement_id == statement.id)
+        )).all()
+        # The fixed parser finds a transaction the old one missed
+        diff = diff_rows(existing, [_row("KEPT", 2), _row("MISSED", 9)])
+        await get_reprocess_service().apply(session, statement, diff)
+        await session.commit()
+
+        holdings = await get_holdings_service().get_holdings(session, user_id)
+        state = await session.scalar(
+            select(PortfolioPerformanceState).where(PortfolioPerformanceState.user_id == user_id)
+        )
+    await async_engine.dispose()
+    return diff, holdings, state
+
+
+def test_apply_confirms_rows_added_to_a_confirmed_statement():
+    diff, holdings, state = asyncio.run(_reprocess_confirmed_statement())
+
+    assert diff.unchanged == 1 and len(diff.inserts) == 1
+    assert sorted(row.security_symbol for row in holdings) == ["KEPT", "MISSED"]
+    # Performance is recomputed from the new transaction's date
+    assert state.dirty_from == date(2024, 1, 9)
@@ -0,0 +1,22 @@
+import pytest
+
+from app.core.responses import accepts_encoding
+
+
+@pytest.mark.parametrize("header, accepted", [
+    ("gzip", True),
+    ("gzip, deflate, br", True),
+    ("GZIP;Q=0.5", True),
+    ("deflate, gzip;q=0", False),
+    ("gzip;q=0.0, *;q=1", False),
+    ("x-gzip", True),
+    ("gzip;q=0, x-gzip", False),
+    ("*", True),
+    ("br, *;q=0", False),
+    ("gzip;q=oops", False),
+    ("identity", False),
+    ("", False),
+    (None, False),
+])
+def test_accepts_encoding_honours_q_values(header, accepted):
+    assert accepts_encoding(header, "gzip") is accepted
@@ -0,0 +1,64 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlmodel import SQLModel
+
+from app.db.session import async_engine, async_session_factory
+from app.models.enums import TransactionType
+from app.models.security import Security
+from app.models.statement import ParsedTransaction
+from app.services.security_master import SecurityMasterService
+from app.services.statement_parsers import ParsedRow
+
+
+def _row(name=None, symbol=None) -> ParsedRow:
+    return ParsedRow(
+        transaction_type=TransactionType.PURCHASE,
+        transaction_date=datetime(2024, 1, 2),
+        security_name=name,
+        security_symbol=symbol,
+        units=Decimal("1"),
+    )
+
+
+async def _canonicalize_and_backfill():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    code = str(uuid4().int)[:6]
+    isin = f"INF{code}01"
+    user_id = str(uuid4())
+    service = SecurityMasterService()
+    async with async_session_factory() as session:
+        session.add(Security(scheme_code=code, name=f"Zyxwv {code} Flexi Cap Fund - Direct Growth", isin_growth=isin))
+        await session.commit()
+
+        rows = await service.canonicalize(session, [
+            _row(symbol=isin),
+            _row(name=f"ZYXWV {code} FLEXI CAP FUND DIRECT PLAN GROWTH"),
+            _row(name="Zyxwv Flexi", symbol="INFY"),
+            _row(name="Unknown Fund"),
+        ])
+
+        # Stored before the scheme was known, under its ISIN
+        session.add(ParsedTransaction(statement_id=uuid4(), user_id=user_id, **_row(symbol=isin).values()))
+        await session.commit()
+        stats = await service.resolve_transactions(session)
+        await session.commit()
+        stored = await session.scalar(
+            select(ParsedTransaction.security_symbol).where(ParsedTransaction.user_id == user_id)
+        )
+    await async_engine.dispose()
+    return code, rows, stats, stored
+
+
+def test_parsed_rows_are_resolved_to_scheme_codes():
+    code, rows, stats, stored = asyncio.run(_canonicalize_and_backfill())
+
+    # ISINs and names resolve; a symbol that is not exactly a known scheme is kept
+    assert [row.security_symbol for row in rows] == [code, code, "INFY", None]
+    assert stored == code
+    assert stats["normalized"] >= 1
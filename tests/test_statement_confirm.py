@@ -0,0 +1,60 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlmodel import SQLModel
+
+from app.db.session import async_engine, async_session_factory
+from app.models.enums import StatementType, TransactionType
+from app.models.statement import ParsedTransaction, Statement, UploadSession
+from app.services.holdings import get_holdings_service
+from app.services.statement import get_statement_service
+
+
+async def _confirm_with_exclusion():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    user_id = str(uuid4())
+    async with async_session_factory() as session:
+        upload = UploadSession(user_id=user_id)
+        statement = Statement(
+            upload_session_id=upload.id,
+            user_id=user_id,
+            file_name="cas.pdf",
+            file_size_bytes=1,
+            statement_type=StatementType.CAMS,
+        )
+        kept, excluded = (
+            ParsedTransaction(
+                statement_id=statement.id,
+                user_id=user_id,
+                transaction_type=TransactionType.PURCHASE,
+                transaction_date=datetime(2024, 1, 2),
+                security_symbol=symbol,
+                units=Decimal("10"),
+                amount=Decimal("1000"),
+            )
+            for symbol in ("KEPT", "EXCLUDED")
+        )
+        session.add_all([upload, statement, kept, excluded])
+        await session.commit()
+
+        holdings = get_holdings_service()
+        before = await holdings.get_holdings(session, user_id)
+        result = await get_statement_service().confirm(session, statement.id, user_id, [excluded.id])
+        await session.commit()
+        after = await holdings.get_holdings(session, user_id)
+    await async_engine.dispose()
+    return before, result, after
+
+
+def test_excluded_transaction_stays_out_of_holdings():
+    before, result, after = asyncio.run(_confirm_with_exclusion())
+
+    # Unconfirmed transactions count toward nothing
+    assert before == []
+    assert result.confirmed_transactions == 1
+    assert result.excluded_transactions == 1
+    assert [row.security_symbol for row in after] == ["KEPT"]